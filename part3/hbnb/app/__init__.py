@@ -7,13 +7,21 @@ from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.auth import api as login_ns
-from flask_bcrypt import Bcrypt
+from app.api.v1.stats import api as stats_ns
+from app.api.representations import output_json
+from app.api.compression import compress_response
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
 from app.database import db  # Import db from the new module
+from app.services import facade
+from app.passwords import configure_hasher
+from app.persistence.identity_memo import memo_hits
+from app.schema import schema_check
+from app.commands import reconcile_ratings, rebuild_search_index
 
 # Instantiate Flask extensions
-bcrypt = Bcrypt()
 jwt = JWTManager()
+migrate = Migrate()
 
 # Create and configure the Flask app
 def create_app(config_class="config.DevelopmentConfig"):
@@ -22,11 +30,27 @@ def create_app(config_class="config.DevelopmentConfig"):
     
     # Initialize extensions with the app
     db.init_app(app)
-    bcrypt.init_app(app)
     jwt.init_app(app)
+    # Versioned schema migrations (flask db upgrade), batch mode so ALTERs also work on SQLite
+    migrate.init_app(app, db, render_as_batch=True)
+    app.cli.add_command(schema_check)
+    app.cli.add_command(reconcile_ratings)
+    app.cli.add_command(rebuild_search_index)
+    
+    # Attach the read-through entity caches, the amenity index, the response cache and the refresh token store
+    # configured for this app
+    facade.configure_cache(app.config.get('ENTITY_CACHE', {}))
+    facade.configure_amenity_index(app.config.get('AMENITY_INDEX_TTL', 60))
+    facade.configure_response_cache(app.config.get('RESPONSE_CACHE', {}))
+    facade.configure_token_store(app.config.get('REFRESH_TOKENS', {}))
+    # Size the bcrypt pool and pick the cost (calibrated on this machine unless configured)
+    rounds = configure_hasher(app.config.get('PASSWORD_HASHING', {}))
+    app.logger.info("Password hashing: bcrypt cost %d", rounds)
     
     # Set up the REST API with Flask-RESTX
     api = Api(app, version='1.0', title='HBnB API', description='HBnB Application API')
+    # Encode JSON responses with orjson when available (datetimes formatted by the encoder)
+    api.representation('application/json')(output_json)
     
     # Register API namespaces
     api.add_namespace(users_ns, path='/api/v1/users')
@@ -34,5 +58,16 @@ def create_app(config_class="config.DevelopmentConfig"):
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(reviews_ns, path='/api/v1')
     api.add_namespace(login_ns, path='/api/v1')
+    api.add_namespace(stats_ns, path='/api/v1/stats')
+    
+    # Compress large JSON responses for clients that accept it (gzip, br, zstd)
+    app.after_request(compress_response)
+    
+    # In debug mode, report how many repository lookups the request-scoped memo avoided
+    if app.debug:
+        @app.after_request
+        def add_memo_header(response):
+            response.headers['X-Identity-Memo-Hits'] = str(memo_hits())
+            return response
     
     return app
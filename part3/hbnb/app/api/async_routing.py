@@ -0,0 +1,52 @@
+# app/api/async_routing.py
+
+""" Async variants of API views for the ASGI serving mode (app/asgi.py)
+
+An async view is registered for a flask-restx Resource and serves its GET requests with the same response
+cache, ETag and representation as the sync method (@cached and @conditional); requests it does not handle
+(delegate() is true) go to the sync view through the WSGI app.
+"""
+from collections import namedtuple
+from flask_restx.utils import unpack
+from app.api.caching import lookup, store
+from app.api.conditional import etag_for, not_modified, with_etag
+from app.api.representations import output_json
+from app.services.async_facade import async_facade
+
+# handler: async function of the URL arguments returning (data, code[, headers]) like a Resource method;
+# collections: ETag versions (as for @conditional); cache: route name of @cached, or None;
+# delegate: predicate on the current request, true for what only the sync view implements
+AsyncView = namedtuple('AsyncView', 'handler collections cache delegate')
+
+# Resource class -> AsyncView serving its GET requests
+ASYNC_VIEWS = {}
+
+
+# Decorator registering an async handler for the GET method of a Resource
+def async_view(resource, collections, cache=None, delegate=lambda: False):
+    def decorator(handler):
+        ASYNC_VIEWS[resource] = AsyncView(handler, collections, cache, delegate)
+        return handler
+    return decorator
+
+
+# JSON response as flask-restx builds it (Api.make_response sets the media type after the representation)
+def json_response(data, code, headers=None):
+    response = output_json(data, code, headers)
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+
+# Response of an async view for the current request (inside a request context and an async session scope)
+async def respond(view, kwargs):
+    hit, key, generation = lookup(view.cache) if view.cache else (None, None, None)
+    if hit is not None:
+        return hit
+    etag = etag_for(await async_facade.get_versions(view.collections), view.collections)
+    response = not_modified(etag)
+    if response is None:
+        data, code, headers = unpack(with_etag(await view.handler(**kwargs), etag))
+        response = json_response(data, code, headers)
+    if key is not None:
+        response = store(view.cache, key, generation, response)
+    return response
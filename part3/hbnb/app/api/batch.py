@@ -0,0 +1,26 @@
+# app/api/batch.py
+
+""" Multi-get by ID (?ids=a,b,c) on list endpoints: one IN query instead of one request per object """
+from flask import current_app, request
+
+# Swagger documentation for the batch query parameter
+BATCH_PARAMS = {
+    'ids': 'Comma-separated IDs to fetch in one request (at most BATCH_IDS_MAX); returns public fields '
+           'of the objects found, in the requested order, and ignores pagination, filters and include'
+}
+
+
+# True when the request is a multi-get rather than a page of the collection
+def wants_batch():
+    return 'ids' in request.args
+
+
+# Read ?ids= as a list of distinct IDs, bounded by the configured batch size
+def get_ids_arg():
+    ids = list(dict.fromkeys(item.strip() for item in request.args['ids'].split(',') if item.strip()))
+    if not ids:
+        raise ValueError("ids must list at least one ID")
+    max_ids = current_app.config.get('BATCH_IDS_MAX', 100)
+    if len(ids) > max_ids:
+        raise ValueError(f"Too many ids: at most {max_ids} per request")
+    return ids
@@ -0,0 +1,93 @@
+# app/api/caching.py
+
+""" Server-side cache of public GET responses, keyed by route and normalized query string """
+from functools import wraps
+from urllib.parse import urlencode
+from flask import Response, g, request
+from flask_restx.utils import unpack
+from app.api.streaming import wants_stream
+from app.api.compression import negotiate, precompress, set_encoded_body
+from app.persistence.response_cache import CachedResponse
+from app.services import facade
+
+
+# Tag the response being built with the entities (ids) or collections (names) it shows
+def tag_response(*tags):
+    g.setdefault('response_tags', set()).update(tag for tag in tags if tag)
+
+
+# Cache key: route, path and query parameters in a canonical order, plus the negotiated media type
+def cache_key(route):
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"{route}|{request.path}|{query}|{request.headers.get('Accept', '')}"
+
+
+# Response rebuilt from a cache entry, or 304 when the client already holds its ETag
+def _replay(entry):
+    headers = dict(entry.headers)
+    if 'ETag' in headers and request.if_none_match.contains_weak(headers.get('ETag', '').strip('"')):
+        return Response(status=304, headers={'ETag': headers['ETag'], 'X-Cache': 'HIT'})
+    response = Response(entry.body, status=entry.status, headers=dict(headers, **{'X-Cache': 'HIT'}))
+    _use_variant(response, entry.variants)
+    return response
+
+
+# Send the precompressed body matching the client's Accept-Encoding, if there is one
+def _use_variant(response, variants):
+    name = negotiate() if variants else None
+    if name in variants:
+        set_encoded_body(response, name, variants[name])
+
+
+# Cache lookup for the current request: (response to send, None, None) on a hit, (None, key, generation) on a miss;
+# (None, None, None) when caching does not apply. Shared by @cached and the async views (app/api/v1/async_views.py)
+def lookup(route):
+    cache = facade.response_cache
+    if cache is None or wants_stream():
+        return None, None, None
+    key = cache_key(route)
+    entry = cache.get(key)
+    if entry is not None:
+        cache.record(route, 'hits')
+        return _replay(entry), None, None
+    cache.record(route, 'misses')
+    generation = cache.generation()  # taken before the first query of the request
+    g.response_tags = set()
+    return None, key, generation
+
+
+# Store the response built after a lookup() miss (200 and not streamed only), and mark it as a miss
+def store(route, key, generation, response):
+    cache = facade.response_cache
+    if response.status_code == 200 and not response.is_streamed:
+        headers = [(name, value) for name, value in response.headers.items() if name != 'Content-Length']
+        variants = precompress(response.get_data())
+        stored = cache.set(key, CachedResponse(200, headers, response.get_data(), variants),
+                           g.response_tags, generation)
+        if stored:
+            cache.record(route, 'stores')
+        _use_variant(response, variants)
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+
+# Decorator for public GET methods; goes above @conditional so hits skip the database entirely
+# Only 200 responses are stored, tagged through tag_response(); streamed exports bypass the cache
+def cached(route):
+    def decorator(method):
+        @wraps(method)
+        def wrapper(resource, *args, **kwargs):
+            hit, key, generation = lookup(route)
+            if hit is not None:
+                return hit
+            if key is None:
+                return method(resource, *args, **kwargs)
+            result = method(resource, *args, **kwargs)
+            if isinstance(result, Response):
+                response = result
+            else:
+                data, code, headers = unpack(result)
+                response = resource.api.make_response(data, code, headers=headers)
+            return store(route, key, generation, response)
+        return wrapper
+    return decorator
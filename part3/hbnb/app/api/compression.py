@@ -0,0 +1,140 @@
+# app/api/compression.py
+
+""" Response compression negotiated from Accept-Encoding: zstd, br and gzip
+
+gzip is always available (zlib); zstd and br are offered when the zstandard / brotli packages are installed.
+Levels come from the COMPRESSION setting, per codec and optionally per URL rule.
+"""
+import gzip
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Media types worth compressing
+COMPRESSIBLE = {'application/json', 'application/x-ndjson', 'text/html', 'text/plain', 'text/css',
+                'application/javascript'}
+
+
+# Whole-body and chunk-by-chunk compression for one content coding
+class Codec:
+    def __init__(self, name, compress, compressor):
+        self.name = name
+        self._compress = compress      # (data, level) -> bytes
+        self._compressor = compressor  # level -> (compress_chunk, finish), each chunk flushed to the client
+
+    def compress(self, data, level):
+        return self._compress(data, level)
+
+    def stream(self, chunks, level):
+        """Compress an iterable of byte chunks, flushing after each one so the client receives it at once"""
+        compress_chunk, finish = self._compressor(level)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compress_chunk(chunk)
+            if data:
+                yield data
+        yield finish()
+
+
+def _gzip_compressor(level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+
+def _brotli_compressor(level):
+    compressor = brotli.Compressor(quality=level)
+    return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+
+
+def _zstd_compressor(level):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return ((lambda chunk: compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)),
+            compressor.flush)
+
+
+# Available codecs, in server preference order for equal client q-values
+CODECS = {}
+if zstandard is not None:
+    CODECS['zstd'] = Codec('zstd', lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+                           _zstd_compressor)
+if brotli is not None:
+    CODECS['br'] = Codec('br', lambda data, level: brotli.compress(data, quality=level), _brotli_compressor)
+CODECS['gzip'] = Codec('gzip', lambda data, level: gzip.compress(data, level, mtime=0), _gzip_compressor)
+
+# Levels used when the COMPRESSION setting names none
+DEFAULT_LEVELS = {'gzip': 6, 'br': 4, 'zstd': 3}
+
+
+def _settings():
+    return current_app.config.get('COMPRESSION', {})
+
+
+# Content coding to use for the current request, or None (disabled, nothing acceptable, or identity preferred)
+def negotiate():
+    if not _settings():
+        return None
+    return request.accept_encodings.best_match(list(CODECS))
+
+
+# Compression level of a codec for the current route
+def level_for(name):
+    settings = _settings()
+    rule = request.url_rule.rule if request.url_rule else None
+    levels = {**DEFAULT_LEVELS, **settings.get('levels', {}), **settings.get('routes', {}).get(rule, {})}
+    return levels[name]
+
+
+# Every available coding of a body ({} when compression is disabled or the body is under min_size),
+# computed once when a response is stored in the response cache
+def precompress(body):
+    settings = _settings()
+    if not settings or len(body) < settings.get('min_size', 1024):
+        return {}
+    return {name: codec.compress(body, level_for(name)) for name, codec in CODECS.items()}
+
+
+# Mark a response as encoded; a strong ETag becomes weak, since it named the unencoded bytes
+def _set_encoding(response, name):
+    response.headers['Content-Encoding'] = name
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+# Replace the body of a response by its encoded version
+def set_encoded_body(response, name, data):
+    response.set_data(data)
+    _set_encoding(response, name)
+
+
+# after_request hook: compress JSON (and other text) responses the client accepts compressed
+def compress_response(response):
+    if response.mimetype not in COMPRESSIBLE or response.status_code < 200 or response.status_code in (204, 304):
+        return response
+    response.vary.add('Accept-Encoding')
+    if 'Content-Encoding' in response.headers or response.direct_passthrough:
+        return response
+    name = negotiate()
+    if name is None:
+        return response
+    codec = CODECS[name]
+    if response.is_streamed:
+        # Chunked responses (NDJSON exports) are compressed as they are produced, whatever their size
+        response.response = codec.stream(response.response, level_for(name))
+        response.headers.pop('Content-Length', None)
+        _set_encoding(response, name)
+        return response
+    body = response.get_data()
+    if len(body) < _settings().get('min_size', 1024):
+        return response
+    set_encoded_body(response, name, codec.compress(body, level_for(name)))
+    return response
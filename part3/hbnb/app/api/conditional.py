@@ -0,0 +1,61 @@
+# app/api/conditional.py
+
+""" ETags from collection version counters, and 304 responses to matching If-None-Match """
+import hashlib
+from functools import wraps
+from flask import Response, request
+from flask_restx.utils import unpack
+from app.services import facade
+
+
+# Strong ETag of the current request: collection versions plus everything the response varies on
+def compute_etag(collections):
+    return etag_for(facade.get_versions(collections), collections)
+
+
+# ETag of the current request for already known collection versions
+def etag_for(versions, collections):
+    key = '|'.join([
+        request.full_path,
+        request.headers.get('Accept', ''),
+        request.headers.get('Authorization', ''),  # responses differ by caller, e.g. admin-only lists
+        *[f'{name}:{versions[name]}' for name in collections]
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+# Validation headers of a response with this ETag
+def etag_headers(etag):
+    return {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache', 'Vary': 'Accept, Authorization'}
+
+
+# 304 when the client's If-None-Match holds the ETag, None otherwise
+def not_modified(etag):
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=etag_headers(etag))
+    return None
+
+
+# Add the validation headers to a view result (Response or (data, code, headers)) when it is a 200
+def with_etag(result, etag):
+    headers = etag_headers(etag)
+    if isinstance(result, Response):
+        if result.status_code == 200:
+            result.headers.extend(headers)
+        return result
+    data, code, extra = unpack(result)
+    if code != 200:
+        return result
+    return data, code, dict(extra or {}, **headers)
+
+
+# Decorator for GET methods whose response only depends on the given collections
+# A matching If-None-Match returns 304 after one version lookup, before any row is loaded or serialized
+def conditional(*collections):
+    def decorator(method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            etag = compute_etag(collections)
+            return not_modified(etag) or with_etag(method(*args, **kwargs), etag)
+        return wrapper
+    return decorator
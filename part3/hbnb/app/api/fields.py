@@ -0,0 +1,41 @@
+# app/api/fields.py
+
+""" Sparse fieldsets (?fields=) and relationship expansion (?include=) for API responses """
+from flask import request
+
+# Swagger documentation for the fieldset query parameters
+FIELD_PARAMS = {
+    'fields': 'Comma-separated fields to return (default: all)',
+    'include': 'Comma-separated related objects to embed'
+}
+
+
+# Split a comma-separated query parameter, None when it is absent
+def _list_arg(name):
+    if name not in request.args:
+        return None
+    return [item.strip() for item in request.args[name].split(',') if item.strip()]
+
+
+# Read ?fields= and ?include= from the request
+# Returns (fields or None for all, include list or default_include when absent)
+def get_view_args(default_include=()):
+    include = _list_arg('include')
+    return _list_arg('fields'), list(default_include) if include is None else include
+
+
+# True when the request asks for something else than the full default representation
+def is_sparse(fields, include, default_include=()):
+    return fields is not None or list(include) != list(default_include)
+
+
+# Serialize an object limited to fields, embedding the included relationships
+def serialize(obj, fields=None, include=()):
+    data = obj.to_dict(fields)
+    for name in include:
+        related = getattr(obj, name)
+        if isinstance(related, list):
+            data[name] = [item.to_dict() for item in related]
+        else:
+            data[name] = related.to_dict() if related is not None else None
+    return data
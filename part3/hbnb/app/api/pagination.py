@@ -0,0 +1,32 @@
+# app/api/pagination.py
+
+""" Query string parsing and Link header helpers for paginated list endpoints """
+from urllib.parse import urlencode
+from flask import current_app, request
+
+# Swagger documentation for the pagination query parameters
+PAGE_PARAMS = {
+    'limit': 'Maximum number of items to return',
+    'cursor': 'Opaque cursor taken from the previous page\'s Link header'
+}
+
+
+# Read ?limit= and ?cursor= from the request, clamped to the configured bounds
+def get_page_args():
+    limit = request.args.get('limit', current_app.config.get('PAGE_SIZE_DEFAULT', 50))
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("Limit must be an integer")
+    if limit < 1:
+        raise ValueError("Limit must be positive")
+    return min(limit, current_app.config.get('PAGE_SIZE_MAX', 500)), request.args.get('cursor')
+
+
+# Build the response headers pointing to the next page, if there is one
+def page_headers(next_cursor):
+    if not next_cursor:
+        return {}
+    args = request.args.to_dict()
+    args['cursor'] = next_cursor
+    return {'Link': f'<{request.base_url}?{urlencode(args)}>; rel="next"'}
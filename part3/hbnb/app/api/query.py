@@ -0,0 +1,35 @@
+# app/api/query.py
+
+""" Parse the filter and sort grammar of list endpoints: ?price[lte]=100&sort=-price,created_at """
+import re
+from flask import request
+from app.api.pagination import PAGE_PARAMS
+
+# Swagger documentation for the filter and sort query parameters
+QUERY_PARAMS = {
+    'sort': 'Comma-separated fields, "-" prefix for descending; only indexed fields can be sorted on',
+    'field[op]': 'Filter on a field: op is eq, ne, lt, lte, gt, gte or in (comma-separated values); '
+                 'field=value means field[eq]=value'
+}
+
+FILTER_RE = re.compile(r'^(\w+)(?:\[(\w+)\])?$')
+
+
+# Read filters and sort keys from the request; params listed in reserved are left to the endpoint
+# Returns ([(field, op, raw value)], [(field, descending)]); unknown fields are rejected by the repository
+def get_query_args(reserved=()):
+    reserved = set(reserved) | set(PAGE_PARAMS) | {'sort'}
+    filters = []
+    for key, value in request.args.items(multi=True):
+        if key in reserved:
+            continue
+        match = FILTER_RE.match(key)
+        if not match:
+            raise ValueError(f"Invalid filter parameter: {key}")
+        filters.append((match.group(1), match.group(2) or 'eq', value))
+    sort = []
+    for key in request.args.get('sort', '').split(','):
+        key = key.strip()
+        if key:
+            sort.append((key.lstrip('-'), key.startswith('-')))
+    return filters, sort
@@ -0,0 +1,36 @@
+# app/api/representations.py
+
+""" JSON representation of API responses: orjson when installed, the standard json module otherwise
+
+Both encode datetimes as ISO 8601 (what to_dict produced with isoformat()), so rows read column by column
+(app.persistence.columnar) can keep their datetime values and have them formatted during encoding.
+"""
+import json
+from datetime import datetime
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# UTF-8 encoded JSON of data, compact unless indent is set
+def encode(data, indent=False):
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_INDENT_2 if indent else 0)
+    text = json.dumps(data, default=_default, indent=2 if indent else None, separators=None if indent else (',', ':'))
+    return text.encode('utf-8')
+
+
+# flask-restx representation for application/json (indented in debug mode, like the stock one)
+def output_json(data, code, headers=None):
+    response = make_response(encode(data, indent=current_app.debug) + b'\n', code)
+    response.headers.extend(headers or {})
+    return response
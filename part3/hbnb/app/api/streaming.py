@@ -0,0 +1,43 @@
+# app/api/streaming.py
+
+""" NDJSON streaming of whole collections: one JSON document per line, written while the query runs """
+from flask import Response, current_app, request, stream_with_context
+from app.api.fields import serialize
+from app.api.representations import encode
+
+NDJSON = 'application/x-ndjson'
+
+# Swagger documentation for the streaming query parameter
+STREAM_PARAMS = {
+    'stream': '1 to stream every matching row as NDJSON (same as Accept: application/x-ndjson); '
+              'limit and cursor are ignored'
+}
+
+# Rows encoded per chunk written to the client
+CHUNK_ROWS = 100
+
+
+# True when the client asked for an NDJSON stream instead of a JSON page
+def wants_stream():
+    if request.args.get('stream') in ('1', 'true'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON]) == NDJSON
+
+
+# Rows fetched per database round trip while streaming
+def stream_batch_size():
+    return current_app.config.get('STREAM_BATCH_SIZE', 1000)
+
+
+# Stream the rows of an iterator as NDJSON; the request context stays open until the last row is sent
+def ndjson_response(rows, fields=None, include=()):
+    def generate():
+        lines = []
+        for row in rows:
+            lines.append(encode(serialize(row, fields, include)))
+            if len(lines) >= CHUNK_ROWS:
+                yield b'\n'.join(lines) + b'\n'
+                lines = []
+        if lines:
+            yield b'\n'.join(lines) + b'\n'
+    return Response(stream_with_context(generate()), mimetype=NDJSON)
@@ -3,10 +3,19 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.pagination import PAGE_PARAMS, get_page_args, page_headers
+from app.api.query import QUERY_PARAMS, get_query_args
+from app.api.streaming import STREAM_PARAMS, ndjson_response, stream_batch_size, wants_stream
+from app.api.conditional import conditional
+from app.api.caching import cached, tag_response
+from app.api.batch import BATCH_PARAMS, get_ids_arg, wants_batch
 
 # Define the API namespace for amenity-related operations
 api = Namespace('amenities', description='Amenity operations')
 
+# Collections whose writes change these responses (ETag versions)
+AMENITY_COLLECTIONS = ('amenities',)
+
 # Define the amenity model for creation and API documentation
 amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity'),
@@ -47,11 +56,27 @@ class AmenityList(Resource):
             return {'error': str(e)}, 400  # Return validation errors if any
     
     # GET method to retrieve all amenities, no authentication required
+    @api.doc(params=dict(PAGE_PARAMS, **QUERY_PARAMS, **STREAM_PARAMS, **BATCH_PARAMS))
     @api.response(200, 'List of amenities retrieved')
+    @api.response(400, 'Invalid pagination, filter, sort or ids parameters')
+    @cached('amenities.list')
+    @conditional(*AMENITY_COLLECTIONS)
     def get(self):
-        # Fetch all amenities from the facade
-        amenities = facade.get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities], 200
+        # Fetch one page of amenities from the facade, stream them all, or fetch several by ID
+        try:
+            if wants_batch():
+                amenities = facade.get_amenities_batch(get_ids_arg())
+                tag_response('amenities', *[amenity.id for amenity in amenities])
+                return [amenity.to_dict() for amenity in amenities], 200
+            limit, cursor = get_page_args()
+            filters, sort = get_query_args(reserved=dict(STREAM_PARAMS, **BATCH_PARAMS))
+            if wants_stream():
+                return ndjson_response(facade.iter_amenities(filters, sort, stream_batch_size()))
+            rows, next_cursor = facade.get_rows_page('amenities', None, limit, cursor, filters, sort)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        tag_response('amenities', *[row['id'] for row in rows])
+        return rows, 200, page_headers(next_cursor)
 
 # Resource for handling operations on a specific amenity by ID
 @api.route('/<string:amenity_id>')
@@ -59,9 +84,10 @@ class AmenityResource(Resource):
     # GET method to retrieve amenity details, no authentication required
     @api.response(200, 'Amenity details retrieved')
     @api.response(404, 'Amenity not found')
+    @conditional(*AMENITY_COLLECTIONS)
     def get(self, amenity_id):
         # Fetch the amenity from the facade
-        amenity = facade.get_amenity(amenity_id)
+        amenity = facade.get_amenity(amenity_id, readonly=True)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
         return amenity.to_dict(), 200
@@ -85,7 +111,7 @@ class AmenityResource(Resource):
         amenity_data = api.payload
         
         # Fetch the existing amenity
-        amenity = facade.get_amenity(amenity_id)
+        amenity = facade.get_amenity(amenity_id, readonly=True)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
         
@@ -111,7 +137,7 @@ class AmenityResource(Resource):
             return {'error': 'Admin privileges required'}, 403
         
         # Fetch the existing amenity
-        amenity = facade.get_amenity(amenity_id)
+        amenity = facade.get_amenity(amenity_id, readonly=True)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
         
@@ -0,0 +1,161 @@
+# app/api/v1/async_views.py
+
+""" Async GET views of the ASGI serving mode, mirroring the sync Resource methods they are registered for """
+from flask import request
+from app.services.async_facade import async_facade
+from app.api.async_routing import async_view
+from app.api.pagination import get_page_args, page_headers
+from app.api.query import get_query_args
+from app.api.fields import FIELD_PARAMS, get_view_args, is_sparse, serialize
+from app.api.streaming import STREAM_PARAMS, wants_stream
+from app.api.batch import BATCH_PARAMS, wants_batch
+from app.api.caching import tag_response
+from app.api.v1.places import (AUTHOR_FIELDS, GEO_PARAMS, PLACE_COLLECTIONS, PLACE_INCLUDE, PlaceList, PlacePage,
+                               PlaceResource, _enrich_place_data, _place_view, _tag_places)
+from app.api.v1.amenities import AMENITY_COLLECTIONS, AmenityList, AmenityResource
+from app.api.v1.reviews import REVIEW_COLLECTIONS, PlaceReviewList, ReviewList, ReviewResource
+from app.api.v1.users import USER_COLLECTIONS, UserResource
+from app.geo import parse_bbox
+
+
+# Radius searches and amenity filters use in-process indexes; batches and exports stay synchronous
+def _place_list_delegated():
+    return wants_batch() or wants_stream() or 'near' in request.args or 'amenities' in request.args
+
+
+@async_view(PlaceList, PLACE_COLLECTIONS, cache='places.list', delegate=_place_list_delegated)
+async def get_places():
+    try:
+        limit, cursor = get_page_args()
+        filters, sort = get_query_args(reserved=dict(GEO_PARAMS, **FIELD_PARAMS, **STREAM_PARAMS, **BATCH_PARAMS))
+        fields, include, profile = _place_view(sort)
+        bbox = parse_bbox(request.args['bbox']) if 'bbox' in request.args else None
+        # Without relationships to embed, the page is read column by column straight into dicts
+        if not include:
+            rows, next_cursor = await async_facade.get_places_rows_page(fields, limit, cursor, filters, sort, bbox)
+            tag_response('places')
+            return rows, 200, page_headers(next_cursor)
+        places, next_cursor = await async_facade.get_places_page(limit, cursor, profile, filters, sort, bbox)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    tag_response('places')
+    _tag_places(places, include)
+    return [_enrich_place_data(place, fields, include) for place in places], 200, page_headers(next_cursor)
+
+
+@async_view(PlaceResource, PLACE_COLLECTIONS, cache='places.detail')
+async def get_place(place_id):
+    try:
+        fields, include, profile = _place_view()
+        place = await async_facade.get_place(place_id, profile)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    if not place:
+        return {'error': 'Place not found'}, 404
+    _tag_places([place], include)
+    return _enrich_place_data(place, fields, include), 200
+
+
+@async_view(PlacePage, PLACE_COLLECTIONS, cache='places.page')
+async def get_place_page(place_id):
+    try:
+        limit, _ = get_page_args()
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    page = await async_facade.get_place_page(place_id, limit)
+    if not page:
+        return {'error': 'Place not found'}, 404
+    place, reviews, next_cursor = page
+    _tag_places([place], PLACE_INCLUDE)
+    tag_response(*[review.user_id for review in reviews])
+    return {
+        'place': _enrich_place_data(place),
+        'ratings': {
+            'count': place.review_count,
+            'average': place.average_rating,
+            'histogram': place.to_dict(['rating_histogram'])['rating_histogram']
+        },
+        'reviews': [dict(review.to_dict(), author=review.author.to_dict(AUTHOR_FIELDS)) for review in reviews],
+        'reviews_cursor': next_cursor
+    }, 200
+
+
+@async_view(AmenityList, AMENITY_COLLECTIONS, cache='amenities.list', delegate=lambda: wants_batch() or wants_stream())
+async def get_amenities():
+    try:
+        limit, cursor = get_page_args()
+        filters, sort = get_query_args(reserved=dict(STREAM_PARAMS, **BATCH_PARAMS))
+        rows, next_cursor = await async_facade.get_rows_page('amenities', None, limit, cursor, filters, sort)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    tag_response('amenities', *[row['id'] for row in rows])
+    return rows, 200, page_headers(next_cursor)
+
+
+@async_view(AmenityResource, AMENITY_COLLECTIONS)
+async def get_amenity(amenity_id):
+    amenity = await async_facade.get_amenity(amenity_id, readonly=True)
+    if not amenity:
+        return {'error': 'Amenity not found'}, 404
+    return amenity.to_dict(), 200
+
+
+@async_view(ReviewList, REVIEW_COLLECTIONS, delegate=wants_stream)
+async def get_reviews():
+    try:
+        limit, cursor = get_page_args()
+        filters, sort = get_query_args(reserved=dict(FIELD_PARAMS, **STREAM_PARAMS))
+        fields, include = get_view_args()
+        if not include:
+            rows, next_cursor = await async_facade.get_rows_page('reviews', fields, limit, cursor, filters, sort)
+            return rows, 200, page_headers(next_cursor)
+        profile = async_facade.get_view('reviews', fields, include, sort)
+        reviews, next_cursor = await async_facade.get_reviews_page(limit, cursor, filters, sort, profile)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    return [serialize(review, fields, include) for review in reviews], 200, page_headers(next_cursor)
+
+
+@async_view(ReviewResource, REVIEW_COLLECTIONS)
+async def get_review(review_id):
+    try:
+        fields, include = get_view_args()
+        review = await async_facade.get_review(review_id, async_facade.get_view('reviews', fields, include)
+                                               if is_sparse(fields, include) else None)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    if not review:
+        return {'error': 'Review not found'}, 404
+    return serialize(review, fields, include), 200
+
+
+@async_view(PlaceReviewList, REVIEW_COLLECTIONS)
+async def get_place_reviews(place_id):
+    if not await async_facade.get_place(place_id, readonly=True):
+        return {'error': 'Place not found'}, 404
+    try:
+        limit, cursor = get_page_args()
+        fields, include = get_view_args()
+        if not include:
+            rows, next_cursor = await async_facade.get_rows_page('reviews', fields, limit, cursor, place_id=place_id)
+            return rows, 200, page_headers(next_cursor)
+        profile = async_facade.get_view('reviews', fields, include)
+        reviews, next_cursor = await async_facade.get_reviews_by_place_page(place_id, limit, cursor, profile)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    return [serialize(review, fields, include) for review in reviews], 200, page_headers(next_cursor)
+
+
+@async_view(UserResource, USER_COLLECTIONS)
+async def get_user(user_id):
+    try:
+        fields, include = get_view_args()
+        if include:
+            user = await async_facade.get_user(user_id, async_facade.get_view('users', fields, include))
+        else:
+            user = await async_facade.get_user(user_id, readonly=True)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    if not user:
+        return {'error': 'User not found'}, 404
+    return serialize(user, fields, include), 200
@@ -1,7 +1,11 @@
 # app/api/v1/auth.py
+import uuid
+from datetime import datetime, timezone
+from flask import current_app
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt, get_jwt_identity, jwt_required
 from app.services import facade
+from app.passwords import PasswordHasherBusy
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -11,22 +15,79 @@ login_model = api.model('Login', {
     'password': fields.String(required=True, description='User password')
 })
 
+
+# Short-lived access token plus a refresh token of the session (family); the refresh token's jti is the
+# only one the token store accepts for that family until it is rotated
+def issue_tokens(user, family):
+    identity = {'id': str(user.id), 'is_admin': user.is_admin}
+    jti = str(uuid.uuid4())
+    lifetime = current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+    refresh_token = create_refresh_token(
+        identity=identity, expires_delta=lifetime, additional_claims={'jti': jti, 'fam': family}
+    )
+    expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + lifetime
+    return {'access_token': create_access_token(identity=identity), 'refresh_token': refresh_token}, jti, expires_at
+
+
 @api.route('/login')
 class Login(Resource):
     @api.expect(login_model)
+    @api.response(503, 'Too many logins in progress, retry after the Retry-After delay')
     def post(self):
-        """Authenticate user and return a JWT token"""
+        """Authenticate user and return an access token and a refresh token"""
         credentials = api.payload  # Get the email and password from the request payload
-        
-        # Step 1: Retrieve the user based on the provided email
-        user = facade.get_user_by_email(credentials['email'])
-        
-        # Step 2: Check if the user exists and the password is correct
-        if not user or not user.verify_password(credentials['password']):
+
+        # Steps 1-2: Retrieve the user by email and check the password (bcrypt runs in the bounded hashing pool)
+        try:
+            user = facade.authenticate(credentials['email'], credentials['password'])
+        except PasswordHasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': str(e.retry_after)}
+        if not user:
             return {'error': 'Invalid credentials'}, 401
 
-        # Step 3: Create a JWT token with the user's id and is_admin flag
-        access_token = create_access_token(identity={'id': str(user.id), 'is_admin': user.is_admin})
-        
-        # Step 4: Return the JWT token to the client
-        return {'access_token': access_token}, 200
+        # Step 3: Create the tokens with the user's id and is_admin flag, opening a new session
+        family = str(uuid.uuid4())
+        tokens, jti, expires_at = issue_tokens(user, family)
+        facade.start_session(family, jti, user.id, expires_at)
+
+        # Step 4: Return the tokens to the client
+        return tokens, 200
+
+
+@api.route('/refresh')
+class Refresh(Resource):
+    # POST method to renew the tokens of a session: a signature check instead of a password check
+    @jwt_required(refresh=True)
+    @api.response(200, 'New access and refresh tokens (the presented refresh token is no longer accepted)')
+    @api.response(401, 'Refresh token expired, revoked or already used')
+    def post(self):
+        """Exchange a refresh token for a new access token and a new refresh token"""
+        claims = get_jwt()
+        family = claims.get('fam')
+        if not family:
+            return {'error': 'Invalid refresh token'}, 401
+
+        # The current is_admin flag goes into the new tokens; a deleted user's session ends
+        user = facade.get_user(get_jwt_identity()['id'], readonly=True)
+        if not user:
+            facade.end_session(family)
+            return {'error': 'Invalid refresh token'}, 401
+
+        # Rotate: reusing an already rotated token revokes the whole session
+        tokens, jti, expires_at = issue_tokens(user, family)
+        if not facade.rotate_session(family, claims['jti'], jti, expires_at):
+            return {'error': 'Refresh token revoked or already used'}, 401
+        return tokens, 200
+
+
+@api.route('/logout')
+class Logout(Resource):
+    # POST method to end the session of a refresh token
+    @jwt_required(refresh=True)
+    @api.response(200, 'Session ended')
+    def post(self):
+        """Revoke the session of the presented refresh token"""
+        family = get_jwt().get('fam')
+        if family:
+            facade.end_session(family)
+        return {'message': 'Logged out'}, 200
@@ -3,11 +3,22 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from flask import current_app
+from flask import current_app, request
+from app.api.pagination import PAGE_PARAMS, get_page_args, page_headers
+from app.api.query import QUERY_PARAMS, get_query_args
+from app.api.fields import FIELD_PARAMS, get_view_args, is_sparse, serialize
+from app.api.streaming import STREAM_PARAMS, ndjson_response, stream_batch_size, wants_stream
+from app.api.conditional import conditional
+from app.api.caching import cached, tag_response
+from app.api.batch import BATCH_PARAMS, get_ids_arg, wants_batch
+from app.geo import parse_bbox, parse_point
 
 # API namespace for place operations
 api = Namespace('places', description='Place operations')
 
+# Collections whose writes change these responses (ETag versions)
+PLACE_COLLECTIONS = ('places', 'users', 'amenities', 'reviews')
+
 # amenity model to enrich place data in responses
 amenity_model = api.model('PlaceAmenity', {
     'id': fields.String(description='Amenity ID'),
@@ -32,6 +43,69 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String, required=True, description="List of amenities ID's")
 })
 
+# Swagger documentation for the geospatial query parameters
+GEO_PARAMS = {
+    'near': 'Search around a point: "latitude,longitude" (results sorted by distance, no cursor)',
+    'radius_km': 'Search radius for near, in km (default 10)',
+    'bbox': 'Search inside a box: "south,west,north,east"',
+    'amenities': 'Amenity filter: comma-separated IDs all required, "a|b" for either, "!a" for without'
+}
+
+# Swagger documentation for the full-text search query parameters
+SEARCH_PARAMS = {
+    'q': 'Words to look for in titles and descriptions',
+    'limit': 'Maximum number of results to return (best matches first)',
+    'min_price': 'Only places costing at least this much per night',
+    'max_price': 'Only places costing at most this much per night',
+    'amenities': 'Comma-separated amenity IDs the places must all have'
+}
+
+# Loading profile fetching places with their owner and amenities in a fixed number of queries
+PLACE_PROFILE = 'place_with_owner_and_amenities'
+# Relationships embedded in place responses unless ?include= says otherwise
+PLACE_INCLUDE = ('owner', 'amenities')
+
+# Read an optional price bound from the query string
+def _price_arg(name):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+# Parse ?amenities= into clauses: "," separates ANDed clauses, "|" ORed literals, "!" negates one
+def _amenity_filter_arg():
+    clauses = []
+    for clause in request.args['amenities'].split(','):
+        literals = [(literal.lstrip('!'), literal.startswith('!')) for literal in clause.split('|')]
+        if not all(amenity_id for amenity_id, _ in literals):
+            raise ValueError("Invalid amenities filter")
+        clauses.append(literals)
+    return clauses
+
+# Read ?fields= and ?include=, returning (fields, include, loading profile for them)
+def _place_view(sort=()):
+    fields, include = get_view_args(PLACE_INCLUDE)
+    if not is_sparse(fields, include, PLACE_INCLUDE):
+        return fields, include, PLACE_PROFILE
+    return fields, include, facade.get_view('places', fields, include, sort)
+
+# Helper to include additional data in place responses
+def _enrich_place_data(place, fields=None, include=PLACE_INCLUDE):
+    """Serialize a place with its owner and amenities, or with the requested fields and relationships only."""
+    return serialize(place, fields, include)
+
+# Tag a cached response with the places it shows and the owners/amenities embedded in them
+def _tag_places(places, include):
+    for place in places:
+        tag_response(place.id)
+        if 'owner' in include:
+            tag_response(place.owner_id)
+        if 'amenities' in include:
+            tag_response(*[amenity.id for amenity in place.amenities])
+
 # places operations
 @api.route('')
 class PlaceList(Resource):
@@ -53,56 +127,112 @@ class PlaceList(Resource):
             return {'error': 'Unauthorized action'}, 403
         
         # Admins can assign any owner, but must verify the owner exists
-        if is_admin and not facade.get_user(place_data['owner_id']):
+        if is_admin and not facade.get_user(place_data['owner_id'], readonly=True):
             return {'error': 'Owner not found'}, 400
         
         # create the place via facade
         try:
             new_place = facade.create_place(place_data)
-            return self._enrich_place_data(new_place), 201  # Return enriched data
+            return _enrich_place_data(new_place), 201  # Return enriched data
         except ValueError as e:
             return {'error': str(e)}, 400  # Return validation errors if any
     
     # GET method to retrieve all places, no authentication required
+    @api.doc(params=dict(PAGE_PARAMS, **QUERY_PARAMS, **GEO_PARAMS, **FIELD_PARAMS, **STREAM_PARAMS, **BATCH_PARAMS))
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid pagination, filter, sort, field, search or ids parameters')
+    @cached('places.list')
+    @conditional(*PLACE_COLLECTIONS)
     def get(self):
-        """Retrieve a list of all places"""
-        # Fetch all places from the facade
-        places = facade.get_all_places()
+        """Retrieve a page of places, optionally filtered, sorted, around a point, inside a box or by amenities"""
+        # Batch lookup by ID: public fields of the places found, one query for the whole list
+        if wants_batch():
+            try:
+                fields, _ = get_view_args()
+                places = facade.get_places_batch(get_ids_arg(), fields)
+            except ValueError as e:
+                return {'error': str(e)}, 400
+            tag_response('places', *[place.id for place in places])
+            return [place.to_dict(fields) for place in places], 200
+        try:
+            limit, cursor = get_page_args()
+            filters, sort = get_query_args(reserved=dict(GEO_PARAMS, **FIELD_PARAMS, **STREAM_PARAMS, **BATCH_PARAMS))
+            fields, include, profile = _place_view(sort)
+            # Radius search: nearest places first, each with its distance
+            if 'near' in request.args:
+                if sort or 'bbox' in request.args or 'amenities' in request.args:
+                    raise ValueError("near cannot be combined with sort, bbox or amenities")
+                latitude, longitude = parse_point(request.args['near'])
+                results = facade.get_places_near(latitude, longitude, request.args.get('radius_km', 10),
+                                                 limit, profile=profile, filters=filters)
+                tag_response('places')
+                _tag_places([place for place, _ in results], include)
+                return [dict(_enrich_place_data(place, fields, include), distance_km=round(distance, 3))
+                        for place, distance in results], 200
+            # One page of places, narrowed by any filters, bounding box and amenity filter
+            bbox = parse_bbox(request.args['bbox']) if 'bbox' in request.args else None
+            amenities = _amenity_filter_arg() if 'amenities' in request.args else None
+            if wants_stream():
+                places = facade.iter_places(profile, filters, sort, bbox, amenities, stream_batch_size())
+                return ndjson_response(places, fields, include)
+            # Without relationships to embed, the page is read column by column straight into dicts
+            if not include and amenities is None:
+                rows, next_cursor = facade.get_places_rows_page(fields, limit, cursor, filters, sort, bbox)
+                tag_response('places')
+                return rows, 200, page_headers(next_cursor)
+            places, next_cursor = facade.get_places_page(limit, cursor, profile, filters, sort, bbox, amenities)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        tag_response('places')  # Any place write may add a row to, or remove one from, this page
+        _tag_places(places, include)
         # Enrich each place with owner and amenity details
-        return [self._enrich_place_data(place) for place in places], 200
-    
-    # Helper method to include additional data in place responses
-    def _enrich_place_data(self, place):
-        """Helper method to include owner and amenities details in the response."""
-        # Fetch the owner of the place
-        owner = facade.get_user(place.owner_id)
-        
-        # Extract amenity IDs from the dynamic relationship and fetch each Amenity
-        amenity_ids = [amenity.id for amenity in place.amenities.all()]  # Use .all() to get the list
-        amenities = [facade.get_amenity(amenity_id) for amenity_id in amenity_ids]
-        
-        # Build the enriched place dictionary
-        place_dict = place.to_dict()
-        place_dict['owner'] = owner.to_dict() if owner else None
-        place_dict['amenities'] = [amenity.to_dict() for amenity in amenities if amenity]
-        return place_dict
+        return [_enrich_place_data(place, fields, include) for place in places], 200, page_headers(next_cursor)
+
+# full-text search, registered before /<place_id> so "search" is never taken for an ID
+@api.route('/search')
+class PlaceSearch(Resource):
+    # GET method to search places by keywords, no authentication required
+    @api.doc(params=dict(SEARCH_PARAMS, **FIELD_PARAMS))
+    @api.response(200, 'Matching places retrieved successfully')
+    @api.response(400, 'Invalid search parameters')
+    @conditional(*PLACE_COLLECTIONS)
+    def get(self):
+        """Search places by title and description, best matches first"""
+        try:
+            limit, _ = get_page_args()
+            fields, include, profile = _place_view()
+            amenity_ids = [a for a in request.args.get('amenities', '').split(',') if a]
+            results = facade.search_places(request.args.get('q', ''), limit,
+                                           _price_arg('min_price'), _price_arg('max_price'),
+                                           amenity_ids, profile=profile)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return [dict(_enrich_place_data(place, fields, include), score=round(score, 4)) for place, score in results], 200
 
 # place by ID operations
 @api.route('/<place_id>')
 class PlaceResource(Resource):
     # GET method to retrieve place details, no authentication required
+    @api.doc(params=FIELD_PARAMS)
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(400, 'Invalid field parameters')
     @api.response(404, 'Place not found')
+    @cached('places.detail')
+    @conditional(*PLACE_COLLECTIONS)
     def get(self, place_id):
         """Get place details by ID"""
-        # Fetch the place from the facade
-        place = facade.get_place(place_id)
+        # Fetch the place with its owner and amenities (or the requested fields) from the facade
+        try:
+            fields, include, profile = _place_view()
+            place = facade.get_place(place_id, profile)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if not place:
             return {'error': 'Place not found'}, 404
+        _tag_places([place], include)
         
         # Return enriched place data
-        return self._enrich_place_data(place), 200
+        return _enrich_place_data(place, fields, include), 200
     
     # PUT method to update a place, requires JWT authentication
     @jwt_required()
@@ -118,7 +248,7 @@ class PlaceResource(Resource):
         is_admin = current_user.get('is_admin', False)
         
         # Fetch the existing place
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, readonly=True)
         if not place:
             return {'error': 'Place not found'}, 404
         
@@ -133,13 +263,13 @@ class PlaceResource(Resource):
             return {'error': 'Unauthorized action'}, 403
         
         # Admins can change the owner, but must verify the new owner exists
-        if is_admin and 'owner_id' in place_data and not facade.get_user(place_data['owner_id']):
+        if is_admin and 'owner_id' in place_data and not facade.get_user(place_data['owner_id'], readonly=True):
             return {'error': 'Owner not found'}, 400
         
         # Attempt to update the place via the facade
         try:
             updated_place = facade.update_place(place_id, place_data)
-            return self._enrich_place_data(updated_place), 200  # Return enriched data
+            return _enrich_place_data(updated_place), 200  # Return enriched data
         except ValueError as e:
             return {'error': str(e)}, 400  # Return validation errors if any
     
@@ -159,26 +289,49 @@ class PlaceResource(Resource):
             return {'error': 'Admin privileges required'}, 403
         
         # Fetch the existing place
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, readonly=True)
         if not place:
             return {'error': 'Place not found'}, 404
         
         # Delete the place via the facade
         facade.delete_place(place_id)
         return {'message': 'Place deleted successfully'}, 200
+
+# Fields of the review authors embedded in the place page
+AUTHOR_FIELDS = ('id', 'first_name', 'last_name')
+
+# everything place.html shows, in one request
+@api.route('/<place_id>/page')
+class PlacePage(Resource):
+    # GET method to retrieve a place with its first reviews and rating aggregates, no authentication required
+    @api.doc(params={'limit': 'Maximum number of reviews to embed (more via /places/<id>/reviews?cursor=)'})
+    @api.response(200, 'Place page retrieved successfully')
+    @api.response(400, 'Invalid limit')
+    @api.response(404, 'Place not found')
+    @cached('places.page')
+    @conditional(*PLACE_COLLECTIONS)
+    def get(self, place_id):
+        """Get a place with its owner, amenities, first page of reviews (with author names) and rating aggregates"""
+        try:
+            limit, _ = get_page_args()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        page = facade.get_place_page(place_id, limit)
+        if not page:
+            return {'error': 'Place not found'}, 404
+        place, reviews, next_cursor = page
+        _tag_places([place], PLACE_INCLUDE)
+        tag_response(*[review.user_id for review in reviews])
         
-    # Helper method to include additional data in place responses (duplicated for this class)
-    def _enrich_place_data(self, place):
-        """Helper method to include owner and amenities details in the response."""
-        # Fetch the owner of the place
-        owner = facade.get_user(place.owner_id)
-        
-        # Extract amenity IDs from the dynamic relationship and fetch each Amenity
-        amenity_ids = [amenity.id for amenity in place.amenities.all()]  # Use .all() to get the list
-        amenities = [facade.get_amenity(amenity_id) for amenity_id in amenity_ids]
-        
-        # Build the enriched place dictionary
-        place_dict = place.to_dict()
-        place_dict['owner'] = owner.to_dict() if owner else None
-        place_dict['amenities'] = [amenity.to_dict() for amenity in amenities if amenity]
-        return place_dict
+        return {
+            'place': _enrich_place_data(place),
+            'ratings': {
+                'count': place.review_count,
+                'average': place.average_rating,
+                'histogram': place.to_dict(['rating_histogram'])['rating_histogram']
+            },
+            'reviews': [
+                dict(review.to_dict(), author=review.author.to_dict(AUTHOR_FIELDS)) for review in reviews
+            ],
+            'reviews_cursor': next_cursor  # continue with GET /places/<id>/reviews?cursor=
+        }, 200
@@ -4,10 +4,18 @@ from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import current_app
+from app.api.pagination import PAGE_PARAMS, get_page_args, page_headers
+from app.api.query import QUERY_PARAMS, get_query_args
+from app.api.fields import FIELD_PARAMS, get_view_args, is_sparse, serialize
+from app.api.streaming import STREAM_PARAMS, ndjson_response, stream_batch_size, wants_stream
+from app.api.conditional import conditional
 
 # API namespace for review operations
 api = Namespace('reviews', description='Review operations')
 
+# Collections whose writes change these responses (ETag versions)
+REVIEW_COLLECTIONS = ('reviews', 'users', 'places')
+
 # review model for input validation and API documentation
 review_model = api.model('Review', {
     'text': fields.String(required=True, description='Text of the review'),
@@ -37,7 +45,7 @@ class ReviewList(Resource):
         review_data = api.payload
         
         # Verify the place exists
-        place = facade.get_place(review_data['place_id'])
+        place = facade.get_place(review_data['place_id'], readonly=True)
         if not place:
             return {'error': 'Place not found'}, 404
         
@@ -45,16 +53,10 @@ class ReviewList(Resource):
         if place.owner_id == current_user['id']:
             return {'error': 'You cannot review your own place'}, 400
         
-        # Check if the user has already reviewed this place
-        existing_reviews = facade.get_reviews_by_place(review_data['place_id'])
-        for review in existing_reviews:
-            if review.user_id == current_user['id']:
-                return {'error': 'You have already reviewed this place'}, 400
-        
         # Override user_id with the authenticated user's ID for security
         review_data['user_id'] = current_user['id']
         
-        # create the review via the facade
+        # create the review via the facade (which also rejects duplicate reviews)
         try:
             new_review = facade.create_review(review_data)
             return new_review.to_dict(), 201
@@ -62,26 +64,51 @@ class ReviewList(Resource):
             return {'error': str(e)}, 400  # Return validation errors
     
     # GET method to retrieve all reviews, no authentication required
+    @api.doc(params=dict(PAGE_PARAMS, **QUERY_PARAMS, **FIELD_PARAMS, **STREAM_PARAMS))
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid pagination, filter, sort or field parameters')
+    @conditional(*REVIEW_COLLECTIONS)
     def get(self):
-        """Retrieve a list of all reviews"""
-        # Fetch all reviews from facade
-        reviews = facade.get_all_reviews()
-        return [review.to_dict() for review in reviews], 200
+        """Retrieve a page of reviews, or stream them all as NDJSON"""
+        # Fetch one page of reviews from facade, reading only the requested fields
+        try:
+            limit, cursor = get_page_args()
+            filters, sort = get_query_args(reserved=dict(FIELD_PARAMS, **STREAM_PARAMS))
+            fields, include = get_view_args()
+            profile = facade.get_view('reviews', fields, include, sort) if is_sparse(fields, include) else None
+            if wants_stream():
+                reviews = facade.iter_reviews(filters, sort, profile, stream_batch_size())
+                return ndjson_response(reviews, fields, include)
+            # Without relationships to embed, the page is read column by column straight into dicts
+            if not include:
+                rows, next_cursor = facade.get_rows_page('reviews', fields, limit, cursor, filters, sort)
+                return rows, 200, page_headers(next_cursor)
+            reviews, next_cursor = facade.get_reviews_page(limit, cursor, filters, sort, profile)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return [serialize(review, fields, include) for review in reviews], 200, page_headers(next_cursor)
 
 # operations on review by ID
 @api.route('/reviews/<review_id>')
 class ReviewResource(Resource):
     # GET method to retrieve review details, no authentication required
+    @api.doc(params=FIELD_PARAMS)
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(400, 'Invalid field parameters')
     @api.response(404, 'Review not found')
+    @conditional(*REVIEW_COLLECTIONS)
     def get(self, review_id):
         """Get review details by ID"""
         # Fetch the review from the facade
-        review = facade.get_review(review_id)
+        try:
+            fields, include = get_view_args()
+            review = facade.get_review(review_id, facade.get_view('reviews', fields, include)
+                                       if is_sparse(fields, include) else None)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if not review:
             return {'error': 'Review not found'}, 404
-        return review.to_dict(), 200
+        return serialize(review, fields, include), 200
     
     # PUT method to update a review, requires JWT authentication
     @jwt_required()
@@ -142,18 +169,32 @@ class ReviewResource(Resource):
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
     # GET method to retrieve all reviews for a place, no authentication required
+    @api.doc(params=dict(PAGE_PARAMS, **FIELD_PARAMS))
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid pagination or field parameters')
     @api.response(404, 'Place not found')
+    @conditional(*REVIEW_COLLECTIONS)
     def get(self, place_id):
-        """Get all reviews for a specific place"""
+        """Get a page of reviews for a specific place"""
         # Verify the place exists
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, readonly=True)
         if not place:
             return {'error': 'Place not found'}, 404
         
-        # Fetch reviews for the place via the facade
+        # Parse pagination and fieldset parameters from the query string
+        try:
+            limit, cursor = get_page_args()
+            fields, include = get_view_args()
+            profile = facade.get_view('reviews', fields, include) if is_sparse(fields, include) else None
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        
+        # Fetch one page of reviews for the place via the facade
         try:
-            reviews = facade.get_reviews_by_place(place_id)
-            return [review.to_dict() for review in reviews], 200
+            if not include:
+                rows, next_cursor = facade.get_rows_page('reviews', fields, limit, cursor, place_id=place_id)
+                return rows, 200, page_headers(next_cursor)
+            reviews, next_cursor = facade.get_reviews_by_place_page(place_id, limit, cursor, profile)
+            return [serialize(review, fields, include) for review in reviews], 200, page_headers(next_cursor)
         except ValueError as e:
-            return {'error': str(e)}, 404
+            return {'error': str(e)}, 400
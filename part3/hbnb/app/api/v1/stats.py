@@ -0,0 +1,48 @@
+# app/api/v1/stats.py
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services import facade
+
+api = Namespace('stats', description='Cache and worker pool statistics (admin only)')
+
+@api.route('/cache')
+class CacheStats(Resource):
+    # GET method to inspect the caches of this process, requires admin privileges
+    @jwt_required()
+    @api.response(200, 'Cache statistics retrieved')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Response cache size and per-route hit rates, entity cache counters"""
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        return {
+            'responses': facade.response_cache_stats(),
+            'entities': facade.cache_stats()
+        }, 200
+
+@api.route('/passwords')
+class PasswordHasherStats(Resource):
+    # GET method to inspect the password hashing pool of this process, requires admin privileges
+    @jwt_required()
+    @api.response(200, 'Hashing pool statistics retrieved')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Workers, queue bound, load, rejections and bcrypt cost of the password hashing pool"""
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        return facade.password_hasher_stats(), 200
+
+@api.route('/sessions')
+class SessionStats(Resource):
+    # GET method to inspect the refresh token store, requires admin privileges
+    @jwt_required()
+    @api.response(200, 'Session statistics retrieved')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Live login sessions, refresh token rotations and detected reuses"""
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        return facade.session_stats(), 200
@@ -3,10 +3,23 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.pagination import PAGE_PARAMS, get_page_args, page_headers
+from app.api.query import QUERY_PARAMS, get_query_args
+from app.api.fields import FIELD_PARAMS, get_view_args, is_sparse, serialize
+from app.api.streaming import STREAM_PARAMS, ndjson_response, stream_batch_size, wants_stream
+from app.api.conditional import conditional
+from app.api.batch import BATCH_PARAMS, get_ids_arg, wants_batch
+from app.passwords import PasswordHasherBusy
 
 # API namespace for user operations
 api = Namespace('users', description='User operations')
 
+# Collections whose writes change these responses (ETag versions)
+USER_COLLECTIONS = ('users', 'places', 'reviews')
+
+# Fields anyone may read through ?ids= (user IDs are public through places and reviews; emails are not)
+BATCH_FIELDS = ('id', 'first_name', 'last_name')
+
 # user model for input validation and API documentation
 user_model = api.model('User', {
     'first_name': fields.String(required=True, description='First name of the user'),
@@ -35,6 +48,7 @@ class UserList(Resource):
     @api.response(400, 'Email already registered')
     @api.response(400, 'Invalid input data')
     @api.response(403, 'Admin privileges required')
+    @api.response(503, 'Password hashing pool saturated')
     def post(self):
         # Check if the current user has admin privileges
         current_user = get_jwt_identity()  # Extracts user info from JWT token
@@ -60,41 +74,89 @@ class UserList(Resource):
             }, 201
         except ValueError as e:
             return {'error': str(e)}, 400  # Return validation errors
+        except PasswordHasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': str(e.retry_after)}
         
     # GET method to retrieve all users, requires JWT authentication and admin privileges
-    @jwt_required()
+    # (fetching names by ID with ?ids= is open to everyone, see BATCH_FIELDS)
+    @jwt_required(optional=True)
+    @api.doc(params=dict(PAGE_PARAMS, **QUERY_PARAMS, **FIELD_PARAMS, **STREAM_PARAMS, **BATCH_PARAMS))
     @api.response(200, 'List of users retrieved successfully')
+    @api.response(400, 'Invalid pagination, filter, sort, field or ids parameters')
+    @api.response(401, 'Authentication required')
     @api.response(403, 'Admin privileges required')
     @api.response(404, 'No users found')
+    @conditional(*USER_COLLECTIONS)
     def get(self):
-        """Retrieve a list of all users"""
+        """Retrieve a page of users, stream them all as NDJSON, or fetch several by ID"""
+        # Batch lookup by ID: one query for the whole list
+        if wants_batch():
+            try:
+                fields, _ = get_view_args()
+                if fields is None:
+                    fields = BATCH_FIELDS
+                elif not set(fields) <= set(BATCH_FIELDS):
+                    raise ValueError(f"ids lookups only return {', '.join(BATCH_FIELDS)}")
+                users = facade.get_users_batch(get_ids_arg(), fields)
+            except ValueError as e:
+                return {'error': str(e)}, 400
+            return [user.to_dict(fields) for user in users], 200
+        
         # Check if the current user has admin privileges
         current_user = get_jwt_identity()
+        if current_user is None:
+            return {'error': 'Authentication required'}, 401
         if not current_user.get('is_admin'):
             return {'error': 'Admin privileges required'}, 403
         
-        # Fetch all users from the facade
-        users = facade.get_all_users()
+        # Fetch one page of users from the facade, reading only the requested fields
+        try:
+            limit, cursor = get_page_args()
+            filters, sort = get_query_args(reserved=dict(FIELD_PARAMS, **STREAM_PARAMS, **BATCH_PARAMS))
+            fields, include = get_view_args()
+            profile = facade.get_view('users', fields, include, sort) if is_sparse(fields, include) else None
+            if wants_stream():
+                users = facade.iter_users(filters, sort, profile, stream_batch_size())
+                return ndjson_response(users, fields, include)
+            # Without relationships to embed, the page is read column by column straight into dicts
+            if include:
+                users, next_cursor = facade.get_users_page(limit, cursor, filters, sort, profile)
+            else:
+                users, next_cursor = facade.get_rows_page('users', fields, limit, cursor, filters, sort)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if not users:
             return {'error': 'No users found'}, 404
         
-        # Return the list of users as dictionaries
-        return [user.to_dict() for user in users], 200
+        # Return the page of users as dictionaries
+        if not include:
+            return users, 200, page_headers(next_cursor)
+        return [serialize(user, fields, include) for user in users], 200, page_headers(next_cursor)
 
 # operations on user by ID
 @api.route('/<string:user_id>')
 class UserResource(Resource):
     # GET method to retrieve user details, no authentication required
+    @api.doc(params=FIELD_PARAMS)
     @api.response(200, 'User details retrieved')
+    @api.response(400, 'Invalid field parameters')
     @api.response(404, 'User not found')
+    @conditional(*USER_COLLECTIONS)
     def get(self, user_id):
-        # Fetch user from facade
-        user = facade.get_user(user_id)
+        # Fetch user from facade: the cached snapshot, unless relationships are to be embedded
+        try:
+            fields, include = get_view_args()
+            if include:
+                user = facade.get_user(user_id, facade.get_view('users', fields, include))
+            else:
+                user = facade.get_user(user_id, readonly=True)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if not user:
             return {'error': 'User not found'}, 404
         
         # Return the user data as a dictionary
-        return user.to_dict(), 200
+        return serialize(user, fields, include), 200
     
     # PUT method to update a user, requires JWT authentication
     @jwt_required()
@@ -103,6 +165,7 @@ class UserResource(Resource):
     @api.response(400, 'Invalid input data')
     @api.response(404, 'User not found')
     @api.response(403, 'Unauthorized action or Admin privileges required')
+    @api.response(503, 'Password hashing pool saturated')
     def put(self, user_id):
         # Get the current user's identity from the JWT token
         current_user = get_jwt_identity()
@@ -124,7 +187,7 @@ class UserResource(Resource):
                     return {'error': 'Email already in use'}, 400
         
         # Fetch the user to update
-        user = facade.get_user(user_id)
+        user = facade.get_user(user_id, readonly=True)
         if not user:
             return {'error': 'User not found'}, 404
         
@@ -134,6 +197,8 @@ class UserResource(Resource):
             return updated_user.to_dict(), 200
         except ValueError as e:
             return {'error': str(e)}, 400  # Return validation errors if any
+        except PasswordHasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': str(e.retry_after)}
 
     # DELETE a user, requires JWT authentication and admin privileges
     @jwt_required()
@@ -151,7 +216,7 @@ class UserResource(Resource):
             return {'error': 'Admin privileges required'}, 403
         
         # Fetch the existing user
-        user = facade.get_user(user_id)
+        user = facade.get_user(user_id, readonly=True)
         if not user:
             return {'error': 'User not found'}, 404
         
@@ -0,0 +1,125 @@
+# app/asgi.py
+
+""" ASGI serving mode: the same /api/v1 routes over asyncio
+
+GET requests of resources with an async view (app/api/v1/async_views.py) run on the event loop: argument
+parsing, caches, ETags, JSON encoding and compression are the Flask app's (inside a request context, no I/O),
+only the database round trips are awaited on an async session. Every other request (writes, login, search,
+radius and amenity queries, NDJSON exports, Swagger UI) goes to the Flask app itself, run in a thread pool.
+
+Optional dependencies: pip install -r requirements-asgi.txt (async SQLAlchemy and drivers, a2wsgi, uvicorn).
+Start with: uvicorn asgi:app (asgi.py at the project root)
+"""
+import io
+import sys
+from sqlalchemy.orm import configure_mappers
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+from app import create_app
+from app.async_database import adb
+from app.api.async_routing import ASYNC_VIEWS, json_response, respond
+import app.api.v1.async_views  # noqa: F401 (registers the async views)
+
+
+# WSGI environ of an HTTP scope without a body (Flask request context, URL matching)
+def _environ(scope):
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope['headers']:
+        name, value = name.decode('latin-1').upper().replace('-', '_'), value.decode('latin-1')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+# Send a complete (not streamed) Flask response
+async def _send(response, send):
+    headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers.items()]
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+class HBnBAsgi:
+    def __init__(self, flask_app, wsgi_workers=16):
+        try:
+            from a2wsgi import WSGIMiddleware
+        except ImportError:
+            raise RuntimeError("The ASGI mode requires pip install -r requirements-asgi.txt (a2wsgi)")
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=wsgi_workers)
+        # Flask endpoint -> async view, for the resources that have one
+        self.views = {
+            endpoint: ASYNC_VIEWS[view.view_class] for endpoint, view in flask_app.view_functions.items()
+            if getattr(view, 'view_class', None) in ASYNC_VIEWS
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            environ = _environ(scope)
+            view, kwargs = self._match(environ)
+            if view is not None:
+                response = await self._respond(view, kwargs, environ)
+                if response is not None:
+                    return await _send(response, send)
+        await self.wsgi(scope, receive, send)
+
+    # Async view and URL arguments of a request, (None, None) when the Flask app is to serve it
+    def _match(self, environ):
+        try:
+            endpoint, kwargs = self.flask_app.url_map.bind_to_environ(environ).match()
+        except (HTTPException, RequestRedirect):
+            return None, None
+        return self.views.get(endpoint), kwargs
+
+    # Response of an async view, None when it delegates this request to the sync view
+    async def _respond(self, view, kwargs, environ):
+        with self.flask_app.request_context(environ):
+            if view.delegate():
+                return None
+            try:
+                async with adb.scope():
+                    response = await respond(view, kwargs)
+            except Exception:
+                self.flask_app.log_exception(sys.exc_info())
+                response = json_response({'message': 'Internal Server Error'}, 500)
+            # after_request hooks, like the WSGI path (compression, debug headers)
+            return self.flask_app.process_response(response)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await adb.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+# Create the Flask app, attach the async engine and wrap both in the ASGI application
+def create_asgi_app(config_class="config.DevelopmentConfig"):
+    flask_app = create_app(config_class)
+    adb.init_app(flask_app)
+    # Backrefs (Place.owner, Review.author...) exist once the mappers are configured, which the sync path
+    # does on its first query; async views build loader options before any query runs
+    configure_mappers()
+    return HBnBAsgi(flask_app, flask_app.config.get('ASGI_WSGI_WORKERS', 16))
@@ -0,0 +1,76 @@
+# app/async_database.py
+
+""" Async engine and request-scoped sessions of the ASGI serving mode (app/asgi.py)
+
+Optional: needs SQLAlchemy's asyncio extra and an async driver for the configured database
+(pip install -r requirements-asgi.txt installs both, with aiosqlite and aiomysql).
+"""
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from sqlalchemy.engine import make_url
+
+# Async driver used for each sync driver of SQLALCHEMY_DATABASE_URI
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+    'mysql': 'mysql+aiomysql',
+    'mysql+pymysql': 'mysql+aiomysql',
+    'mysql+mysqldb': 'mysql+aiomysql',
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg'
+}
+
+
+# Same database as a sync URI, through the matching async driver
+def async_database_uri(uri):
+    url = make_url(uri)
+    if url.drivername not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {url.drivername}: set ASYNC_SQLALCHEMY_DATABASE_URI")
+    return url.set(drivername=ASYNC_DRIVERS[url.drivername])
+
+
+# Async counterpart of app.database.db: one engine per app, one session per request (held in a context variable)
+class AsyncDatabase:
+    def __init__(self):
+        self.engine = None
+        self._sessionmaker = None
+        self._session = ContextVar('async_session', default=None)
+
+    def init_app(self, app):
+        try:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        except ImportError:
+            raise RuntimeError('The ASGI mode requires pip install -r requirements-asgi.txt (async SQLAlchemy and drivers)')
+        uri = app.config.get('ASYNC_SQLALCHEMY_DATABASE_URI') or async_database_uri(
+            app.config['SQLALCHEMY_DATABASE_URI']
+        )
+        self.engine = create_async_engine(uri, **app.config.get('ASYNC_ENGINE_OPTIONS', {}))
+        # Objects stay loaded after the session closes, like the sync session after a commit
+        self._sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    @property
+    def session(self):
+        """Session of the current request"""
+        session = self._session.get()
+        if session is None:
+            raise RuntimeError("No async session: run the code inside 'async with adb.scope()'")
+        return session
+
+    @asynccontextmanager
+    async def scope(self):
+        """Open the session of a request and close it (returning its connection to the pool) at the end"""
+        session = self._sessionmaker()
+        token = self._session.set(session)
+        try:
+            yield session
+        finally:
+            self._session.reset(token)
+            await session.close()
+
+    async def dispose(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+# Instance shared by the async repositories
+adb = AsyncDatabase()
@@ -0,0 +1,78 @@
+# app/bitmap.py
+
+""" Compressed bitmap of non-negative integers, roaring-style: 2^16-bit chunks keyed by the high bits """
+
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+class Bitmap:
+    __slots__ = ('_chunks',)
+
+    def __init__(self, values=()):
+        self._chunks = {}  # high bits -> Python int whose bits are the low bits present
+        for value in values:
+            self.add(value)
+
+    @classmethod
+    def _from_chunks(cls, chunks):
+        bitmap = cls()
+        bitmap._chunks = {key: bits for key, bits in chunks.items() if bits}
+        return bitmap
+
+    def add(self, value):
+        key = value >> CHUNK_BITS
+        self._chunks[key] = self._chunks.get(key, 0) | (1 << (value & CHUNK_MASK))
+
+    def discard(self, value):
+        key = value >> CHUNK_BITS
+        bits = self._chunks.get(key, 0) & ~(1 << (value & CHUNK_MASK))
+        if bits:
+            self._chunks[key] = bits
+        else:
+            self._chunks.pop(key, None)
+
+    def __contains__(self, value):
+        return bool(self._chunks.get(value >> CHUNK_BITS, 0) >> (value & CHUNK_MASK) & 1)
+
+    def __len__(self):
+        return sum(bits.bit_count() for bits in self._chunks.values())
+
+    def __bool__(self):
+        return bool(self._chunks)
+
+    # Set operations only visit the chunks that can contribute to the result
+    def __and__(self, other):
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        return Bitmap._from_chunks({key: bits & large[key] for key, bits in small.items() if key in large})
+
+    def __or__(self, other):
+        chunks = dict(self._chunks)
+        for key, bits in other._chunks.items():
+            chunks[key] = chunks.get(key, 0) | bits
+        return Bitmap._from_chunks(chunks)
+
+    def __sub__(self, other):
+        return Bitmap._from_chunks({
+            key: bits & ~other._chunks.get(key, 0) for key, bits in self._chunks.items()
+        })
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def iter_from(self, start):
+        """Yield the values >= start in ascending order"""
+        for key in sorted(self._chunks):
+            if (key + 1) << CHUNK_BITS <= start:
+                continue
+            base = key << CHUNK_BITS
+            bits = self._chunks[key]
+            if start > base:
+                bits &= ~((1 << (start - base)) - 1)
+            while bits:
+                lowest = bits & -bits
+                yield base + lowest.bit_length() - 1
+                bits ^= lowest
+
+    def __repr__(self):
+        return f"<Bitmap of {len(self)} values>"
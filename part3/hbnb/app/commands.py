@@ -0,0 +1,21 @@
+# app/commands.py
+
+""" Maintenance commands registered on the Flask CLI """
+import click
+from app.services import facade
+
+
+# flask reconcile-ratings: rebuild the denormalized rating aggregates on places
+@click.command('reconcile-ratings')
+def reconcile_ratings():
+    """Recompute review_count, rating_sum and the rating histogram of every place."""
+    count = facade.reconcile_rating_aggregates()
+    click.echo(f"Recomputed rating aggregates for {count} places.")
+
+
+# flask rebuild-search-index: repopulate the full-text index from the places table
+@click.command('rebuild-search-index')
+def rebuild_search_index():
+    """Rebuild the inverted index used by GET /api/v1/places/search."""
+    count = facade.rebuild_search_index()
+    click.echo(f"Indexed {count} places.")
@@ -2,5 +2,5 @@
 """ Debug circular import of db """
 from flask_sqlalchemy import SQLAlchemy
 
-# Instantiate SQLAlchemy db
-db = SQLAlchemy()
+# Instantiate SQLAlchemy db; objects stay loaded after the unit of work commits
+db = SQLAlchemy(session_options={'expire_on_commit': False})
@@ -0,0 +1,83 @@
+# app/geo.py
+
+""" Geospatial helpers: grid cells for indexed lookups, bounding boxes and haversine distances """
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Places are bucketed in a fixed lat/lon grid; each cell is CELL_DEGREES wide (~55 km at the equator)
+CELL_DEGREES = 0.5
+CELL_ROWS = int(180 / CELL_DEGREES)
+CELL_COLUMNS = int(360 / CELL_DEGREES)
+
+# Above this many cells a box is searched with plain coordinate ranges instead of a cell IN list
+MAX_CELLS = 256
+
+
+# Grid cell number of a coordinate
+def geo_cell(latitude, longitude):
+    row = min(int((latitude + 90) // CELL_DEGREES), CELL_ROWS - 1)
+    column = int((longitude + 180) // CELL_DEGREES) % CELL_COLUMNS
+    return row * CELL_COLUMNS + column
+
+
+# Cell numbers covering a box (west > east means it crosses the antimeridian), None if too many
+def cells_in_bbox(south, west, north, east):
+    rows = range(geo_cell(south, 0) // CELL_COLUMNS, geo_cell(north, 0) // CELL_COLUMNS + 1)
+    first, last = geo_cell(0, west) % CELL_COLUMNS, geo_cell(0, east) % CELL_COLUMNS
+    if west <= east:
+        columns = list(range(first, last + 1))
+    else:
+        columns = list(range(first, CELL_COLUMNS)) + list(range(0, last + 1))
+    if len(rows) * len(columns) > MAX_CELLS:
+        return None
+    return [row * CELL_COLUMNS + column for row in rows for column in columns]
+
+
+# Smallest (south, west, north, east) box containing the circle of radius_km around a point
+def bounding_box(latitude, longitude, radius_km):
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = max(latitude - delta_lat, -90.0), min(latitude + delta_lat, 90.0)
+    cos_lat = math.cos(math.radians(max(abs(south), abs(north))))
+    if north >= 90.0 or south <= -90.0 or radius_km >= EARTH_RADIUS_KM * math.pi * cos_lat:
+        return south, -180.0, north, 180.0  # the circle reaches a pole or wraps the whole parallel
+    delta_lon = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    if delta_lon >= 180.0:
+        return south, -180.0, north, 180.0
+    west, east = longitude - delta_lon, longitude + delta_lon
+    return south, (west + 540.0) % 360.0 - 180.0, north, (east + 540.0) % 360.0 - 180.0
+
+
+# Haversine distances in km from one point to many (latitude, longitude) points
+def distances_km(latitude, longitude, points):
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    cos_lat1 = math.cos(lat1)
+    sin, cos, asin, sqrt, radians = math.sin, math.cos, math.asin, math.sqrt, math.radians
+    result = []
+    for lat2, lon2 in points:
+        lat2, lon2 = radians(lat2), radians(lon2)
+        a = sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+        result.append(2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a))))
+    return result
+
+
+# Parse "lat,lon" into a validated coordinate pair
+def parse_point(value):
+    try:
+        latitude, longitude = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        raise ValueError("near must be 'latitude,longitude'")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("near is out of range")
+    return latitude, longitude
+
+
+# Parse "south,west,north,east" into a validated box
+def parse_bbox(value):
+    try:
+        south, west, north, east = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        raise ValueError("bbox must be 'south,west,north,east'")
+    if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("bbox is out of range")
+    return south, west, north, east
@@ -6,6 +6,8 @@ from app.database import db  # Import db from the new module
 # Amenity model for place features
 class Amenity(BaseModel):
     __tablename__ = 'amenities'
+    # Composite index backing keyset pagination on (created_at, id)
+    __table_args__ = (db.Index('ix_amenities_created_at_id', 'created_at', 'id'),)
     
     # Amenity attribute
     name = db.Column(db.String(50), nullable=False)
@@ -16,11 +18,5 @@ class Amenity(BaseModel):
         super().__init__()
         self.name = name
     
-    def to_dict(self):
-        """Convert amenity object to dictionary for API responses."""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
+    # Fields of API responses (see BaseModel.to_dict)
+    public_fields = ('id', 'name', 'created_at', 'updated_at')
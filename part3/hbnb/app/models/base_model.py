@@ -1,6 +1,7 @@
 # app/models/base_model.py
 
 from app.database import db
+from app.persistence.unit_of_work import save_changes
 import uuid
 from datetime import datetime
 
@@ -10,13 +11,39 @@ class BaseModel(db.Model):
 
     # Common fields for all models
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=datetime.now())
-    updated_at = db.Column(db.DateTime, default=datetime.now(), onupdate=datetime.now())
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    # Fields emitted by to_dict, in order: columns, or entries of computed_fields
+    public_fields = ('id', 'created_at', 'updated_at')
+    # Computed field name -> (function of the instance, names of the columns it reads)
+    computed_fields = {}
+
+    def to_dict(self, fields=None):
+        """Convert the object to a dictionary for API responses, limited to fields if given."""
+        data = {}
+        for name in self.public_fields:
+            if fields is not None and name not in fields:
+                continue  # unrequested fields are never read, so their columns need not be loaded
+            computed = self.computed_fields.get(name)
+            value = computed[0](self) if computed else getattr(self, name)
+            data[name] = value.isoformat() if isinstance(value, datetime) else value
+        return data
+
+    @classmethod
+    def columns_for(cls, fields):
+        """Names of the columns read to serialize fields, raising ValueError for unknown fields"""
+        columns = {'id'}
+        for name in fields:
+            if name not in cls.public_fields:
+                raise ValueError(f"Unknown field: {name}")
+            columns.update(cls.computed_fields[name][1] if name in cls.computed_fields else (name,))
+        return columns
 
     def save(self):
         """Optional: Persist changes to the database."""
         self.updated_at = datetime.now()
-        db.session.commit()
+        save_changes()
 
     def update(self, data):
         """Optional: Update model attributes and save."""
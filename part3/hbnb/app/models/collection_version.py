@@ -0,0 +1,10 @@
+# app/models/collection_version.py
+
+""" Per-collection version counters, bumped by every write (ETags of read endpoints) """
+from app.database import db
+
+collection_versions = db.Table(
+    'collection_versions',
+    db.Column('name', db.String(32), primary_key=True),
+    db.Column('version', db.BigInteger, nullable=False, default=0)
+)
@@ -1,12 +1,23 @@
 # app/models/place.py
 
+from sqlalchemy import event
 from .base_model import BaseModel
 from app.database import db
+from app.geo import geo_cell
 from .place_amenity import place_amenity
 
 # Place model
 class Place(BaseModel):
     __tablename__ = 'places'
+    # Indexes backing the API access paths: keyset pagination on (created_at, id),
+    # places by owner, price filters/sorts, coordinate range scans and grid cell lookups
+    __table_args__ = (
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+        db.Index('ix_places_owner_id', 'owner_id'),
+        db.Index('ix_places_price', 'price'),
+        db.Index('ix_places_latitude_longitude', 'latitude', 'longitude'),
+        db.Index('ix_places_geo_cell', 'geo_cell'),
+    )
     
     # Place attributes
     title = db.Column(db.String(100), nullable=False)
@@ -15,10 +26,22 @@ class Place(BaseModel):
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
     owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    # Spatial grid cell of (latitude, longitude), see app/geo.py; kept in sync on insert/update
+    geo_cell = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
-    # Relationships
-    reviews = db.relationship('Review', backref='place', lazy='dynamic')
-    amenities = db.relationship('Amenity', secondary=place_amenity, backref=db.backref('places', lazy='dynamic'), lazy='dynamic')
+    # Rating aggregates, maintained by the facade on every review write
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    # Relationships (plain collections: eager-load them with a repository profile,
+    # or use repository.query_related() for large counts and filters)
+    reviews = db.relationship('Review', backref='place', lazy='select')
+    amenities = db.relationship('Amenity', secondary=place_amenity, backref=db.backref('places', lazy='select'), lazy='select')
     
     def __init__(self, title, description, price, latitude, longitude, owner_id):
         super().__init__()
@@ -28,17 +51,31 @@ class Place(BaseModel):
         self.latitude = float(latitude)
         self.longitude = float(longitude)
         self.owner_id = owner_id
+        self.review_count = 0
+        self.rating_sum = 0
+        for rating in range(1, 6):
+            setattr(self, f'rating_count_{rating}', 0)
+    
+    @property
+    def average_rating(self):
+        """Mean review rating, or None when the place has no reviews."""
+        return round(self.rating_sum / self.review_count, 2) if self.review_count else None
     
-    def to_dict(self):
-        """Convert place object to dictionary for API responses."""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'price': self.price,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'owner_id': self.owner_id,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
+    # Fields of API responses (see BaseModel.to_dict)
+    public_fields = (
+        'id', 'title', 'description', 'price', 'latitude', 'longitude', 'owner_id',
+        'review_count', 'average_rating', 'rating_histogram', 'created_at', 'updated_at'
+    )
+    computed_fields = {
+        'average_rating': (lambda place: place.average_rating, ('review_count', 'rating_sum')),
+        'rating_histogram': (
+            lambda place: {str(rating): getattr(place, f'rating_count_{rating}') for rating in range(1, 6)},
+            tuple(f'rating_count_{rating}' for rating in range(1, 6))
+        )
+    }
+
+# Keep the spatial grid cell in sync with the coordinates on every insert and update
+@event.listens_for(Place, 'before_insert')
+@event.listens_for(Place, 'before_update')
+def _update_geo_cell(mapper, connection, place):
+    place.geo_cell = geo_cell(float(place.latitude), float(place.longitude))
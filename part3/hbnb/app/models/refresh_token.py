@@ -0,0 +1,12 @@
+# app/models/refresh_token.py
+
+""" Refresh token families: one row per login session, holding the only refresh token still accepted """
+from app.database import db
+
+refresh_tokens = db.Table(
+    'refresh_tokens',
+    db.Column('family', db.String(36), primary_key=True),
+    db.Column('jti', db.String(36), nullable=False),
+    db.Column('user_id', db.String(36), nullable=False, index=True),
+    db.Column('expires_at', db.DateTime, nullable=False)
+)
@@ -6,6 +6,14 @@ from app.database import db  # Import db from the new module
 # Review model for user feedback on places
 class Review(BaseModel):
     __tablename__ = 'reviews'
+    # Composite index backing keyset pagination on (created_at, id), reviews by place,
+    # and one review per user and place (its user_id prefix also serves reviews by user)
+    __table_args__ = (
+        db.Index('ix_reviews_created_at_id', 'created_at', 'id'),
+        db.Index('ix_reviews_place_id', 'place_id'),
+        db.UniqueConstraint('user_id', 'place_id', name='unique_user_place'),
+        db.CheckConstraint('rating BETWEEN 1 AND 5', name='check_review_rating'),
+    )
     
     # Review attributes
     text = db.Column(db.Text, nullable=False)
@@ -22,14 +30,5 @@ class Review(BaseModel):
         self.text = text
         self.rating = int(rating)
     
-    def to_dict(self):
-        """Convert review object to dictionary for API responses."""
-        return {
-            'id': self.id,
-            'place_id': self.place_id,
-            'user_id': self.user_id,
-            'text': self.text,
-            'rating': self.rating,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
+    # Fields of API responses (see BaseModel.to_dict)
+    public_fields = ('id', 'place_id', 'user_id', 'text', 'rating', 'created_at', 'updated_at')
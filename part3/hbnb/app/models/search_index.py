@@ -0,0 +1,23 @@
+# app/models/search_index.py
+
+""" Inverted index tables for full-text place search """
+from app.database import db
+
+# Postings: one row per (term, place) with the weighted term frequency and the document length
+search_postings = db.Table(
+    'search_postings',
+    db.Column('term', db.String(64), primary_key=True),
+    db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
+    db.Column('term_frequency', db.Integer, nullable=False),
+    db.Column('doc_length', db.Integer, nullable=False),
+    # The primary key serves lookups by term; this one serves re-indexing and deleting a place
+    db.Index('ix_search_postings_place_id', 'place_id')
+)
+
+# Corpus statistics needed by BM25, kept in a single row (id = 1)
+search_stats = db.Table(
+    'search_stats',
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('document_count', db.Integer, nullable=False, default=0),
+    db.Column('total_length', db.BigInteger, nullable=False, default=0)
+)
@@ -2,13 +2,13 @@
 
 from .base_model import BaseModel
 from app.database import db
-from flask_bcrypt import Bcrypt  # Import directly from flask_bcrypt
-
-bcrypt = Bcrypt()  # Initialize bcrypt here
+from app.passwords import hasher  # bcrypt runs in a bounded worker pool
 
 # User model with authentication logic
 class User(BaseModel):
     __tablename__ = 'users'
+    # Composite index backing keyset pagination on (created_at, id)
+    __table_args__ = (db.Index('ix_users_created_at_id', 'created_at', 'id'),)
 
     # User attributes
     first_name = db.Column(db.String(50), nullable=False)
@@ -17,9 +17,10 @@ class User(BaseModel):
     password = db.Column(db.String(128), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
     
-    # Relationships
-    places = db.relationship('Place', backref='owner', lazy='dynamic')
-    reviews = db.relationship('Review', backref='author', lazy='dynamic')
+    # Relationships (plain collections: eager-load them with a repository profile,
+    # or use repository.query_related() for large counts and filters)
+    places = db.relationship('Place', backref='owner', lazy='select')
+    reviews = db.relationship('Review', backref='author', lazy='select')
 
     def __init__(self, first_name, last_name, email, password, is_admin=False):
         super().__init__()
@@ -31,20 +32,15 @@ class User(BaseModel):
 
     def hash_password(self, password):
         """Hash the password before storing it"""
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = hasher.hash(password)
 
     def verify_password(self, password):
         """Verify if the provided password matches the hashed password"""
-        return bcrypt.check_password_hash(self.password, password)
+        return hasher.verify(self.password, password)
+
+    def password_needs_rehash(self):
+        """Whether the stored hash was made with another bcrypt cost than the configured one"""
+        return hasher.needs_rehash(self.password)
     
-    def to_dict(self):
-        """Convert user object to dictionary for API responses"""
-        return {
-            'id': self.id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email,
-            'is_admin': self.is_admin,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
+    # Fields of API responses (see BaseModel.to_dict); the password hash is never serialized
+    public_fields = ('id', 'first_name', 'last_name', 'email', 'is_admin', 'created_at', 'updated_at')
@@ -0,0 +1,149 @@
+# app/passwords.py
+
+""" Password hashing off the request thread: bcrypt runs in a bounded worker pool
+
+At most workers hashes run at once and at most queue more wait for a worker; past that, hash() and verify()
+fail fast with PasswordHasherBusy (the API answers 503 with Retry-After) instead of piling up request threads.
+The bcrypt cost is either configured or calibrated at startup for a target latency; hashes made with another
+cost are reported by needs_rehash() so that a successful login can upgrade them.
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+# Bounds of the bcrypt cost (log2 of the key expansion rounds) accepted by configure() and calibrate()
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+
+# Raised when every worker is busy and the wait queue is full
+class PasswordHasherBusy(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Too many password operations in progress, retry later")
+        self.retry_after = retry_after  # seconds, for the Retry-After header
+
+
+# Seconds one hash takes at the given cost, timed on a few samples
+def _measure(rounds, samples=3):
+    start = time.perf_counter()
+    for _ in range(samples):
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(rounds))
+    return (time.perf_counter() - start) / samples
+
+
+# Highest cost whose hash takes at most target_ms on this machine, within [min_rounds, MAX_ROUNDS]:
+# timed at a cheap cost, then extrapolated (each extra round doubles the work)
+def calibrate(target_ms, min_rounds=10, probe=8):
+    budget = target_ms / 1000 / _measure(probe)
+    rounds = probe + math.floor(math.log2(budget)) if budget > 0 else MIN_ROUNDS
+    return max(min_rounds, min(rounds, MAX_ROUNDS))
+
+
+# Cost a stored hash was made with ($2b$<cost>$...), None for anything that is not a bcrypt hash
+def hash_rounds(pw_hash):
+    parts = pw_hash.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+# Bounded pool running bcrypt for the whole process
+class PasswordHasher:
+    def __init__(self, workers=None, queue=None, rounds=12):
+        self._lock = threading.Lock()
+        self._executor = None
+        self.configure(workers, queue, rounds)
+
+    def configure(self, workers=None, queue=None, rounds=12):
+        """Replace the pool; in-flight operations finish on the previous one"""
+        if not MIN_ROUNDS <= rounds <= MAX_ROUNDS:
+            raise ValueError(f"bcrypt rounds must be between {MIN_ROUNDS} and {MAX_ROUNDS}")
+        workers = workers or os.cpu_count() or 1
+        queue = workers * 4 if queue is None else queue
+        with self._lock:
+            previous = self._executor
+            self.workers = workers
+            self.queue = queue
+            self.rounds = rounds
+            self._executor = ThreadPoolExecutor(workers, thread_name_prefix='bcrypt')
+            # One slot per running or waiting operation
+            self._slots = threading.BoundedSemaphore(workers + queue)
+            self._in_flight = 0
+            self.completed = self.rejected = 0
+            self._seconds = 0.0  # total bcrypt time of the completed operations
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+    def hash(self, password):
+        """bcrypt hash of password with the configured cost, as text"""
+        salt = bcrypt.gensalt(self.rounds)
+        return self._run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, pw_hash, password):
+        """Whether password matches pw_hash (constant time comparison)"""
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), pw_hash.encode('utf-8'))
+
+    def needs_rehash(self, pw_hash):
+        """Whether pw_hash was made with another cost than the configured one"""
+        return hash_rounds(pw_hash) != self.rounds
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue': self.queue,
+                'rounds': self.rounds,
+                'in_flight': self._in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'average_ms': round(self._seconds / max(self.completed, 1) * 1000, 2)
+            }
+
+    # Run a bcrypt call on the pool and wait for it; reject it at once when no slot is free
+    def _run(self, function, *args):
+        with self._lock:
+            slots = self._slots
+            if not slots.acquire(blocking=False):
+                self.rejected += 1
+                raise PasswordHasherBusy(self._retry_after())
+            self._in_flight += 1
+            future = self._executor.submit(self._timed, function, *args)
+        try:
+            return future.result()
+        finally:
+            with self._lock:
+                if slots is self._slots:
+                    self._in_flight -= 1
+            slots.release()
+
+    def _timed(self, function, *args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.completed += 1
+                self._seconds += elapsed
+
+    # Time for the pool to drain its queue, from the average operation time (at least one second)
+    def _retry_after(self):
+        average = self._seconds / self.completed if self.completed else 0.25
+        return max(1, math.ceil(average * (self.workers + self.queue) / self.workers))
+
+
+# The process-wide hasher, configured by create_app() from PASSWORD_HASHING
+hasher = PasswordHasher()
+
+
+# Apply the PASSWORD_HASHING settings: a fixed 'rounds', or one calibrated for 'target_ms'
+def configure_hasher(settings):
+    rounds = settings.get('rounds')
+    if rounds is None:
+        rounds = calibrate(settings.get('target_ms', 250), settings.get('min_rounds', 10))
+    hasher.configure(settings.get('workers'), settings.get('queue'), rounds)
+    return hasher.rounds
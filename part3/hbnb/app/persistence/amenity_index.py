@@ -0,0 +1,180 @@
+# app/persistence/amenity_index.py
+
+""" In-process bitmap index answering amenity-set filters on places """
+import threading
+import time
+from bisect import bisect_right
+from itertools import islice
+from flask import current_app
+from sqlalchemy import select
+from app.bitmap import Bitmap
+from app.database import db
+from app.models.place import Place
+from app.models.place_amenity import place_amenity
+from app.persistence.pagination import encode_cursor, decode_cursor
+from app.persistence.unit_of_work import on_commit
+
+
+# One bitmap per amenity over place positions; positions follow the (created_at, id) pagination order
+class AmenityIndex:
+    def __init__(self, ttl=60):
+        self.ttl = ttl              # rebuild period, bounding staleness from writes made by other processes
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()  # one first build at a time
+        self._built_at = None
+        self._stale = False         # rebuild on the next query (an update could not be applied in place)
+        self._rebuilding = False
+        self._pending = []          # changes committed while a rebuild reads, replayed onto its result
+        self._keys = []             # position -> (created_at, place id), ascending
+        self._positions = {}        # place id -> position
+        self._live = Bitmap()       # positions of existing places
+        self._bitmaps = {}          # amenity id -> Bitmap of positions
+        self.rebuilds = self.updates = 0
+
+    def page(self, clauses, limit, cursor=None):
+        """Return ([place ids], next_cursor) of the places matching the clauses, in pagination order
+
+        clauses is a list ANDed together; each clause is a list of (amenity_id, negated) literals ORed together.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        self._ensure_fresh()
+        with self._lock:
+            matches = self._evaluate(clauses)
+            start = bisect_right(self._keys, after) if after else 0
+            keys = [self._keys[position] for position in islice(matches.iter_from(start), limit + 1)]
+        if len(keys) <= limit:
+            return [place_id for _, place_id in keys], None
+        keys = keys[:limit]
+        return [place_id for _, place_id in keys], encode_cursor(*keys[-1])
+
+    def place_changed(self, place_id, created_at, amenity_ids):
+        """Record a place's amenity set, applied when the current transaction commits"""
+        on_commit(lambda: self._set_place(place_id, created_at, set(amenity_ids)))
+
+    def place_removed(self, place_id):
+        """Record a place deletion, applied when the current transaction commits"""
+        on_commit(lambda: self._set_place(place_id, None, set()))
+
+    def amenity_removed(self, amenity_id):
+        """Record an amenity deletion, applied when the current transaction commits"""
+        on_commit(lambda: self._drop_amenity(amenity_id))
+
+    def invalidate(self):
+        """Rebuild (in the background) on the next query"""
+        with self._lock:
+            self._stale = True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'places': len(self._live),
+                'amenities': len(self._bitmaps),
+                'ttl': self.ttl,
+                'rebuilds': self.rebuilds,
+                'updates': self.updates
+            }
+
+    def _evaluate(self, clauses):
+        result = self._live
+        for clause in clauses:
+            matches = Bitmap()
+            for amenity_id, negated in clause:
+                bitmap = self._bitmaps.get(amenity_id, Bitmap())
+                matches = matches | (self._live - bitmap if negated else bitmap)
+            result = result & matches
+        return result
+
+    def _ensure_fresh(self):
+        # The first query builds the index; later ones start a background rebuild when it is older than ttl
+        # (or stale) and keep answering from the current one, so no request waits on the full scan
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild()
+            return
+        with self._lock:
+            if self._rebuilding or (not self._stale and time.monotonic() - self._built_at <= self.ttl):
+                return
+            self._rebuilding = True
+        app = current_app._get_current_object()
+        threading.Thread(target=self._rebuild_in_background, args=(app,), daemon=True).start()
+
+    def _rebuild_in_background(self, app):
+        try:
+            with app.app_context():  # own database session, removed on exit
+                self._rebuild()
+        except Exception:
+            app.logger.exception("Amenity index rebuild failed, serving the previous index")
+
+    def _rebuild(self):
+        with self._lock:
+            self._rebuilding = True
+        try:
+            keys = [tuple(row) for row in db.session.execute(
+                select(Place.created_at, Place.id).order_by(Place.created_at, Place.id)
+            )]
+            positions = {place_id: position for position, (_, place_id) in enumerate(keys)}
+            bitmaps = {}
+            for place_id, amenity_id in db.session.execute(
+                select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+            ):
+                # A place committed after the first scan is left to the pending changes, which add it in order
+                if place_id in positions:
+                    bitmaps.setdefault(amenity_id, Bitmap()).add(positions[place_id])
+        except Exception:
+            with self._lock:
+                self._rebuilding, self._pending = False, []
+            raise
+        with self._lock:
+            self._keys, self._positions, self._bitmaps = keys, positions, bitmaps
+            self._live = Bitmap(range(len(keys)))
+            self._built_at = time.monotonic()
+            self._stale = False
+            self.rebuilds += 1
+            # Changes committed during the scan may be missing from it: apply them again (they are idempotent)
+            pending, self._pending, self._rebuilding = self._pending, [], False
+            for apply, args in pending:
+                apply(*args)
+
+    def _set_place(self, place_id, created_at, amenity_ids):
+        with self._lock:
+            self._record(self._apply_place, place_id, created_at, amenity_ids)
+
+    def _drop_amenity(self, amenity_id):
+        with self._lock:
+            self._record(self._apply_drop_amenity, amenity_id)
+
+    def _record(self, apply, *args):
+        # Apply a committed change to the current index (lock held), keeping it for replay if a rebuild runs
+        if self._rebuilding:
+            self._pending.append((apply, args))
+        apply(*args)
+
+    def _apply_place(self, place_id, created_at, amenity_ids):
+        if self._built_at is None:
+            return  # the first query builds from the database anyway
+        position = self._positions.get(place_id)
+        if position is None:
+            if created_at is None:
+                return
+            key = (created_at, place_id)
+            if self._keys and key < self._keys[-1]:
+                self._stale = True  # cannot append out of order: rebuild on the next query
+                return
+            position = self._positions[place_id] = len(self._keys)
+            self._keys.append(key)
+        if created_at is None:
+            self._live.discard(position)
+            del self._positions[place_id]
+        else:
+            self._live.add(position)
+        for amenity_id, bitmap in self._bitmaps.items():
+            if amenity_id not in amenity_ids:
+                bitmap.discard(position)
+        for amenity_id in amenity_ids:
+            self._bitmaps.setdefault(amenity_id, Bitmap()).add(position)
+        self.updates += 1
+
+    def _apply_drop_amenity(self, amenity_id):
+        self._bitmaps.pop(amenity_id, None)
+        self.updates += 1
@@ -4,5 +4,7 @@ from app.models.amenity import Amenity
 from app.persistence.repository import SQLAlchemyRepository
 
 class AmenityRepository(SQLAlchemyRepository):
+    query_fields = ('name', 'created_at')
+
     def __init__(self):
         super().__init__(Amenity)
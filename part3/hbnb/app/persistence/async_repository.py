@@ -0,0 +1,63 @@
+# app/persistence/async_repository.py
+
+""" Async reads for the ASGI serving mode: the statements of a SQLAlchemyRepository, run on the async session
+
+Loading profiles, views, query compilation, keyset seeks and row plans all come from the wrapped sync
+repository, so both modes return the same rows in the same order with the same cursors. The entity cache of
+the sync repository is shared: writes made through the sync facade invalidate it for both.
+"""
+from sqlalchemy import select
+from app.async_database import adb
+from app.persistence.columnar import RowPlan
+from app.persistence.pagination import encode_cursor
+
+
+class AsyncSQLAlchemyRepository:
+    def __init__(self, repo):
+        self.repo = repo  # sync repository providing the statements
+        self.model = repo.model
+
+    def _select(self, profile=None):
+        return select(self.model).options(*self.repo.loader_options(profile))
+
+    async def get(self, obj_id, profile=None, readonly=False):
+        """Load an entity; readonly lookups may return a cached, immutable snapshot instead"""
+        cache = self.repo.cache if readonly and profile is None else None
+        if cache is not None:
+            generation = cache.generation()
+            snapshot = cache.get(('id', obj_id))
+            if snapshot is not None:
+                return snapshot
+        result = await adb.session.execute(self._select(profile).where(self.model.id == obj_id))
+        obj = result.unique().scalar_one_or_none()
+        return cache.put(('id', obj_id), obj, generation) if cache is not None else obj
+
+    async def get_many(self, obj_ids, profile=None):
+        """Return ({id: obj} for the ids found, [missing ids]) with a single IN query"""
+        obj_ids = list(dict.fromkeys(obj_ids))
+        result = await adb.session.execute(self._select(profile).where(self.model.id.in_(obj_ids)))
+        found = {obj.id: obj for obj in result.unique().scalars()}
+        return found, [obj_id for obj_id in obj_ids if obj_id not in found]
+
+    async def get_page(self, limit, cursor=None, profile=None, criteria=(), order=None, **filters):
+        """Async SQLAlchemyRepository.get_page: (items, next_cursor)"""
+        order = order or self.repo._default_order()
+        statement = self.repo._seek(self._select(profile).filter(*criteria).filter_by(**filters), cursor, order)
+        result = await adb.session.execute(statement.limit(limit + 1))
+        items = result.unique().scalars().all()
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor(*[getattr(items[-1], column.key) for column, _ in order])
+
+    async def get_rows_page(self, fields, limit, cursor=None, criteria=(), order=None, **filters):
+        """Async SQLAlchemyRepository.get_rows_page: (response dicts, next_cursor)"""
+        order = order or self.repo._default_order()
+        plan = RowPlan(self.model, fields)
+        keys = [column for column, _ in order]
+        statement = select(*plan.columns, *keys).filter(*criteria).filter_by(**filters)
+        rows = (await adb.session.execute(self.repo._seek(statement, cursor, order).limit(limit + 1))).all()
+        if len(rows) <= limit:
+            return plan.to_dicts(rows), None
+        rows = rows[:limit]
+        return plan.to_dicts(rows), encode_cursor(*rows[-1][-len(keys):])
@@ -0,0 +1,140 @@
+# app/persistence/cache.py
+
+""" In-process read-through entity cache with LRU/TTL eviction """
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType, MethodType
+from sqlalchemy import inspect as sa_inspect
+
+
+# Detached, read-only copy of an entity's column values, safe to share across threads
+class EntitySnapshot:
+    __slots__ = ('_model', '_values')
+
+    def __init__(self, model, values):
+        object.__setattr__(self, '_model', model)
+        object.__setattr__(self, '_values', MappingProxyType(dict(values)))
+
+    @classmethod
+    def from_entity(cls, obj):
+        """Copy the column attributes of a loaded model instance"""
+        mapper = sa_inspect(type(obj))
+        return cls(type(obj), {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs})
+
+    def __getattr__(self, name):
+        if name in self._values:
+            return self._values[name]
+        # Model methods (to_dict, verify_password...) run against the snapshot's values
+        attr = getattr(self._model, name, None)
+        if inspect.isfunction(attr):
+            return MethodType(attr, self)
+        if isinstance(attr, property):
+            return attr.fget(self)
+        # Class-level constants such as public_fields
+        if isinstance(attr, (str, tuple, dict, frozenset)):
+            return attr
+        raise AttributeError(f"{self._model.__name__} snapshot has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Entity snapshots are read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("Entity snapshots are read-only")
+
+    def __repr__(self):
+        return f"<{self._model.__name__} snapshot {self._values.get('id')}>"
+
+
+# Bounded LRU cache of entity snapshots with a time-to-live and readable counters
+class EntityCache:
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, snapshot)
+        self._keys_by_id = {}          # entity id -> keys pointing at it
+        self._generation = 0           # incremented by every invalidation
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get_or_load(self, key, loader):
+        """Return the cached snapshot for key, calling loader() on a miss"""
+        generation = self.generation()
+        snapshot = self.get(key)
+        if snapshot is None:
+            snapshot = self.put(key, loader(), generation)
+        return snapshot
+
+    def generation(self):
+        """Token to take before loading an entity and hand back to put()"""
+        return self._generation
+
+    def get(self, key):
+        """Cached snapshot for key, None on a miss (the caller loads the entity and hands it to put())"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                self._remove(key)
+                self.evictions += 1
+            self.misses += 1
+        return None
+
+    def put(self, key, obj, generation):
+        """Cache a snapshot of a loaded entity under key and return it (None for None)
+
+        The snapshot is returned but not cached when an invalidation happened since generation: the row may
+        have been read before a write committed, and caching it would serve the old values for the whole TTL.
+        """
+        if obj is None:
+            return None  # misses are not cached so that new rows show up immediately
+        snapshot = EntitySnapshot.from_entity(obj)
+        with self._lock:
+            if generation != self._generation:
+                return snapshot
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            self._keys_by_id.setdefault(snapshot.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return snapshot
+
+    def invalidate(self, obj_id):
+        """Drop every entry (by id or by attribute) that points at the entity"""
+        with self._lock:
+            self._generation += 1
+            for key in self._keys_by_id.pop(obj_id, ()):
+                if self._entries.pop(key, None):
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_id.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def _remove(self, key):
+        _, snapshot = self._entries.pop(key)
+        keys = self._keys_by_id.get(snapshot.id)
+        if keys:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[snapshot.id]
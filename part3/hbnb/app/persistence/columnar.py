@@ -0,0 +1,48 @@
+# app/persistence/columnar.py
+
+""" Columnar reads: the columns behind a fieldset are selected as tuples and zipped into response dicts
+
+No entity is built, tracked or serialized field by field; datetimes are left to the JSON encoder
+(app.api.representations), which formats them in bulk.
+"""
+from functools import lru_cache
+
+
+# Lightweight stand-in for a model instance: plain attributes, plus the model's properties
+# (computed fields such as Place.average_rating read the columns through them)
+@lru_cache(maxsize=None)
+def _row_class(model):
+    properties = {
+        name: attr for klass in reversed(model.__mro__) for name, attr in vars(klass).items()
+        if isinstance(attr, property)
+    }
+    return type(f'{model.__name__}Row', (), properties)
+
+
+# Which columns to select for a fieldset, and how to turn their tuples into response dicts
+class RowPlan:
+    def __init__(self, model, fields=None):
+        if fields is not None:
+            model.columns_for(fields)  # ValueError for unknown fields
+        self.model = model
+        self.fields = [name for name in model.public_fields if fields is None or name in fields]
+        self.computed = [name for name in self.fields if name in model.computed_fields]
+        plain = [name for name in self.fields if name not in model.computed_fields]
+        extra = sorted(model.columns_for(self.computed) - set(plain)) if self.computed else []
+        # Plain fields first, in output order, so that a row zips straight into its dict
+        self.names = plain + extra
+        self.columns = [getattr(model, name) for name in self.names]
+        self._row_class = _row_class(model)
+
+    def to_dicts(self, rows):
+        if not self.computed:
+            return [dict(zip(self.fields, row)) for row in rows]  # trailing sort-key columns are ignored
+        computed = [(name, self.model.computed_fields[name][0]) for name in self.computed]
+        data = []
+        for row in rows:
+            values = dict(zip(self.names, row))
+            instance = self._row_class()
+            instance.__dict__.update(values)
+            values.update((name, function(instance)) for name, function in computed)
+            data.append({name: values[name] for name in self.fields})
+        return data
@@ -0,0 +1,38 @@
+# app/persistence/identity_memo.py
+
+""" Request-scoped memo of repository lookups keyed by (model, lookup key) """
+from app.database import db
+
+# Sentinel telling a memo miss apart from a memoized "not found" (None)
+MISSING = object()
+
+
+# The memo lives in the session info, so it shares the session's request scope
+def _memo():
+    return db.session.info.setdefault('identity_memo', {})
+
+
+# Return the memoized result of a lookup, or MISSING
+def recall(model, key):
+    result = _memo().get((model, key), MISSING)
+    if result is not MISSING:
+        db.session.info['identity_memo_hits'] = memo_hits() + 1
+    return result
+
+
+# Memoize the result of a lookup (holding a strong reference keeps it in the identity map)
+def remember(model, key, obj):
+    _memo()[(model, key)] = obj
+    return obj
+
+
+# Drop the memoized lookups of a model, or of every model
+def forget(model=None):
+    memo = _memo()
+    for key in [key for key in memo if model is None or key[0] is model]:
+        del memo[key]
+
+
+# Number of lookups answered from the memo during the current request
+def memo_hits():
+    return db.session.info.get('identity_memo_hits', 0)
@@ -0,0 +1,30 @@
+# app/persistence/pagination.py
+
+""" Opaque cursor helpers for keyset pagination """
+import base64
+import json
+from datetime import datetime
+
+
+# Encode the sort key of the last row of a page into an opaque cursor
+def encode_cursor(*values):
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values], separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+# Decode a cursor back into its sort key, converting each value to the given types
+# (the default order is (created_at, id))
+def decode_cursor(cursor, types=(datetime, str)):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, values)
+        )
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor")
@@ -1,8 +1,95 @@
 # app/persistence/place_repository.py
 
+from sqlalchemy import func, select, update
+from app.database import db
+from app.geo import bounding_box, cells_in_bbox, distances_km
 from app.models.place import Place
+from app.models.review import Review
 from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.unit_of_work import mark_written, on_commit
 
 class PlaceRepository(SQLAlchemyRepository):
+    # Owner is one row per place (joined), amenities are a collection (one extra IN query)
+    profiles = {
+        'place_with_owner_and_amenities': {'owner': 'joined', 'amenities': 'selectin'},
+        'place_with_reviews': {'reviews': 'selectin'},
+        'place_detail': {'owner': 'joined', 'amenities': 'selectin', 'reviews.author': 'selectin'}
+    }
+    includes = {'owner': ('owner_id',), 'amenities': (), 'reviews': ()}
+    query_fields = ('price', 'latitude', 'longitude', 'owner_id', 'review_count', 'created_at')
+
     def __init__(self):
         super().__init__(Place)
+
+    def bbox_criteria(self, south, west, north, east):
+        """SQL criteria selecting places inside a box, using the grid cell index when the box is small"""
+        criteria = [Place.latitude.between(south, north)]
+        if west <= east:
+            criteria.append(Place.longitude.between(west, east))
+        else:
+            criteria.append(db.or_(Place.longitude >= west, Place.longitude <= east))
+        cells = cells_in_bbox(south, west, north, east)
+        if cells is not None:
+            criteria.insert(0, Place.geo_cell.in_(cells))
+        return criteria
+
+    def amenity_criteria(self, clauses):
+        """SQL criteria equivalent to an amenity filter, for queries the bitmap index cannot answer alone"""
+        return [db.or_(*[
+            ~Place.amenities.any(id=amenity_id) if negated else Place.amenities.any(id=amenity_id)
+            for amenity_id, negated in clause
+        ]) for clause in clauses]
+
+    def find_near(self, latitude, longitude, radius_km, limit, profile=None, criteria=()):
+        """Return [(place, distance_km)] within radius_km, nearest first"""
+        # Index prefilter on the circle's bounding box, fetching coordinates only
+        candidates = db.session.query(Place.id, Place.latitude, Place.longitude).filter(
+            *self.bbox_criteria(*bounding_box(latitude, longitude, radius_km)), *criteria
+        ).all()
+        # Exact haversine refinement, then load only the rows that make the page
+        distances = distances_km(latitude, longitude, [(lat, lon) for _, lat, lon in candidates])
+        nearest = sorted(
+            (distance, place_id) for (place_id, _, _), distance in zip(candidates, distances)
+            if distance <= radius_km
+        )[:limit]
+        places, _ = self.get_many([place_id for _, place_id in nearest], profile)
+        return [(places[place_id], distance) for distance, place_id in nearest if place_id in places]
+
+    def adjust_ratings(self, place_id, added=None, removed=None):
+        """Atomically apply a rating being added and/or removed to the place aggregates"""
+        values = {
+            Place.review_count: Place.review_count + (added is not None) - (removed is not None),
+            Place.rating_sum: Place.rating_sum + (added or 0) - (removed or 0),
+            Place.updated_at: Place.updated_at  # bookkeeping, not an edit of the place: skip onupdate
+        }
+        if added != removed:
+            if added is not None:
+                column = getattr(Place, f'rating_count_{added}')
+                values[column] = column + 1
+            if removed is not None:
+                column = getattr(Place, f'rating_count_{removed}')
+                values[column] = column - 1
+        # Single UPDATE ... SET col = col + n, so concurrent review writes cannot lose increments
+        self.model.query.filter_by(id=place_id).update(values, synchronize_session='evaluate')
+        self._invalidate(place_id)
+
+    def recompute_ratings(self):
+        """Rebuild every place's rating aggregates from the reviews table, return the places updated"""
+        def aggregate(expression, rating=None):
+            query = select(expression).where(Review.place_id == Place.id)
+            if rating is not None:
+                query = query.where(Review.rating == rating)
+            return query.scalar_subquery()
+
+        values = {
+            'review_count': aggregate(func.count(Review.id)),
+            'rating_sum': aggregate(func.coalesce(func.sum(Review.rating), 0)),
+            'updated_at': Place.updated_at  # as in adjust_ratings
+        }
+        for rating in range(1, 6):
+            values[f'rating_count_{rating}'] = aggregate(func.count(Review.id), rating)
+        result = db.session.execute(update(Place).values(values).execution_options(synchronize_session='fetch'))
+        if self.cache is not None:
+            mark_written(self.model)
+            on_commit(self.cache.clear)
+        return result.rowcount
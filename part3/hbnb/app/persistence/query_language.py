@@ -0,0 +1,79 @@
+# app/persistence/query_language.py
+
+""" Compile parsed list filters and sort keys into SQLAlchemy criteria and keyset order """
+from datetime import datetime
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint, and_, or_
+
+# Comparison operators accepted in field[op]=value
+OPERATORS = {
+    'eq': lambda column, value: column == value,
+    'ne': lambda column, value: column != value,
+    'lt': lambda column, value: column < value,
+    'lte': lambda column, value: column <= value,
+    'gt': lambda column, value: column > value,
+    'gte': lambda column, value: column >= value,
+    'in': lambda column, values: column.in_(values)
+}
+
+
+# Convert a query string value to the Python type of a column
+def coerce(column, raw):
+    python_type = column.type.python_type
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(raw)
+        if python_type is bool:
+            if raw.lower() not in ('true', 'false', '1', '0'):
+                raise ValueError
+            return raw.lower() in ('true', '1')
+        return python_type(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid value for {column.key}: {raw}")
+
+
+# Names of the columns an index (or unique/primary key constraint) can be scanned in order of
+def indexed_columns(table):
+    leading = {list(index.columns)[0].name for index in table.indexes if len(index.columns)}
+    leading.update(
+        list(constraint.columns)[0].name for constraint in table.constraints
+        if isinstance(constraint, (UniqueConstraint, PrimaryKeyConstraint)) and len(constraint.columns)
+    )
+    return leading
+
+
+# [(field, op, raw value)] -> list of SQL criteria on the model
+def compile_filters(model, fields, filters):
+    criteria = []
+    for field, op, raw in filters:
+        if field not in fields:
+            raise ValueError(f"Unknown filter field: {field}")
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown filter operator: {op}")
+        column = getattr(model, field)
+        value = [coerce(column, item) for item in raw.split(',')] if op == 'in' else coerce(column, raw)
+        criteria.append(OPERATORS[op](column, value))
+    return criteria
+
+
+# [(field, descending)] -> [(column, descending)] ending with the id tie-breaker; refuses unindexed sorts
+def compile_sort(model, fields, sort):
+    indexed = indexed_columns(model.__table__)
+    order = []
+    for field, descending in sort:
+        if field not in fields:
+            raise ValueError(f"Unknown sort field: {field}")
+        if field not in indexed:
+            raise ValueError(f"Sorting by {field} is not supported (no index)")
+        order.append((getattr(model, field), descending))
+    if not any(column.key == 'id' for column, _ in order):
+        order.append((model.id, False))
+    return order
+
+
+# SQL condition selecting the rows strictly after the given key values in the given order
+def keyset_after(order, values):
+    conditions = []
+    for position, ((column, descending), value) in enumerate(zip(order, values)):
+        equal = [prefix == prior for (prefix, _), prior in zip(order[:position], values)]
+        conditions.append(and_(*equal, column < value if descending else column > value))
+    return or_(*conditions)
@@ -1,6 +1,13 @@
 # app/persistence/repository.py
 from abc import ABC, abstractmethod
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, load_only, selectinload, with_parent
 from app.database import db  # Import db from the new module
+from app.persistence.pagination import encode_cursor, decode_cursor
+from app.persistence.query_language import compile_filters, compile_sort, keyset_after
+from app.persistence.unit_of_work import is_written, mark_written, on_commit, save_changes
+from app.persistence.identity_memo import MISSING, recall, remember, forget
+from app.persistence.columnar import RowPlan
 #from app import db
 
 
@@ -11,13 +18,25 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def get(self, obj_id):
+    def get(self, obj_id, profile=None, readonly=False):
+        pass
+
+    @abstractmethod
+    def get_many(self, obj_ids, profile=None):
         pass
 
     @abstractmethod
     def get_all(self):
         pass
 
+    @abstractmethod
+    def get_page(self, limit, cursor=None, profile=None, criteria=(), order=None, **filters):
+        pass
+
+    @abstractmethod
+    def get_rows_page(self, fields, limit, cursor=None, criteria=(), order=None, **filters):
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -27,35 +46,198 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def get_by_attribute(self, attr_name, attr_value):
+    def get_by_attribute(self, attr_name, attr_value, readonly=False):
         pass
 
+# Eager loading strategies usable in loading profiles
+LOADERS = {
+    'joined': joinedload,
+    'selectin': selectinload
+}
+
 class SQLAlchemyRepository(Repository):
+    # Named loading profiles: profile name -> {relationship path: loading strategy}
+    # Paths may be dotted to reach nested relationships, e.g. 'places.amenities'
+    profiles = {}
+    # Relationships API responses may include -> foreign key columns their loading reads
+    includes = {}
+    # Fields list endpoints may filter on (field[op]=value) and, when indexed, sort by
+    query_fields = ('created_at',)
+
     def __init__(self, model):
         self.model = model
+        self.cache = None  # Optional EntityCache serving readonly lookups
+
+    def _query(self, profile=None):
+        """Base query with the eager loading options of the requested profile"""
+        query = self.model.query
+        if profile is None:
+            return query
+        return query.options(*self.loader_options(profile))
+
+    def loader_options(self, profile):
+        """Loader options of a profile: the name of a loading profile, or a list of options built by view()"""
+        if profile is None:
+            return []
+        if not isinstance(profile, str):
+            return list(profile)
+        if profile not in self.profiles:
+            raise ValueError(f"Unknown loading profile: {profile}")
+        return [self._loader(path, strategy) for path, strategy in self.profiles[profile].items()]
+
+    def _loader(self, path, strategy):
+        """Build the loader option for a (possibly dotted) relationship path"""
+        model, option = self.model, None
+        for name in path.split('.'):
+            attr = getattr(model, name)
+            option = LOADERS[strategy](attr) if option is None else getattr(option, LOADERS[strategy].__name__)(attr)
+            model = attr.property.mapper.class_
+        return option
+
+    def view(self, fields=None, include=(), sort_fields=()):
+        """Loader options reading only the columns behind fields and batch-loading the included relationships"""
+        unknown = [name for name in include if name not in self.includes]
+        if unknown:
+            raise ValueError(f"Unknown include: {', '.join(unknown)}")
+        options = [selectinload(getattr(self.model, name)) for name in include]
+        if fields is not None:
+            # Unknown sort fields are left out here and rejected by compile_query with a ValueError
+            columns = self.model.columns_for(fields) | {'created_at'}
+            columns.update(name for name in sort_fields if name in self.query_fields)
+            for name in include:
+                columns.update(self.includes[name])
+            options.append(load_only(*[getattr(self.model, name) for name in sorted(columns)]))
+        return options
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        save_changes()
+        forget(self.model)  # may turn memoized "not found" lookups into hits
+
+    def get(self, obj_id, profile=None, readonly=False):
+        """Load an entity; readonly lookups may return a cached, immutable snapshot instead"""
+        key = ('id', obj_id)
+        if profile is None:
+            obj = recall(self.model, key)
+            if obj is not MISSING:
+                return obj
+            if readonly and self._cacheable():
+                return self.cache.get_or_load(key, lambda: remember(self.model, key, self.model.query.get(obj_id)))
+        return remember(self.model, key, self._query(profile).get(obj_id))
 
-    def get(self, obj_id):
-        return self.model.query.get(obj_id)
+    def get_many(self, obj_ids, profile=None):
+        """Return ({id: obj} for the ids found, [missing ids]) with a single IN query"""
+        found, pending = {}, []
+        for obj_id in dict.fromkeys(obj_ids):
+            # Memoized objects may lack the profile's eager loads, so a profile always queries
+            obj = recall(self.model, ('id', obj_id)) if profile is None else MISSING
+            if obj is MISSING:
+                pending.append(obj_id)
+            elif obj is not None:
+                found[obj_id] = obj
+        if pending:
+            for obj in self._query(profile).filter(self.model.id.in_(pending)).all():
+                found[obj.id] = remember(self.model, ('id', obj.id), obj)
+        return found, [obj_id for obj_id in dict.fromkeys(obj_ids) if obj_id not in found]
 
     def get_all(self):
         return self.model.query.all()
 
+    def compile_query(self, filters=(), sort=()):
+        """Turn parsed [(field, op, raw)] filters and [(field, descending)] sort keys into (criteria, order)"""
+        criteria = compile_filters(self.model, self.query_fields, filters)
+        return criteria, compile_sort(self.model, self.query_fields, sort) if sort else None
+
+    def get_page(self, limit, cursor=None, profile=None, criteria=(), order=None, **filters):
+        """Return (items, next_cursor) using keyset pagination
+
+        order is a [(column, descending)] list ending with the id tie-breaker, (created_at, id) by default.
+        """
+        order = order or self._default_order()
+        query = self._seek(self._query(profile).filter(*criteria).filter_by(**filters), cursor, order)
+        # Fetch one extra row to know whether another page exists
+        items = query.limit(limit + 1).all()
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor(*[getattr(items[-1], column.key) for column, _ in order])
+
+    def get_rows_page(self, fields, limit, cursor=None, criteria=(), order=None, **filters):
+        """Same page as get_page, as response dicts built from tuples of the columns behind fields"""
+        order = order or self._default_order()
+        plan = RowPlan(self.model, fields)
+        keys = [column for column, _ in order]
+        statement = select(*plan.columns, *keys).filter(*criteria).filter_by(**filters)
+        rows = db.session.execute(self._seek(statement, cursor, order).limit(limit + 1)).all()
+        if len(rows) <= limit:
+            return plan.to_dicts(rows), None
+        rows = rows[:limit]
+        return plan.to_dicts(rows), encode_cursor(*rows[-1][-len(keys):])
+
+    def _seek(self, query, cursor, order):
+        """Order a query (or select) and skip to the rows after the cursor"""
+        if cursor:
+            values = decode_cursor(cursor, [column.type.python_type for column, _ in order])
+            query = query.filter(keyset_after(order, values))
+        return query.order_by(*[column.desc() if descending else column for column, descending in order])
+
+    def stream(self, profile=None, criteria=(), order=None, batch_size=1000, **filters):
+        """Iterate every matching row in order, holding batch_size rows at a time (server-side cursor)"""
+        order = order or self._default_order()
+        query = self._query(profile).filter(*criteria).filter_by(**filters)
+        query = query.order_by(*[column.desc() if descending else column for column, descending in order])
+        return query.yield_per(batch_size)
+
+    def _default_order(self):
+        return [(self.model.created_at, False), (self.model.id, False)]
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            self._invalidate(obj_id)
+            save_changes()
+            forget(self.model)
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            self._invalidate(obj_id)
+            save_changes()
+            forget(self.model)
+
+    def get_by_attribute(self, attr_name, attr_value, readonly=False):
+        key = (attr_name, attr_value)
+        obj = recall(self.model, key)
+        if obj is not MISSING:
+            return obj
+        query = self.model.query.filter_by(**{attr_name: attr_value})
+        if readonly and self._cacheable():
+            return self.cache.get_or_load(key, lambda: remember(self.model, key, query.first()))
+        return remember(self.model, key, query.first())
+
+    def exists(self, **filters):
+        """Cheap existence probe: SELECT EXISTS(...) without loading any row"""
+        return db.session.query(self.model.query.filter_by(**filters).exists()).scalar()
+
+    def _cacheable(self):
+        """Whether readonly lookups may use the entity cache (not after this transaction wrote the table)"""
+        return self.cache is not None and not is_written(self.model)
+
+    def _invalidate(self, obj_id):
+        """Evict every cached snapshot of an entity being written, once the transaction commits
+
+        Called before save_changes() so that the commit callback is registered when it commits right away.
+        A rolled back write leaves the cache as it was; until then, the transaction reads around the cache.
+        """
+        if self.cache is not None:
+            cache = self.cache
+            mark_written(self.model)
+            on_commit(lambda: cache.invalidate(obj_id))
 
-    def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
+    def query_related(self, obj, relationship):
+        """Query over a relationship of obj without loading the collection (dynamic-style access)"""
+        prop = getattr(self.model, relationship)
+        return prop.property.mapper.class_.query.filter(with_parent(obj, prop))
@@ -0,0 +1,177 @@
+# app/persistence/response_cache.py
+
+""" Serialized responses of hot public GETs, tagged by the entities they show and invalidated by writes """
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# What is stored per cache key: status code, header pairs, the body and its precompressed
+# versions ({content coding: bytes}, empty for small bodies)
+CachedResponse = namedtuple('CachedResponse', 'status headers body variants')
+
+
+# Per-route hit/miss counters shared by the backends
+class RouteStats:
+    def __init__(self):
+        self._routes = {}  # route -> {'hits': n, 'misses': n, 'stores': n}
+        self._stats_lock = threading.Lock()
+
+    def record(self, route, outcome):
+        with self._stats_lock:
+            counters = self._routes.setdefault(route, {'hits': 0, 'misses': 0, 'stores': 0})
+            counters[outcome] += 1
+
+    def route_stats(self):
+        with self._stats_lock:
+            return {
+                route: dict(counters, hit_rate=round(counters['hits'] / max(counters['hits'] + counters['misses'], 1), 3))
+                for route, counters in self._routes.items()
+            }
+
+
+# Bounded in-process LRU of responses with a time-to-live and tag -> keys invalidation
+class ResponseCache(RouteStats):
+    def __init__(self, maxsize=2048, ttl=30):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl                 # bounds staleness from writes made by other processes
+        self._entries = OrderedDict()  # key -> (expires_at, tags, CachedResponse)
+        self._keys_by_tag = {}         # tag -> keys of the entries showing it
+        self._generation = 0           # incremented by every invalidation
+        self._lock = threading.Lock()
+        self.evictions = self.invalidations = 0
+
+    def generation(self):
+        """Token to take before reading the database and hand back to set()"""
+        return self._generation
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                self._remove(key)
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, response, tags, generation):
+        """Store a response unless an invalidation happened since generation (it may show stale rows)"""
+        with self._lock:
+            if generation != self._generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, frozenset(tags), response)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def invalidate(self, tags):
+        """Drop every entry tagged with one of the tags"""
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'routes': self.route_stats()
+            }
+
+    def _remove(self, key):
+        _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+# Shared backend for several workers: entries and tag sets live in Redis (optional dependency)
+class RedisResponseCache(RouteStats):
+    def __init__(self, url, ttl=30, prefix='hbnb:responses:'):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE url requires the redis package (pip install redis)")
+        self._redis = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def generation(self):
+        return int(self._redis.get(self.prefix + 'generation') or 0)
+
+    def get(self, key):
+        raw = self._redis.get(self.prefix + key)
+        if raw is None:
+            return None
+        status, headers, body, variants = json.loads(raw)
+        return CachedResponse(status, [tuple(header) for header in headers], body.encode('utf-8'), {
+            name: base64.b64decode(data) for name, data in variants.items()
+        })
+
+    def set(self, key, response, tags, generation):
+        if generation != self.generation():
+            return False
+        raw = json.dumps([response.status, response.headers, response.body.decode('utf-8'), {
+            name: base64.b64encode(data).decode('ascii') for name, data in response.variants.items()
+        }])
+        with self._redis.pipeline() as pipe:
+            pipe.set(self.prefix + key, raw, ex=self.ttl)
+            for tag in tags:
+                pipe.sadd(self.prefix + 'tag:' + tag, key)
+                pipe.expire(self.prefix + 'tag:' + tag, self.ttl)
+            pipe.execute()
+        return True
+
+    def invalidate(self, tags):
+        tag_keys = [self.prefix + 'tag:' + tag for tag in tags]
+        keys = self._redis.sunion(tag_keys) if tag_keys else set()
+        with self._redis.pipeline() as pipe:
+            pipe.incr(self.prefix + 'generation')
+            pipe.delete(*tag_keys, *[self.prefix + key.decode('utf-8') for key in keys])
+            pipe.execute()
+
+    def clear(self):
+        self._redis.incr(self.prefix + 'generation')
+        for key in self._redis.scan_iter(self.prefix + '*'):
+            if not key.endswith(b'generation'):
+                self._redis.delete(key)
+
+    def stats(self):
+        return {'backend': 'redis', 'ttl': self.ttl, 'routes': self.route_stats()}
+
+
+# Backend described by the RESPONSE_CACHE setting; None disables caching
+def make_response_cache(settings):
+    if not settings:
+        return None
+    if settings.get('url'):
+        return RedisResponseCache(settings['url'], settings.get('ttl', 30))
+    return ResponseCache(settings.get('maxsize', 2048), settings.get('ttl', 30))
@@ -4,5 +4,8 @@ from app.models.review import Review
 from app.persistence.repository import SQLAlchemyRepository
 
 class ReviewRepository(SQLAlchemyRepository):
+    includes = {'author': ('user_id',), 'place': ('place_id',)}
+    query_fields = ('place_id', 'user_id', 'rating', 'created_at')
+
     def __init__(self):
         super().__init__(Review)
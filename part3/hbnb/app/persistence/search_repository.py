@@ -0,0 +1,107 @@
+# app/persistence/search_repository.py
+
+from sqlalchemy import case, delete, func, insert, select, update
+from app.database import db
+from app.models.place import Place
+from app.models.search_index import search_postings, search_stats
+from app.search import idf, place_terms, term_weight
+
+class SearchRepository:
+    """Inverted index over place titles and descriptions, stored in the database"""
+
+    def index_place(self, place):
+        """(Re)index one place; call inside the unit of work that writes it"""
+        self.remove_place(place.id)
+        frequencies, length = place_terms(place.title, place.description)
+        if not frequencies:
+            return  # no postings: not a document of the corpus, as remove_place() and rebuild() count it
+        db.session.execute(insert(search_postings), [
+            {'term': term, 'place_id': place.id, 'term_frequency': tf, 'doc_length': length}
+            for term, tf in frequencies.items()
+        ])
+        self._adjust_stats(1, length)
+
+    def remove_place(self, place_id):
+        """Drop a place's postings, if it was indexed"""
+        length = db.session.execute(
+            select(search_postings.c.doc_length).where(search_postings.c.place_id == place_id).limit(1)
+        ).scalar()
+        if length is None:
+            return
+        db.session.execute(delete(search_postings).where(search_postings.c.place_id == place_id))
+        self._adjust_stats(-1, -length)
+
+    def search(self, terms, limit, criteria=()):
+        """Return [(place_id, score)] of the best BM25 matches for any of the terms
+
+        criteria are SQL conditions on Place restricting the candidates; document
+        frequencies are always taken over the whole corpus so scores stay comparable.
+        """
+        terms = list(dict.fromkeys(terms))
+        document_count, total_length = self._stats()
+        if not document_count:
+            return []
+        average_length = total_length / document_count
+        document_frequency = dict(db.session.execute(
+            select(search_postings.c.term, func.count())
+            .where(search_postings.c.term.in_(terms)).group_by(search_postings.c.term)
+        ).all())
+        if not document_frequency:
+            return []
+
+        # Score and rank in SQL so only the top rows leave the database
+        weights = {term: idf(df, document_count) for term, df in document_frequency.items()}
+        score = func.sum(
+            case(weights, value=search_postings.c.term)
+            * term_weight(search_postings.c.term_frequency, search_postings.c.doc_length, average_length)
+        ).label('score')
+        query = select(search_postings.c.place_id, score).where(search_postings.c.term.in_(list(weights)))
+        if criteria:
+            query = query.join(Place, Place.id == search_postings.c.place_id).where(*criteria)
+        query = query.group_by(search_postings.c.place_id).order_by(score.desc(), search_postings.c.place_id)
+        return [(place_id, float(value)) for place_id, value in db.session.execute(query.limit(limit))]
+
+    def rebuild(self, batch_size=1000):
+        """Rebuild the whole index from the places table, return the places indexed"""
+        db.session.execute(delete(search_postings))
+        documents, total_length, last_id = 0, 0, ''
+        while True:
+            # Keyset batches on the primary key: no long-lived cursor while inserting
+            batch = db.session.execute(
+                select(Place.id, Place.title, Place.description)
+                .where(Place.id > last_id).order_by(Place.id).limit(batch_size)
+            ).all()
+            if not batch:
+                break
+            postings = []
+            for place_id, title, description in batch:
+                frequencies, length = place_terms(title, description)
+                if not frequencies:
+                    continue  # not counted, like in index_place()
+                postings.extend(
+                    {'term': term, 'place_id': place_id, 'term_frequency': tf, 'doc_length': length}
+                    for term, tf in frequencies.items()
+                )
+                documents += 1
+                total_length += length
+            if postings:
+                db.session.execute(insert(search_postings), postings)
+            last_id = batch[-1][0]
+        db.session.execute(delete(search_stats))
+        db.session.execute(insert(search_stats).values(id=1, document_count=documents, total_length=total_length))
+        return documents
+
+    def _stats(self):
+        row = db.session.execute(
+            select(search_stats.c.document_count, search_stats.c.total_length).where(search_stats.c.id == 1)
+        ).first()
+        return tuple(row) if row else (0, 0)
+
+    def _adjust_stats(self, documents, length):
+        # Single UPDATE ... SET col = col + n, like the rating aggregates
+        result = db.session.execute(update(search_stats).where(search_stats.c.id == 1).values(
+            document_count=search_stats.c.document_count + documents,
+            total_length=search_stats.c.total_length + length
+        ))
+        if result.rowcount == 0:
+            db.session.execute(insert(search_stats).values(id=1, document_count=documents, total_length=length))
@@ -0,0 +1,151 @@
+# app/persistence/token_store.py
+
+""" Refresh token rotation and revocation
+
+Each login opens a family; the store keeps only the jti of the family's latest refresh token. Refreshing swaps
+it for the new one. Presenting any other token of the family (one already rotated, so copied or stolen) revokes
+the whole family. Size is one entry per live session, whatever the number of refreshes.
+"""
+import threading
+from datetime import datetime, timezone
+from sqlalchemy import delete, func, insert, select, update
+from app.database import db
+from app.models.refresh_token import refresh_tokens
+from app.persistence.unit_of_work import on_commit
+
+
+# Naive UTC, like the expiry times handed to the stores
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# In-process store (default): sessions are lost on restart and not shared between workers
+class MemoryTokenStore:
+    def __init__(self):
+        self._families = {}  # family -> (jti, user_id, expires_at)
+        self._by_user = {}   # user_id -> families
+        self._lock = threading.Lock()
+        self._sweep_at = 1024  # size that triggers the next purge of expired families
+        self.rotations = self.reuses = 0
+
+    def start(self, family, jti, user_id, expires_at):
+        """Open a family whose only accepted token is jti"""
+        with self._lock:
+            if len(self._families) >= self._sweep_at:
+                self._purge()
+            self._families[family] = (jti, user_id, expires_at)
+            self._by_user.setdefault(user_id, set()).add(family)
+
+    def rotate(self, family, jti, new_jti, expires_at):
+        """Replace jti by new_jti; False (and the family revoked) when jti is not the family's current token"""
+        with self._lock:
+            entry = self._families.get(family)
+            if entry is None or entry[2] <= _utcnow():
+                self._remove(family)
+                return False
+            if entry[0] != jti:
+                self._remove(family)
+                self.reuses += 1
+                return False
+            self._families[family] = (new_jti, entry[1], expires_at)
+            self.rotations += 1
+            return True
+
+    def revoke(self, family):
+        with self._lock:
+            self._remove(family)
+
+    def revoke_user(self, user_id):
+        """End every session of a user (password change, deletion) once the unit of work commits
+
+        Like the SQL store's DELETE, a write that rolls back leaves the sessions open.
+        """
+        on_commit(lambda: self._revoke_user(user_id))
+
+    def _revoke_user(self, user_id):
+        with self._lock:
+            for family in list(self._by_user.get(user_id, ())):
+                self._remove(family)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'sessions': len(self._families),
+                'users': len(self._by_user),
+                'rotations': self.rotations,
+                'reuses': self.reuses
+            }
+
+    def _remove(self, family):
+        entry = self._families.pop(family, None)
+        if entry is not None:
+            families = self._by_user.get(entry[1])
+            families.discard(family)
+            if not families:
+                del self._by_user[entry[1]]
+
+    def _purge(self):
+        now = _utcnow()
+        for family in [family for family, entry in self._families.items() if entry[2] <= now]:
+            self._remove(family)
+        self._sweep_at = max(1024, len(self._families) * 2)
+
+
+# Store in the refresh_tokens table: shared by every worker, survives restarts
+# Statements run in the current session, so they commit with the facade's unit of work
+class SqlTokenStore:
+    def __init__(self):
+        self.rotations = self.reuses = 0
+
+    def start(self, family, jti, user_id, expires_at):
+        # Drop the user's expired families on the way (indexed on user_id)
+        db.session.execute(delete(refresh_tokens).where(
+            refresh_tokens.c.user_id == user_id, refresh_tokens.c.expires_at <= _utcnow()
+        ))
+        db.session.execute(insert(refresh_tokens).values(
+            family=family, jti=jti, user_id=user_id, expires_at=expires_at
+        ))
+
+    def rotate(self, family, jti, new_jti, expires_at):
+        # Compare-and-swap: of two concurrent refreshes with the same token, one updates the row
+        result = db.session.execute(
+            update(refresh_tokens)
+            .where(refresh_tokens.c.family == family, refresh_tokens.c.jti == jti,
+                   refresh_tokens.c.expires_at > _utcnow())
+            .values(jti=new_jti, expires_at=expires_at)
+        )
+        if result.rowcount == 1:
+            self.rotations += 1
+            return True
+        # Another token of the family is current: this one was already rotated, revoke them all
+        if db.session.execute(delete(refresh_tokens).where(
+            refresh_tokens.c.family == family, refresh_tokens.c.jti != jti
+        )).rowcount:
+            self.reuses += 1
+        db.session.execute(delete(refresh_tokens).where(refresh_tokens.c.family == family))  # expired
+        return False
+
+    def revoke(self, family):
+        db.session.execute(delete(refresh_tokens).where(refresh_tokens.c.family == family))
+
+    def revoke_user(self, user_id):
+        db.session.execute(delete(refresh_tokens).where(refresh_tokens.c.user_id == user_id))
+
+    def stats(self):
+        return {
+            'backend': 'sql',
+            'sessions': db.session.scalar(select(func.count()).select_from(refresh_tokens)),
+            'rotations': self.rotations,
+            'reuses': self.reuses
+        }
+
+
+# Store described by the REFRESH_TOKENS setting: {'backend': 'memory'} (default) or {'backend': 'sql'}
+def make_token_store(settings):
+    backend = settings.get('backend', 'memory')
+    if backend == 'sql':
+        return SqlTokenStore()
+    if backend == 'memory':
+        return MemoryTokenStore()
+    raise ValueError(f"Unknown REFRESH_TOKENS backend: {backend}")
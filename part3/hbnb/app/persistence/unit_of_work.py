@@ -0,0 +1,75 @@
+# app/persistence/unit_of_work.py
+
+""" Unit of work: group repository writes into a single transaction """
+from contextlib import contextmanager
+from functools import wraps
+from app.database import db
+from app.persistence.identity_memo import forget
+
+
+# Open a transaction; nested blocks join the outermost one, which commits once
+@contextmanager
+def unit_of_work():
+    session = db.session()
+    depth = session.info.get('uow_depth', 0)
+    session.info['uow_depth'] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            _commit(session)
+    except Exception:
+        # ValueError from validation (or any other failure) discards every pending write
+        if depth == 0:
+            session.rollback()
+            session.info.pop('on_commit', None)
+            session.info.pop('written', None)
+            forget()  # memoized lookups may point at rolled back rows
+        raise
+    finally:
+        session.info['uow_depth'] = depth
+
+
+# Decorator running a facade method inside a unit of work
+def transactional(method):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with unit_of_work():
+            return method(*args, **kwargs)
+    return wrapper
+
+
+# Persist pending changes: flush inside a unit of work, commit outside of one
+def save_changes():
+    session = db.session()
+    if session.info.get('uow_depth'):
+        session.flush()
+    else:
+        _commit(session)
+
+
+# Run callback once the current transaction commits; it is dropped if the transaction rolls back
+# first=True runs it before the callbacks registered so far (version bumps precede cache invalidations)
+def on_commit(callback, first=False):
+    callbacks = db.session.info.setdefault('on_commit', [])
+    if first:
+        callbacks.insert(0, callback)
+    else:
+        callbacks.append(callback)
+
+
+# Record that the current transaction writes rows of model; until it ends, readonly lookups of that model
+# bypass the shared caches, which must neither serve it the old rows nor be filled with its uncommitted ones
+def mark_written(model):
+    db.session.info.setdefault('written', set()).add(model)
+
+
+def is_written(model):
+    return model in db.session.info.get('written', ())
+
+
+# Commit, then notify the in-process structures that mirror the committed data
+def _commit(session):
+    session.commit()
+    session.info.pop('written', None)
+    for callback in session.info.pop('on_commit', []):
+        callback()
@@ -4,8 +4,16 @@ from app.models.user import User
 from app.persistence.repository import SQLAlchemyRepository
 
 class UserRepository(SQLAlchemyRepository):
+    # Owner page: the user's places with their amenities, and the user's reviews
+    profiles = {
+        'user_with_places': {'places': 'selectin'},
+        'owner_page': {'places.amenities': 'selectin', 'places.reviews': 'selectin', 'reviews': 'selectin'}
+    }
+    includes = {'places': (), 'reviews': ()}
+    query_fields = ('email', 'is_admin', 'created_at')
+
     def __init__(self):
         super().__init__(User)
 
-    def get_user_by_email(self, email):
-        return self.model.query.filter_by(email=email).first()
+    def get_user_by_email(self, email, readonly=False):
+        return self.get_by_attribute('email', email, readonly)
@@ -0,0 +1,71 @@
+# app/persistence/versions.py
+
+""" Version counters of the users, places, amenities and reviews collections """
+from functools import wraps
+from flask import current_app
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import db
+from app.models.collection_version import collection_versions
+from app.persistence.unit_of_work import on_commit
+
+COLLECTIONS = ('users', 'places', 'amenities', 'reviews')
+
+
+# Current version of each collection (0 for a collection never written)
+def get_versions(names):
+    return versions_of(names, db.session.execute(versions_query(names)).all())
+
+
+# Statement reading the (name, version) rows of the given collections
+def versions_query(names):
+    return select(collection_versions.c.name, collection_versions.c.version).where(
+        collection_versions.c.name.in_(names)
+    )
+
+
+# {name: version} from the rows of versions_query(names), 0 for the missing ones
+def versions_of(names, rows):
+    rows = dict(rows)
+    return {name: rows.get(name, 0) for name in names}
+
+
+# Increment the versions in a short transaction of their own, once the write that changed the collections has
+# committed. Bumped inside the write transaction, the counter row stayed locked until that transaction committed
+# (until the outermost one, for nested units of work), so concurrent writes to a collection queued on it through
+# each other's commits; here it is locked by a one-statement transaction that no longer holds up the write.
+# The cost: between the write's commit and the bump, a request may still get the old ETag (with the new body, or a
+# 304 for the old one), and a bump lost to a crash or a database error leaves the ETags stale until the next write.
+def bump_versions(names):
+    names = sorted(set(names))  # same lock order in every transaction
+    try:
+        result = db.session.execute(
+            update(collection_versions).where(collection_versions.c.name.in_(names))
+            .values(version=collection_versions.c.version + 1)
+        )
+        if result.rowcount < len(names):
+            existing = set(db.session.execute(
+                select(collection_versions.c.name).where(collection_versions.c.name.in_(names))
+            ).scalars())
+            db.session.execute(insert(collection_versions), [
+                {'name': name, 'version': 1} for name in names if name not in existing
+            ])
+        db.session.commit()
+    except SQLAlchemyError:
+        # The write itself is committed: report the failure instead of failing the request
+        db.session.rollback()
+        current_app.logger.exception("Could not bump the versions of %s", ', '.join(names))
+
+
+# Decorator for facade write methods: bump the given collections once the method's transaction commits
+# (before the other commit callbacks, so that no response cached after an invalidation keeps the old ETag);
+# a rolled back write leaves them unchanged
+def bumps(*names):
+    def decorator(method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            result = method(*args, **kwargs)
+            on_commit(lambda: bump_versions(names), first=True)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,65 @@
+# app/schema.py
+
+""" Compare the indexes of the live database with the ones declared on the models """
+import click
+from sqlalchemy import UniqueConstraint, inspect
+from app.database import db
+
+
+# {(table, columns, unique): name} for every index and unique constraint declared on the models
+def declared_indexes():
+    indexes = {}
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            indexes[(table.name, tuple(c.name for c in index.columns), bool(index.unique))] = index.name
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                indexes[(table.name, tuple(c.name for c in constraint.columns), True)] = constraint.name
+    return indexes
+
+
+# {(table, columns, unique): name} for every index and unique constraint found in the database
+def live_indexes(engine):
+    inspector = inspect(engine)
+    indexes, foreign_keys = {}, set()
+    for table in inspector.get_table_names():
+        for index in inspector.get_indexes(table):
+            indexes[(table, tuple(index['column_names']), bool(index['unique']))] = index['name']
+        for constraint in inspector.get_unique_constraints(table):
+            indexes[(table, tuple(constraint['column_names']), True)] = constraint['name']
+        for fk in inspector.get_foreign_keys(table):
+            foreign_keys.add((table, tuple(fk['constrained_columns'])))
+    return indexes, foreign_keys
+
+
+# List the differences between declared and live indexes (empty when in sync)
+def compare_indexes(engine):
+    declared = declared_indexes()
+    live, foreign_keys = live_indexes(engine)
+    live_tables = set(inspect(engine).get_table_names())
+    problems = []
+    for (table, columns, unique), name in sorted(declared.items(), key=str):
+        if table not in live_tables:
+            problems.append(f"missing table {table}")
+        elif (table, columns, unique) not in live:
+            kind = 'unique index' if unique else 'index'
+            problems.append(f"missing {kind} {name or ''} on {table}({', '.join(columns)})")
+    for (table, columns, unique), name in sorted(live.items(), key=str):
+        # MySQL adds an index for every foreign key on its own
+        if (table, columns, unique) in declared or (table, columns) in foreign_keys:
+            continue
+        if any(t == table for t, _, _ in declared):
+            problems.append(f"undeclared index {name or ''} on {table}({', '.join(columns)})")
+    return list(dict.fromkeys(problems))
+
+
+# flask schema-check: exit with status 1 when the database indexes drift from the models
+@click.command('schema-check')
+def schema_check():
+    """Compare the live database indexes with the ones declared on the models."""
+    problems = compare_indexes(db.engine)
+    for problem in problems:
+        click.echo(problem)
+    if problems:
+        raise SystemExit(1)
+    click.echo("Database indexes match the models.")
@@ -0,0 +1,46 @@
+# app/search.py
+
+""" Full-text search helpers: tokenizer, document term frequencies and BM25 scoring """
+import math
+import re
+from collections import Counter
+
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has in is it its of on or that the this to was with".split()
+)
+MAX_TERM_LENGTH = 64
+
+# Title words count this many times more than description words
+TITLE_WEIGHT = 2
+
+# BM25 parameters: term frequency saturation and document length normalization
+K1 = 1.2
+B = 0.75
+
+
+# Lowercase words of a text, without stop words and one-letter tokens
+def tokenize(text):
+    return [
+        token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+# Weighted term frequencies and length of a place document
+def place_terms(title, description):
+    frequencies = Counter()
+    for token in tokenize(title):
+        frequencies[token] += TITLE_WEIGHT
+    frequencies.update(tokenize(description))
+    return frequencies, sum(frequencies.values())
+
+
+# BM25 inverse document frequency of a term
+def idf(document_frequency, document_count):
+    return math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+
+# BM25 term weight in a document; plain arithmetic, so it also builds SQL expressions from columns
+def term_weight(term_frequency, doc_length, average_length):
+    return term_frequency * (K1 + 1) / (term_frequency + K1 * (1 - B + B * doc_length / (average_length or 1)))
@@ -0,0 +1,92 @@
+# app/services/async_facade.py
+
+""" Async read side of the facade for the ASGI serving mode (app/asgi.py)
+
+Validation, query compilation, loading views and caches are those of the sync HBnBFacade; only the database
+round trips are awaited. Writes, and the reads served from in-process indexes (amenity bitmaps, full-text
+search, radius search), stay on the sync facade behind the WSGI app.
+"""
+from app.async_database import adb
+from app.persistence.async_repository import AsyncSQLAlchemyRepository
+from app.persistence.versions import versions_of, versions_query
+from app.services import facade
+
+
+class AsyncHBnBFacade:
+    def __init__(self, sync_facade):
+        self.facade = sync_facade
+        self.user_repo = AsyncSQLAlchemyRepository(sync_facade.user_repo)
+        self.place_repo = AsyncSQLAlchemyRepository(sync_facade.place_repo)
+        self.review_repo = AsyncSQLAlchemyRepository(sync_facade.review_repo)
+        self.amenity_repo = AsyncSQLAlchemyRepository(sync_facade.amenity_repo)
+
+    # Version counters of the given collections (ETags)
+    async def get_versions(self, collections):
+        return versions_of(collections, (await adb.session.execute(versions_query(collections))).all())
+
+    # Loader options for a sparse response (no database access)
+    def get_view(self, collection, fields=None, include=(), sort=()):
+        return self.facade.get_view(collection, fields, include, sort)
+
+    # Retrieves one page of users, amenities or reviews as response dicts read column by column
+    async def get_rows_page(self, collection, fields, limit, cursor=None, filters=(), sort=(), **equal):
+        repo = {'users': self.user_repo, 'amenities': self.amenity_repo, 'reviews': self.review_repo}[collection]
+        criteria, order = repo.repo.compile_query(filters, sort)
+        return await repo.get_rows_page(fields, limit, cursor, criteria, order, **equal)
+
+    """ Users """
+
+    # Retrieves a user by ID, optionally eager-loading a profile; readonly may return a cached snapshot
+    async def get_user(self, user_id, profile=None, readonly=False):
+        return await self.user_repo.get(user_id, profile, readonly)
+
+    """ Amenities """
+
+    async def get_amenity(self, amenity_id, readonly=False):
+        return await self.amenity_repo.get(amenity_id, readonly=readonly)
+
+    """ Places """
+
+    async def get_place(self, place_id, profile=None, readonly=False):
+        return await self.place_repo.get(place_id, profile, readonly)
+
+    # Retrieves one page of places and the cursor of the next page (no amenity filter: see module docstring)
+    async def get_places_page(self, limit, cursor=None, profile=None, filters=(), sort=(), bbox=None):
+        criteria, order = self.facade._place_query(filters, sort, bbox, None)
+        return await self.place_repo.get_page(limit, cursor, profile, criteria=criteria, order=order)
+
+    # Retrieves one page of places as response dicts read column by column
+    async def get_places_rows_page(self, fields, limit, cursor=None, filters=(), sort=(), bbox=None):
+        criteria, order = self.facade._place_query(filters, sort, bbox, None)
+        return await self.place_repo.get_rows_page(fields, limit, cursor, criteria, order)
+
+    # Retrieves the place with its owner and amenities and its first reviews with their authors
+    # Returns (place, reviews, next_cursor), or None if the place does not exist
+    async def get_place_page(self, place_id, reviews_limit):
+        place = await self.get_place(place_id, 'place_with_owner_and_amenities')
+        if not place:
+            return None
+        reviews, next_cursor = await self.review_repo.get_page(
+            reviews_limit, None, self.review_repo.repo.view(include=['author']), place_id=place_id
+        )
+        return place, reviews, next_cursor
+
+    """ Reviews """
+
+    async def get_review(self, review_id, profile=None):
+        return await self.review_repo.get(review_id, profile)
+
+    # Retrieves one page of reviews and the cursor of the next page
+    async def get_reviews_page(self, limit, cursor=None, filters=(), sort=(), profile=None):
+        criteria, order = self.review_repo.repo.compile_query(filters, sort)
+        return await self.review_repo.get_page(limit, cursor, profile, criteria=criteria, order=order)
+
+    # Retrieves one page of reviews for a specific place
+    async def get_reviews_by_place_page(self, place_id, limit, cursor=None, profile=None):
+        if not await self.get_place(place_id, readonly=True):
+            raise ValueError("Place not found")
+        return await self.review_repo.get_page(limit, cursor, profile, place_id=place_id)
+
+
+# Singleton sharing the sync facade's repositories and caches
+async_facade = AsyncHBnBFacade(facade)
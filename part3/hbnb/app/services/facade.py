@@ -4,10 +4,20 @@ from app.persistence.user_repository import UserRepository
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.review_repository import ReviewRepository
 from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.search_repository import SearchRepository
+from app.persistence.amenity_index import AmenityIndex
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.search import tokenize
+from app.persistence.unit_of_work import transactional, on_commit
+from app.persistence.versions import bumps, get_versions
+from app.persistence.cache import EntityCache
+from app.persistence.response_cache import make_response_cache
+from app.persistence.token_store import MemoryTokenStore, make_token_store
+from app.passwords import PasswordHasherBusy, hasher
+from sqlalchemy.exc import IntegrityError
 
 # Facade class to simplify interaction between API and persistence layers
 class HBnBFacade:
@@ -17,10 +27,77 @@ class HBnBFacade:
         self.place_repo = PlaceRepository()    # Handles place data persistence
         self.review_repo = ReviewRepository()  # Handles review data persistence
         self.amenity_repo = AmenityRepository()# Handles amenity data persistence
+        self.search_repo = SearchRepository()  # Full-text index over places
+        self.amenity_index = AmenityIndex()    # Amenity bitmaps over places
+        self.response_cache = None             # Serialized public GET responses
+        self.token_store = MemoryTokenStore()  # Refresh token families (login sessions)
+    
+    # Attaches an EntityCache to each repository listed in the config, detaches the others
+    def configure_cache(self, cache_config):
+        for repo in (self.user_repo, self.place_repo, self.review_repo, self.amenity_repo):
+            settings = cache_config.get(repo.model.__tablename__)
+            repo.cache = EntityCache(*settings) if settings else None
+    
+    # Replaces the amenity bitmap index with an empty one rebuilt every ttl seconds
+    def configure_amenity_index(self, ttl):
+        self.amenity_index = AmenityIndex(ttl)
+    
+    # Replaces the response cache with one built from the RESPONSE_CACHE settings (empty disables it)
+    def configure_response_cache(self, settings):
+        self.response_cache = make_response_cache(settings)
+    
+    # Replaces the refresh token store with one built from the REFRESH_TOKENS settings
+    def configure_token_store(self, settings):
+        self.token_store = make_token_store(settings)
+    
+    # Loader options for a sparse response: only the columns behind fields, included relationships batch-loaded
+    # Pass the result as the profile of the get/page methods of the same collection
+    def get_view(self, collection, fields=None, include=(), sort=()):
+        repo = {'users': self.user_repo, 'places': self.place_repo, 'reviews': self.review_repo}[collection]
+        return repo.view(fields, include, [field for field, _ in sort])
+    
+    # Retrieves one page of users, amenities or reviews as response dicts read column by column
+    # (fields only, no relationships: see app.persistence.columnar); equal filters such as place_id= apply
+    def get_rows_page(self, collection, fields, limit, cursor=None, filters=(), sort=(), **equal):
+        repo = {'users': self.user_repo, 'amenities': self.amenity_repo, 'reviews': self.review_repo}[collection]
+        criteria, order = repo.compile_query(filters, sort)
+        return repo.get_rows_page(fields, limit, cursor, criteria, order, **equal)
+    
+    # Version counters of the given collections, bumped by every facade write (ETags)
+    def get_versions(self, collections):
+        return get_versions(collections)
+    
+    # Hit/miss/eviction counters of every enabled entity cache
+    def cache_stats(self):
+        return {
+            repo.model.__tablename__: repo.cache.stats()
+            for repo in (self.user_repo, self.place_repo, self.review_repo, self.amenity_repo)
+            if repo.cache is not None
+        }
+    
+    # Size and per-route hit rates of the response cache
+    def response_cache_stats(self):
+        return self.response_cache.stats() if self.response_cache is not None else None
+    
+    # Live sessions, rotations and detected reuses of the refresh token store
+    def session_stats(self):
+        return self.token_store.stats()
+    
+    # Size, load and bcrypt cost of the password hashing pool
+    def password_hasher_stats(self):
+        return hasher.stats()
+    
+    # Drops the cached responses showing any of the tags (entity ids or collection names) once the write commits
+    def _invalidate_responses(self, *tags):
+        cache = self.response_cache
+        if cache is not None:
+            on_commit(lambda: cache.invalidate(tags))
     
     """ User Facade Methods """
     
     # Creates a new user with validation
+    @transactional
+    @bumps('users')
     def create_user(self, user_data):
         # Extract data from the input dictionary
         first_name = user_data.get('first_name')
@@ -46,15 +123,60 @@ class HBnBFacade:
         self.user_repo.add(user)
         return user
     
-    # Retrieves a user by ID
-    def get_user(self, user_id):
-        return self.user_repo.get(user_id)
+    # Retrieves a user by ID, optionally eager-loading a named profile
+    # readonly=True may return a cached immutable snapshot (no relationships, no writes)
+    def get_user(self, user_id, profile=None, readonly=False):
+        return self.user_repo.get(user_id, profile, readonly)
     
     # Retrieves a user by email (used for uniqueness checks)
-    def get_user_by_email(self, email):
-        return self.user_repo.get_user_by_email(email)
+    def get_user_by_email(self, email, readonly=False):
+        return self.user_repo.get_user_by_email(email, readonly)
+    
+    # Checks a login: the user when the password matches, None otherwise
+    # A hash made with another bcrypt cost than the configured one is replaced on the way (the password is known)
+    # May raise PasswordHasherBusy when the hashing pool is saturated
+    def authenticate(self, email, password):
+        user = self.get_user_by_email(email, readonly=True)
+        if not user or not user.verify_password(password):
+            return None
+        if user.password_needs_rehash():
+            try:
+                pw_hash = hasher.hash(password)  # before the transaction opens: bcrypt holds no connection
+            except PasswordHasherBusy:
+                return user  # the login still succeeds, the next one upgrades the hash
+            self._store_password_hash(user.id, pw_hash)
+        return user
+    
+    # Stores the new hash of a verified password, computed by the caller; the transaction only runs the UPDATE
+    # The hash never appears in responses, so no version bump
+    @transactional
+    def _store_password_hash(self, user_id, pw_hash):
+        self.user_repo.update(user_id, {'password': pw_hash})
+    
+    # Opens a login session (refresh token family) whose only accepted refresh token is jti
+    @transactional
+    def start_session(self, family, jti, user_id, expires_at):
+        self.token_store.start(family, jti, user_id, expires_at)
+    
+    # Swaps the session's refresh token jti for new_jti; False when jti is not the current one
+    # (expired, logged out, or already rotated: the session is then revoked)
+    @transactional
+    def rotate_session(self, family, jti, new_jti, expires_at):
+        return self.token_store.rotate(family, jti, new_jti, expires_at)
+    
+    # Ends a login session: its refresh token is no longer accepted
+    @transactional
+    def end_session(self, family):
+        self.token_store.revoke(family)
+
+    # Retrieves the users with the given IDs in one IN query, in the requested order (unknown IDs are skipped)
+    def get_users_batch(self, user_ids, fields=None):
+        users, _ = self.user_repo.get_many(user_ids, self.user_repo.view(fields))
+        return [users[user_id] for user_id in user_ids if user_id in users]
     
     # Updates an existing user with validation
+    @transactional
+    @bumps('users')
     def update_user(self, user_id, user_data):
         user = self.get_user(user_id)
         if not user:
@@ -77,6 +199,7 @@ class HBnBFacade:
             if len(user_data['password']) < 6:
                 raise ValueError("Password must be at least 6 characters")
             user.hash_password(user_data['password'])  # Hash new password
+            self.token_store.revoke_user(user_id)  # Sessions opened with the old password end
         
         # Prepare update data, only including provided fields
         update_data = {}
@@ -84,24 +207,42 @@ class HBnBFacade:
             if key in user_data:
                 update_data[key] = user_data[key]
         self.user_repo.update(user_id, update_data)
+        self._invalidate_responses(user_id)  # Places embedding the user as owner
         return self.get_user(user_id)  # Return updated user
 
     # Deletes a user by ID
+    @transactional
+    @bumps('users')
     def delete_user(self, user_id):
         """Delete a user from the repository"""
-        user = self.get_user(user_id)
+        user = self.get_user(user_id, readonly=True)
         if not user:
             raise ValueError("User not found")
         self.user_repo.delete(user_id)
+        self.token_store.revoke_user(user_id)
+        self._invalidate_responses(user_id, 'places')
     
     # get all users
     def get_all_users(self):
         """Retrieve all users from the repository"""
         return self.user_repo.get_all()
+
+    # Retrieves one page of users and the cursor of the next page
+    # filters: [(field, op, raw value)], sort: [(field, descending)] as parsed from the query string
+    def get_users_page(self, limit, cursor=None, filters=(), sort=(), profile=None):
+        criteria, order = self.user_repo.compile_query(filters, sort)
+        return self.user_repo.get_page(limit, cursor, profile, criteria=criteria, order=order)
+
+    # Iterates over every matching user, batch_size rows at a time (for streamed exports)
+    def iter_users(self, filters=(), sort=(), profile=None, batch_size=1000):
+        criteria, order = self.user_repo.compile_query(filters, sort)
+        return self.user_repo.stream(profile, criteria, order, batch_size)
     
     """ Amenity Facade Methods """
     
     # Creates a new amenity with validation
+    @transactional
+    @bumps('amenities')
     def create_amenity(self, amenity_data):
         name = amenity_data.get('name')
         
@@ -112,19 +253,46 @@ class HBnBFacade:
         # Create and persist the amenity object
         amenity = Amenity(name)
         self.amenity_repo.add(amenity)
+        self._invalidate_responses('amenities')
         return amenity
     
-    # Retrieves an amenity by ID
-    def get_amenity(self, amenity_id):
-        return self.amenity_repo.get(amenity_id)
+    # Retrieves an amenity by ID (readonly=True may return a cached snapshot)
+    def get_amenity(self, amenity_id, readonly=False):
+        return self.amenity_repo.get(amenity_id, readonly=readonly)
+    
+    # Retrieves the amenities with the given IDs in one query, raising if any is missing
+    def get_amenities_by_ids(self, amenity_ids):
+        amenities, missing = self.amenity_repo.get_many(amenity_ids)
+        if len(missing) == 1:
+            raise ValueError(f"Amenity with ID {missing[0]} not found")
+        if missing:
+            raise ValueError(f"Amenities with IDs {', '.join(missing)} not found")
+        return [amenities[amenity_id] for amenity_id in dict.fromkeys(amenity_ids)]
+
+    # Retrieves the amenities with the given IDs in one IN query, in the requested order (unknown IDs are skipped)
+    def get_amenities_batch(self, amenity_ids):
+        amenities, _ = self.amenity_repo.get_many(amenity_ids)
+        return [amenities[amenity_id] for amenity_id in amenity_ids if amenity_id in amenities]
     
     # Retrieves all amenities
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
+
+    # Retrieves one page of amenities and the cursor of the next page
+    def get_amenities_page(self, limit, cursor=None, filters=(), sort=()):
+        criteria, order = self.amenity_repo.compile_query(filters, sort)
+        return self.amenity_repo.get_page(limit, cursor, criteria=criteria, order=order)
+
+    # Iterates over every matching amenity, batch_size rows at a time (for streamed exports)
+    def iter_amenities(self, filters=(), sort=(), batch_size=1000):
+        criteria, order = self.amenity_repo.compile_query(filters, sort)
+        return self.amenity_repo.stream(None, criteria, order, batch_size)
     
     # Updates an existing amenity with validation
+    @transactional
+    @bumps('amenities')
     def update_amenity(self, amenity_id, amenity_data):
-        amenity = self.get_amenity(amenity_id)
+        amenity = self.get_amenity(amenity_id, readonly=True)
         if not amenity:
             raise ValueError("Amenity not found")
         
@@ -139,19 +307,26 @@ class HBnBFacade:
             if key in amenity_data:
                 update_data[key] = amenity_data[key]
         self.amenity_repo.update(amenity_id, update_data)
+        self._invalidate_responses(amenity_id, 'amenities')
         return self.get_amenity(amenity_id)  # Return updated amenity
 
     # Deletes an amenity by ID
+    @transactional
+    @bumps('amenities', 'places')
     def delete_amenity(self, amenity_id):
         """Delete an amenity from the repository"""
-        amenity = self.get_amenity(amenity_id)
+        amenity = self.get_amenity(amenity_id, readonly=True)
         if not amenity:
             raise ValueError("Amenity not found")
         self.amenity_repo.delete(amenity_id)
+        self.amenity_index.amenity_removed(amenity_id)
+        self._invalidate_responses(amenity_id, 'amenities', 'places')
     
     """ Place Facade Methods """
     
     # Creates a new place with validation and amenity association
+    @transactional
+    @bumps('places')
     def create_place(self, place_data):
         title = place_data.get('title')
         description = place_data.get('description', '')
@@ -172,28 +347,108 @@ class HBnBFacade:
             raise ValueError("Longitude is required and must be between -180 and 180")
         
         # Verify owner and amenities exist
-        owner = self.get_user(owner_id)
+        owner = self.get_user(owner_id, readonly=True)
         if not owner:
             raise ValueError("Owner not found")
-        for amenity_id in amenity_ids:
-            if not self.get_amenity(amenity_id):
-                raise ValueError(f"Amenity with ID {amenity_id} not found")
+        amenities = self.get_amenities_by_ids(amenity_ids)  # Single IN query
         
         # Create place and associate amenities
         place = Place(title, description, price, latitude, longitude, owner_id)
-        place.amenities = [self.get_amenity(aid) for aid in amenity_ids]  # Link amenities
+        place.amenities = amenities  # Link amenities
         self.place_repo.add(place)
+        self.search_repo.index_place(place)
+        self.amenity_index.place_changed(place.id, place.created_at, [amenity.id for amenity in amenities])
+        self._invalidate_responses('places')
         return place
     
-    # Retrieves a place by ID
-    def get_place(self, place_id):
-        return self.place_repo.get(place_id)
+    # Retrieves a place by ID, optionally eager-loading a named profile
+    # readonly=True may return a cached immutable snapshot (no relationships, no writes)
+    def get_place(self, place_id, profile=None, readonly=False):
+        return self.place_repo.get(place_id, profile, readonly)
+
+    # Retrieves the places with the given IDs in one IN query, in the requested order (unknown IDs are skipped)
+    def get_places_batch(self, place_ids, fields=None):
+        places, _ = self.place_repo.get_many(place_ids, self.place_repo.view(fields))
+        return [places[place_id] for place_id in place_ids if place_id in places]
     
     # Retrieves all places
     def get_all_places(self):
         return self.place_repo.get_all()
+
+    # Retrieves one page of places and the cursor of the next page
+    # filters/sort as for users; bbox: (south, west, north, east);
+    # amenities: [[(amenity_id, negated), ...], ...], literals ORed within a clause, clauses ANDed
+    def get_places_page(self, limit, cursor=None, profile=None, filters=(), sort=(), bbox=None, amenities=None):
+        # An amenity filter alone is answered from the bitmap index, in the default order
+        if amenities and not (filters or sort or bbox):
+            self._check_amenity_filter(amenities)
+            place_ids, next_cursor = self.amenity_index.page(amenities, limit, cursor)
+            places, _ = self.place_repo.get_many(place_ids, profile)
+            return [places[place_id] for place_id in place_ids if place_id in places], next_cursor
+        criteria, order = self._place_query(filters, sort, bbox, amenities)
+        return self.place_repo.get_page(limit, cursor, profile, criteria=criteria, order=order)
+
+    # Retrieves one page of places as response dicts read column by column (fields only, no relationships)
+    def get_places_rows_page(self, fields, limit, cursor=None, filters=(), sort=(), bbox=None):
+        criteria, order = self._place_query(filters, sort, bbox, None)
+        return self.place_repo.get_rows_page(fields, limit, cursor, criteria, order)
+
+    # Iterates over every matching place, batch_size rows at a time (for streamed exports)
+    def iter_places(self, profile=None, filters=(), sort=(), bbox=None, amenities=None, batch_size=1000):
+        criteria, order = self._place_query(filters, sort, bbox, amenities)
+        return self.place_repo.stream(profile, criteria, order, batch_size)
+
+    # SQL criteria and order of a place listing
+    def _place_query(self, filters, sort, bbox, amenities):
+        criteria, order = self.place_repo.compile_query(filters, sort)
+        if amenities:
+            self._check_amenity_filter(amenities)
+            criteria += self.place_repo.amenity_criteria(amenities)
+        if bbox:
+            criteria += self.place_repo.bbox_criteria(*bbox)
+        return criteria, order
+
+    # Raises ValueError when an amenity filter names unknown amenities
+    def _check_amenity_filter(self, amenities):
+        self.get_amenities_by_ids([amenity_id for clause in amenities for amenity_id, _ in clause])
+    
+    # Retrieves the places within radius_km of a point as [(place, distance_km)], nearest first
+    def get_places_near(self, latitude, longitude, radius_km, limit, profile=None, filters=()):
+        try:
+            radius_km = float(radius_km)
+        except (TypeError, ValueError):
+            raise ValueError("radius_km must be a number")
+        if not 0 < radius_km <= 20000:
+            raise ValueError("radius_km must be between 0 and 20000")
+        criteria, _ = self.place_repo.compile_query(filters)
+        return self.place_repo.find_near(latitude, longitude, radius_km, limit, profile, criteria)
+    
+    # Full-text search over titles and descriptions, returns [(place, score)] best first
+    # Optional price bounds and amenity IDs (all required) restrict the matches
+    def search_places(self, query, limit, min_price=None, max_price=None, amenity_ids=(), profile=None):
+        terms = tokenize(query)
+        if not terms:
+            raise ValueError("Search query must contain at least one word")
+        criteria = []
+        if min_price is not None:
+            criteria.append(Place.price >= min_price)
+        if max_price is not None:
+            criteria.append(Place.price <= max_price)
+        for amenity in self.get_amenities_by_ids(amenity_ids):
+            criteria.append(Place.amenities.any(id=amenity.id))
+        ranked = self.search_repo.search(terms, limit, criteria)
+        places, _ = self.place_repo.get_many([place_id for place_id, _ in ranked], profile)
+        return [(places[place_id], score) for place_id, score in ranked if place_id in places]
+    
+    # Rebuilds the full-text index from the places table
+    @transactional
+    @bumps('places')
+    def rebuild_search_index(self):
+        return self.search_repo.rebuild()
     
     # Updates an existing place with validation
+    @transactional
+    @bumps('places')
     def update_place(self, place_id, place_data):
         place = self.get_place(place_id)
         if not place:
@@ -215,15 +470,13 @@ class HBnBFacade:
         
         # Check owner and amenities if updated
         if 'owner_id' in place_data:
-            owner = self.get_user(place_data['owner_id'])
+            owner = self.get_user(place_data['owner_id'], readonly=True)
             if not owner:
                 raise ValueError("Owner not found")
             place_data['owner_id'] = owner.id
         if 'amenities' in place_data:
-            for amenity_id in place_data['amenities']:
-                if not self.get_amenity(amenity_id):
-                    raise ValueError(f"Amenity with ID {amenity_id} not found")
-            place.amenities = [self.get_amenity(aid) for aid in place_data['amenities']]
+            place.amenities = self.get_amenities_by_ids(place_data['amenities'])  # Single IN query
+            self.amenity_index.place_changed(place.id, place.created_at, [amenity.id for amenity in place.amenities])
         
         # Prepare update data
         update_data = {}
@@ -231,19 +484,29 @@ class HBnBFacade:
             if key in place_data:
                 update_data[key] = place_data[key]
         self.place_repo.update(place_id, update_data)
+        self._invalidate_responses(place_id, 'places')
+        if 'title' in update_data or 'description' in update_data:
+            self.search_repo.index_place(place)
         return self.get_place(place_id)  # Return updated place
     
     # Deletes a place by ID
+    @transactional
+    @bumps('places')
     def delete_place(self, place_id):
         """Delete a place from the repository"""
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, readonly=True)
         if not place:
             raise ValueError("Place not found")
+        self.search_repo.remove_place(place_id)
         self.place_repo.delete(place_id)
+        self.amenity_index.place_removed(place_id)
+        self._invalidate_responses(place_id, 'places')
     
     """ Review Facade Methods """
     
     # Creates a new review with validation
+    @transactional
+    @bumps('reviews', 'places')
     def create_review(self, review_data):
         user_id = review_data.get('user_id')
         place_id = review_data.get('place_id')
@@ -251,10 +514,10 @@ class HBnBFacade:
         rating = review_data.get('rating')
         
         # Verify user and place exist
-        user = self.get_user(user_id)
+        user = self.get_user(user_id, readonly=True)
         if not user:
             raise ValueError("User not found")
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, readonly=True)
         if not place:
             raise ValueError("Place not found")
         
@@ -263,28 +526,69 @@ class HBnBFacade:
             raise ValueError("Rating is required and must be between 1 and 5")
         if not text or len(text.strip()) == 0:
             raise ValueError("Review text is required")
+        if self.has_reviewed_place(user_id, place_id):
+            raise ValueError("You have already reviewed this place")
         
-        # Create and persist the review
+        # Create and persist the review; the unique (user_id, place_id) constraint catches races
         review = Review(place_id, user_id, text, rating)
-        self.review_repo.add(review)
+        try:
+            self.review_repo.add(review)
+        except IntegrityError:
+            raise ValueError("You have already reviewed this place")
+        self.place_repo.adjust_ratings(place_id, added=review.rating)  # Same transaction as the insert
+        self._invalidate_responses(place_id, 'places')
         return review
     
+    # Checks whether a user already reviewed a place (single probe on the unique index)
+    def has_reviewed_place(self, user_id, place_id):
+        return self.review_repo.exists(user_id=user_id, place_id=place_id)
+    
     # Retrieves a review by ID
-    def get_review(self, review_id):
-        return self.review_repo.get(review_id)
+    def get_review(self, review_id, profile=None):
+        return self.review_repo.get(review_id, profile)
     
     # Retrieves all reviews
     def get_all_reviews(self):
         return self.review_repo.get_all()
+
+    # Retrieves one page of reviews and the cursor of the next page
+    def get_reviews_page(self, limit, cursor=None, filters=(), sort=(), profile=None):
+        criteria, order = self.review_repo.compile_query(filters, sort)
+        return self.review_repo.get_page(limit, cursor, profile, criteria=criteria, order=order)
+
+    # Iterates over every matching review, batch_size rows at a time (for streamed exports)
+    def iter_reviews(self, filters=(), sort=(), profile=None, batch_size=1000):
+        criteria, order = self.review_repo.compile_query(filters, sort)
+        return self.review_repo.stream(profile, criteria, order, batch_size)
     
     # Retrieves reviews for a specific place
     def get_reviews_by_place(self, place_id):
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, 'place_with_reviews')
         if not place:
             raise ValueError("Place not found")
-        return place.reviews.all()  # Uses SQLAlchemy relationship to fetch reviews
+        return place.reviews  # Collection loaded once and kept in the identity map
+
+    # Retrieves one page of reviews for a specific place
+    def get_reviews_by_place_page(self, place_id, limit, cursor=None, profile=None):
+        if not self.get_place(place_id, readonly=True):
+            raise ValueError("Place not found")
+        return self.review_repo.get_page(limit, cursor, profile, place_id=place_id)
+    
+    # Retrieves everything the place page shows: the place with its owner and amenities, then the first
+    # reviews_limit reviews with their authors, in four queries whatever the number of reviews
+    # Returns (place, reviews, next_cursor), or None if the place does not exist
+    def get_place_page(self, place_id, reviews_limit):
+        place = self.get_place(place_id, 'place_with_owner_and_amenities')
+        if not place:
+            return None
+        reviews, next_cursor = self.review_repo.get_page(
+            reviews_limit, None, self.review_repo.view(include=['author']), place_id=place_id
+        )
+        return place, reviews, next_cursor
     
     # Updates an existing review with validation
+    @transactional
+    @bumps('reviews', 'places')
     def update_review(self, review_id, review_data):
         review = self.get_review(review_id)
         if not review:
@@ -303,12 +607,31 @@ class HBnBFacade:
         for key in ['text', 'rating']:
             if key in review_data:
                 update_data[key] = review_data[key]
+        old_rating = review.rating
+        if 'rating' in update_data:
+            update_data['rating'] = int(update_data['rating'])
         self.review_repo.update(review_id, update_data)
+        if update_data.get('rating', old_rating) != old_rating:
+            self.place_repo.adjust_ratings(review.place_id, added=update_data['rating'], removed=old_rating)
+        self._invalidate_responses(review.place_id, 'places')  # Aggregates, and reviews when included
         return self.get_review(review_id)  # Return updated review
     
     # Deletes a review by ID
+    @transactional
+    @bumps('reviews', 'places')
     def delete_review(self, review_id):
         review = self.get_review(review_id)
         if not review:
             raise ValueError("Review not found")
+        place_id, rating = review.place_id, review.rating
         self.review_repo.delete(review_id)
+        self.place_repo.adjust_ratings(place_id, removed=rating)
+        self._invalidate_responses(place_id, 'places')
+    
+    # Recomputes every place's rating aggregates from the reviews table
+    @transactional
+    @bumps('places')
+    def reconcile_rating_aggregates(self):
+        if self.response_cache is not None:
+            on_commit(self.response_cache.clear)
+        return self.place_repo.recompute_ratings()
@@ -0,0 +1,9 @@
+# asgi.py
+""" ASGI entry point (async serving mode): uvicorn asgi:app
+
+The database is expected to exist (flask db upgrade, or run.py once); run.py remains the WSGI entry point.
+"""
+from app.asgi import create_asgi_app
+
+# Create the ASGI application instance
+app = create_asgi_app()
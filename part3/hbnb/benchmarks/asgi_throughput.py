@@ -0,0 +1,153 @@
+# benchmarks/asgi_throughput.py
+
+""" Throughput of the ASGI mode (uvicorn, async database sessions) against the threaded WSGI server
+
+Each server runs in a subprocess over the same SQLite file; an asyncio load generator keeps --clients
+keep-alive connections busy with GET requests for --duration seconds and reports requests per second,
+latency percentiles and errors. Needs the ASGI dependencies (see app/asgi.py). Run from the project root:
+    python benchmarks/asgi_throughput.py --clients 1000 --duration 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import TestingConfig  # noqa: E402
+
+DATABASE = os.path.join(tempfile.gettempdir(), 'hbnb_asgi_bench.db')
+TIMEOUT = 30  # seconds before a request counts as an error
+
+
+# File database shared by both servers; the response cache is off so that every request reads the database
+class BenchConfig(TestingConfig):
+    TESTING = False
+    SQLALCHEMY_DATABASE_URI = f'sqlite:///{DATABASE}'
+    RESPONSE_CACHE = {}
+    ASYNC_ENGINE_OPTIONS = {'pool_size': 20, 'max_overflow': 20}
+
+
+# Create the schema and bulk insert the places
+def seed(rows):
+    from app import create_app, db
+    from app.models.user import User
+    from app.models.place import Place
+    if os.path.exists(DATABASE):
+        os.remove(DATABASE)
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        owner = User('Owner', 'Bench', 'owner@bench.io', 'password123')
+        db.session.add(owner)
+        db.session.commit()
+        start = datetime(2024, 1, 1)
+        db.session.execute(Place.__table__.insert(), [{
+            'id': str(uuid.uuid4()), 'title': f'Place {i}', 'description': 'A quiet flat close to the station',
+            'price': 50 + i % 200, 'latitude': 48.85, 'longitude': 2.35, 'owner_id': owner.id,
+            'created_at': start + timedelta(seconds=i), 'updated_at': start + timedelta(seconds=i)
+        } for i in range(rows)])
+        db.session.commit()
+        return db.session.execute(db.select(Place.id).limit(1)).scalar()
+
+
+# Server process: the Flask app on werkzeug's threaded server (what run.py starts), or the ASGI app on uvicorn
+def serve(mode, port):
+    if mode == 'wsgi':
+        from werkzeug.serving import WSGIRequestHandler, run_simple
+        from app import create_app
+        WSGIRequestHandler.protocol_version = 'HTTP/1.1'
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)  # no access log, like uvicorn below
+        run_simple('127.0.0.1', port, create_app(BenchConfig), threaded=True)
+    else:
+        import uvicorn
+        from app.asgi import create_asgi_app
+        uvicorn.run(create_asgi_app(BenchConfig), host='127.0.0.1', port=port, log_level='warning',
+                    backlog=4096, timeout_keep_alive=60)
+
+
+# One client sending requests back to back until the deadline, on a keep-alive connection unless the server
+# closes it (werkzeug answers Connection: close, so the WSGI clients reconnect for every request)
+async def client(port, paths, deadline, latencies, errors):
+    index, writer = 0, None
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: application/json\r\n\r\n'.encode())
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), TIMEOUT)
+            headers = dict(line.lower().split(b': ', 1) for line in head.split(b'\r\n')[1:] if line)
+            await asyncio.wait_for(reader.readexactly(int(headers.get(b'content-length', 0))), TIMEOUT)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            errors.append('connection')
+            if writer is not None:
+                writer.close()
+            writer = None
+            continue
+        status = int(head.split(b' ', 2)[1])
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(status)
+        if headers.get(b'connection') == b'close':
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, paths, clients, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*[client(port, paths, deadline, latencies, errors) for _ in range(clients)])
+    return latencies, errors
+
+
+# Start a server, wait until it answers, load it and stop it
+def measure(mode, port, paths, clients, duration):
+    server = subprocess.Popen([sys.executable, __file__, '--serve', mode, '--port', str(port)], cwd=ROOT)
+    try:
+        for _ in range(300):
+            try:
+                socket.create_connection(('127.0.0.1', port)).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        latencies, errors = asyncio.run(load(port, paths, clients, duration))
+    finally:
+        server.terminate()
+        server.wait()
+    latencies.sort()
+    percentile = lambda p: latencies[int(len(latencies) * p)] * 1000 if latencies else float('nan')
+    print(f"{mode:<6}{len(latencies) / duration:>12.0f}{percentile(0.5):>10.1f}{percentile(0.99):>10.1f}{len(errors):>9}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--places', type=int, default=2000)
+    parser.add_argument('--serve', choices=('wsgi', 'asgi'), help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, default=8750)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.port)
+        sys.exit()
+    place_id = seed(args.places)
+    paths = ['/api/v1/places?limit=20', f'/api/v1/places/{place_id}', '/api/v1/amenities',
+             f'/api/v1/places/{place_id}/reviews', '/api/v1/places?fields=id,title,price&limit=50&sort=-price']
+    print(f"{args.clients} keep-alive clients, {args.duration:.0f} s, {args.places} places")
+    print(f"{'mode':<6}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    measure('wsgi', args.port, paths, args.clients, args.duration)
+    measure('asgi', args.port + 1, paths, args.clients, args.duration)
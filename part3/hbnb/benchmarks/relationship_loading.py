@@ -0,0 +1,103 @@
+# benchmarks/relationship_loading.py
+
+""" Compare per-access (dynamic-style) relationship queries with eager loading profiles
+
+Run from the project root:
+    python benchmarks/relationship_loading.py
+"""
+import os
+import sys
+import time
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.place import Place  # noqa: E402
+from app.models.amenity import Amenity  # noqa: E402
+from app.models.review import Review  # noqa: E402
+from app.services import facade  # noqa: E402
+
+PLACES = 50
+AMENITIES = 5
+REVIEWS_PER_PLACE = 10
+ROUNDS = 20
+
+
+# Populate an owner with places, each with amenities and reviews from other users
+def seed():
+    owner = User('Owner', 'Bench', 'owner@bench.io', 'password123')
+    reviewers = [User('Reviewer', str(i), f'r{i}@bench.io', 'password123') for i in range(REVIEWS_PER_PLACE)]
+    amenities = [Amenity(f'Amenity {i}') for i in range(AMENITIES)]
+    db.session.add_all([owner, *reviewers, *amenities])
+    db.session.commit()
+    for i in range(PLACES):
+        place = Place(f'Place {i}', 'benchmark place', 100.0, 10.0, 10.0, owner.id)
+        place.amenities = amenities
+        db.session.add(place)
+        db.session.flush()
+        db.session.add_all([Review(place.id, reviewer.id, 'nice', 4) for reviewer in reviewers])
+    db.session.commit()
+    return owner.id, place.id
+
+
+# Place detail, dynamic-style: one query per relationship access
+def place_detail_dynamic(place_id):
+    place = facade.get_place(place_id)
+    owner = place.owner
+    amenities = facade.place_repo.query_related(place, 'amenities').all()
+    reviews = facade.place_repo.query_related(place, 'reviews').all()
+    authors = [review.author for review in reviews]
+    return owner, amenities, authors
+
+
+# Place detail through the 'place_detail' loading profile
+def place_detail_profile(place_id):
+    place = facade.get_place(place_id, 'place_detail')
+    return place.owner, place.amenities, [review.author for review in place.reviews]
+
+
+# Owner page, dynamic-style: places, then amenities and reviews per place
+def owner_page_dynamic(owner_id):
+    owner = facade.get_user(owner_id)
+    places = facade.user_repo.query_related(owner, 'places').all()
+    for place in places:
+        facade.place_repo.query_related(place, 'amenities').all()
+        facade.place_repo.query_related(place, 'reviews').all()
+    return facade.user_repo.query_related(owner, 'reviews').all()
+
+
+# Owner page through the 'owner_page' loading profile
+def owner_page_profile(owner_id):
+    owner = facade.get_user(owner_id, 'owner_page')
+    for place in owner.places:
+        place.amenities, place.reviews
+    return owner.reviews
+
+
+# Run fn ROUNDS times on a cold session and report statements and latency per call
+def measure(label, fn, arg):
+    statements = []
+    counter = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.engine, 'before_cursor_execute', counter)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        db.session.expunge_all()
+        fn(arg)
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    event.remove(db.engine, 'before_cursor_execute', counter)
+    print(f"{label:<28}{len(statements) // ROUNDS:>10}{elapsed * 1000:>14.2f}")
+
+
+if __name__ == '__main__':
+    app = create_app('config.TestingConfig')
+    with app.app_context():
+        db.create_all()
+        owner_id, place_id = seed()
+        print(f"{PLACES} places, {AMENITIES} amenities each, {REVIEWS_PER_PLACE} reviews each")
+        print(f"{'scenario':<28}{'queries':>10}{'ms/call':>14}")
+        measure('place detail (dynamic)', place_detail_dynamic, place_id)
+        measure('place detail (profile)', place_detail_profile, place_id)
+        measure('owner page (dynamic)', owner_page_dynamic, owner_id)
+        measure('owner page (profile)', owner_page_profile, owner_id)
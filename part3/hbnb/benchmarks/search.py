@@ -0,0 +1,86 @@
+# benchmarks/search.py
+
+""" Measure full-text search latency on a large synthetic corpus of places
+
+Run from the project root (building one million places takes a few minutes):
+    python benchmarks/search.py --places 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.place import Place  # noqa: E402
+from app.models.amenity import Amenity  # noqa: E402
+from app.models.place_amenity import place_amenity  # noqa: E402
+from app.services import facade  # noqa: E402
+
+VOCABULARY = 20000
+BATCH = 10000
+ROUNDS = 20
+QUERIES = [
+    ('rare word', 'word19000', {}),
+    ('common word', 'word3', {}),
+    ('three words', 'word3 word150 word4000', {}),
+    ('common word, price range', 'word3', {'min_price': 50, 'max_price': 80}),
+    ('common word, amenity', 'word3', {'amenities': True}),
+]
+
+
+# Words drawn with a Zipf-like skew, so a few terms have very long postings lists
+def words(rng, count):
+    return ' '.join(f'word{int(VOCABULARY ** rng.random()) - 1}' for _ in range(count))
+
+
+# Bulk insert the places with core statements, then build the index through the rebuild path
+def seed(places):
+    rng = random.Random(42)
+    owner = User('Owner', 'Bench', 'owner@bench.io', 'password123')
+    amenity = Amenity('Bench amenity')
+    db.session.add_all([owner, amenity])
+    db.session.commit()
+    for start in range(0, places, BATCH):
+        rows = [{
+            'id': str(uuid.uuid4()), 'title': words(rng, 3), 'description': words(rng, 12),
+            'price': rng.uniform(10, 500), 'latitude': 10.0, 'longitude': 10.0, 'owner_id': owner.id
+        } for _ in range(min(BATCH, places - start))]
+        db.session.execute(Place.__table__.insert(), rows)
+        db.session.execute(place_amenity.insert(), [
+            {'place_id': row['id'], 'amenity_id': amenity.id} for row in rows[::10]
+        ])
+    db.session.commit()
+    start = time.perf_counter()
+    facade.rebuild_search_index()
+    print(f"indexed {places} places in {time.perf_counter() - start:.1f}s")
+    return amenity.id
+
+
+# Run a query ROUNDS times and report the number of matches and latency per call
+def measure(label, query, filters, amenity_id):
+    amenity_ids = [amenity_id] if filters.pop('amenities', False) else []
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        db.session.expunge_all()
+        results = facade.search_places(query, 20, amenity_ids=amenity_ids, profile='place_with_owner_and_amenities',
+                                       **filters)
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(f"{label:<28}{len(results):>10}{elapsed * 1000:>14.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=1000000)
+    args = parser.parse_args()
+    app = create_app('config.TestingConfig')
+    with app.app_context():
+        db.create_all()
+        amenity_id = seed(args.places)
+        print(f"{'query':<28}{'results':>10}{'ms/call':>14}")
+        for label, query, filters in QUERIES:
+            measure(label, query, dict(filters), amenity_id)
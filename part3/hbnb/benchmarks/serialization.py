@@ -0,0 +1,75 @@
+# benchmarks/serialization.py
+
+""" Compare the to_dict() serialization path with the columnar one on large listing responses
+
+Run from the project root:
+    python benchmarks/serialization.py --rows 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.api import representations  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.place import Place  # noqa: E402
+from app.services import facade  # noqa: E402
+
+ROUNDS = 10
+
+
+# Bulk insert the places with a core statement
+def seed(rows):
+    owner = User('Owner', 'Bench', 'owner@bench.io', 'password123')
+    db.session.add(owner)
+    db.session.commit()
+    start = datetime(2024, 1, 1)
+    db.session.execute(Place.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'title': f'Place {i}', 'description': 'A quiet flat close to the station',
+        'price': 50 + i % 200, 'latitude': 48.85, 'longitude': 2.35, 'owner_id': owner.id,
+        'created_at': start + timedelta(seconds=i), 'updated_at': start + timedelta(seconds=i)
+    } for i in range(rows)])
+    db.session.commit()
+
+
+# Entities loaded by the ORM, to_dict() per row, stock json encoder (the former path)
+def to_dict_path(rows, fields):
+    places, _ = facade.get_places_page(rows, profile=facade.get_view('places', fields))
+    return json.dumps([place.to_dict(fields) for place in places])
+
+
+# Column tuples zipped into dicts, datetimes and encoding left to the fast encoder
+def columnar_path(rows, fields):
+    data, _ = facade.get_places_rows_page(fields, rows)
+    return representations.encode(data)
+
+
+# Run a path ROUNDS times with a fresh session and report the response size and latency per call
+def measure(label, path, rows, fields):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        db.session.expunge_all()
+        body = path(rows, fields)
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(f"{label:<36}{len(body):>12}{elapsed * 1000:>14.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+    app = create_app('config.TestingConfig')
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+        encoder = 'orjson' if representations.orjson is not None else 'json'
+        print(f"{'path':<36}{'bytes':>12}{'ms/call':>14}")
+        for fields, name in ((None, 'all fields'), (['id', 'title', 'price', 'created_at'], '4 fields')):
+            measure(f"to_dict + json, {name}", to_dict_path, args.rows, fields)
+            measure(f"columnar + {encoder}, {name}", columnar_path, args.rows, fields)
@@ -0,0 +1,78 @@
+# benchmarks/sessions.py
+
+""" CPU spent keeping users logged in: a password login per renewal versus a refresh token rotation
+
+Run from the project root:
+    python benchmarks/sessions.py --users 50
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config, TestingConfig  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.passwords import hasher  # noqa: E402
+
+PASSWORD = 'password123'
+
+
+# In-memory database, but the production bcrypt cost (calibrated) and token lifetimes
+class BenchConfig(TestingConfig):
+    PASSWORD_HASHING = Config.PASSWORD_HASHING
+    JWT_SECRET_KEY = 'benchmark-secret-key-of-at-least-32-bytes'
+    JWT_VERIFY_SUB = False  # identities are {'id', 'is_admin'} dicts
+
+
+# One user per simulated client
+def seed(users):
+    db.session.add_all([User('User', f'{i}', f'user{i}@bench.io', PASSWORD) for i in range(users)])
+    db.session.commit()
+
+
+# Renew every user's access token by sending the password again (the only option before refresh tokens)
+def renew_by_login(client, users, _tokens):
+    for i in range(users):
+        response = client.post('/api/v1/login', json={'email': f'user{i}@bench.io', 'password': PASSWORD})
+        assert response.status_code == 200
+
+
+# Renew every user's access token with its refresh token (rotated at each use)
+def renew_by_refresh(client, users, tokens):
+    for i in range(users):
+        response = client.post('/api/v1/refresh', headers={'Authorization': f'Bearer {tokens[i]}'})
+        assert response.status_code == 200
+        tokens[i] = response.get_json()['refresh_token']
+
+
+# CPU time per renewal (every thread of the process, bcrypt pool included) and wall time per renewal
+def measure(client, renew, users, tokens, rounds):
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(rounds):
+        renew(client, users, tokens)
+    count = users * rounds
+    return (time.process_time() - cpu) / count * 1000, (time.perf_counter() - wall) / count * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=3, help='renewals per user and per path')
+    args = parser.parse_args()
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        seed(args.users)
+        client = app.test_client()
+        tokens = [client.post('/api/v1/login', json={'email': f'user{i}@bench.io', 'password': PASSWORD})
+                  .get_json()['refresh_token'] for i in range(args.users)]
+        # Renewals per active user and hour, with access tokens of JWT_ACCESS_TOKEN_EXPIRES
+        per_hour = 3600 / app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds()
+        print(f"bcrypt cost {hasher.rounds}, {args.users} users, {per_hour:.0f} renewals per user-hour")
+        print(f"{'path':<24}{'cpu ms/renewal':>16}{'wall ms/renewal':>17}{'cpu ms/user-hour':>18}")
+        for label, renew in (('login (password)', renew_by_login), ('refresh token', renew_by_refresh)):
+            cpu, wall = measure(client, renew, args.users, tokens, args.rounds)
+            print(f"{label:<24}{cpu:>16.2f}{wall:>17.2f}{cpu * per_hour:>18.2f}")
@@ -1,11 +1,58 @@
 # config.py
 import os
+from datetime import timedelta
 
 # Base configuration class
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Keyset pagination bounds for list endpoints
+    PAGE_SIZE_DEFAULT = 50
+    PAGE_SIZE_MAX = 500
+    # Rows fetched per round trip when streaming a whole collection as NDJSON
+    STREAM_BATCH_SIZE = 1000
+    # Most IDs accepted by one ?ids= multi-get on the users, places and amenities list endpoints
+    BATCH_IDS_MAX = 100
+    # Read-through entity cache per table: (max entries, TTL in seconds); omit a table to disable it
+    ENTITY_CACHE = {
+        'users': (1024, 60),
+        'places': (4096, 30),
+        'amenities': (256, 300)
+    }
+    # Server-side cache of public GET responses (places list/detail, amenities list), invalidated by writes;
+    # add 'url': 'redis://...' to share it between workers, or set {} to disable it
+    RESPONSE_CACHE = {'maxsize': 2048, 'ttl': 30}
+    # Response compression negotiated from Accept-Encoding (zstd and br need the zstandard / brotli packages):
+    # bodies under min_size bytes are sent as is; levels per codec, overridden per URL rule; {} disables it
+    COMPRESSION = {
+        'min_size': 1024,
+        'levels': {'gzip': 6, 'br': 4, 'zstd': 3},
+        'routes': {
+            # Cached responses are compressed once per codec when stored: afford denser levels
+            '/api/v1/places': {'gzip': 9, 'br': 9, 'zstd': 9},
+            '/api/v1/places/<place_id>': {'gzip': 9, 'br': 9, 'zstd': 9},
+            '/api/v1/amenities': {'gzip': 9, 'br': 9, 'zstd': 9},
+            # Full review texts compress well but are not cached: stay fast
+            '/api/v1/reviews': {'gzip': 5, 'br': 4, 'zstd': 3}
+        }
+    }
+    # Seconds between rebuilds of the in-process amenity bitmap index (picks up other processes' writes)
+    AMENITY_INDEX_TTL = 60
+    # bcrypt pool: at most 'workers' hashes at once (default: CPU count) and 'queue' waiting, beyond which
+    # logins get a 503; the cost is calibrated at startup for 'target_ms' per hash (never below 'min_rounds'),
+    # or fixed with 'rounds'. Stored hashes of another cost are upgraded at the next successful login
+    PASSWORD_HASHING = {'workers': None, 'queue': 16, 'target_ms': 250, 'min_rounds': 10}
+    # Access tokens are short-lived; clients renew them with the refresh token (POST /api/v1/refresh), which is
+    # rotated at each use. The store of live sessions is in-process ('memory') or the refresh_tokens table ('sql')
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=14)
+    REFRESH_TOKENS = {'backend': 'memory'}
+    # ASGI serving mode (asgi.py): database URI for the async engine (None: SQLALCHEMY_DATABASE_URI through its
+    # async driver), engine options, and threads running the requests left to the Flask app
+    ASYNC_SQLALCHEMY_DATABASE_URI = None
+    ASYNC_ENGINE_OPTIONS = {'pool_size': 20, 'max_overflow': 20}
+    ASGI_WSGI_WORKERS = 16
 
 # Development-specific configuration using MySQL
 class DevelopmentConfig(Config):
@@ -17,8 +64,18 @@ class DevelopmentConfig(Config):
         f"{os.getenv('DB_NAME', 'Hbnb')}"
     )
 
+# Testing configuration using an in-memory SQLite database
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    ENTITY_CACHE = {}
+    RESPONSE_CACHE = {}
+    PASSWORD_HASHING = {'workers': 2, 'queue': 8, 'rounds': 4}
+    ASYNC_ENGINE_OPTIONS = {}  # in-memory SQLite: not shared with the sync engine, use a file for the ASGI mode
+
 # Configuration dictionary for easy access
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
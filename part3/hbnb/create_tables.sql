@@ -1,3 +1,7 @@
+-- Generated from the SQLAlchemy models (MySQL dialect).
+-- The models are the source of truth: apply schema changes with `flask db upgrade`
+-- and check a live database with `flask schema-check`.
+
 DROP TABLE IF EXISTS place_amenity;
 DROP TABLE IF EXISTS reviews;
 DROP TABLE IF EXISTS places;
@@ -6,49 +10,119 @@ DROP TABLE IF EXISTS users;
 
 -- Create User Table
 CREATE TABLE users (
-    id CHAR(36) PRIMARY KEY,
-    first_name VARCHAR(255) NOT NULL,
-    last_name VARCHAR(255) NOT NULL,
-    email VARCHAR(255) NOT NULL UNIQUE,
-    password VARCHAR(255) NOT NULL,
-    is_admin BOOLEAN DEFAULT FALSE
+    id VARCHAR(36) NOT NULL,
+    first_name VARCHAR(50) NOT NULL,
+    last_name VARCHAR(50) NOT NULL,
+    email VARCHAR(120) NOT NULL,
+    password VARCHAR(128) NOT NULL,
+    is_admin BOOL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (email)
 );
+CREATE INDEX ix_users_created_at_id ON users (created_at, id);
 
 -- Create Place Table
 CREATE TABLE places (
-    id CHAR(36) PRIMARY KEY,
-    title VARCHAR(255) NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    title VARCHAR(100) NOT NULL,
     description TEXT,
-    price DECIMAL(10, 2) NOT NULL,
+    price FLOAT NOT NULL,
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
-    owner_id CHAR(36) NOT NULL,
-    FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
+    owner_id VARCHAR(36) NOT NULL,
+    geo_cell INTEGER DEFAULT '0' NOT NULL,
+    review_count INTEGER DEFAULT '0' NOT NULL,
+    rating_sum INTEGER DEFAULT '0' NOT NULL,
+    rating_count_1 INTEGER DEFAULT '0' NOT NULL,
+    rating_count_2 INTEGER DEFAULT '0' NOT NULL,
+    rating_count_3 INTEGER DEFAULT '0' NOT NULL,
+    rating_count_4 INTEGER DEFAULT '0' NOT NULL,
+    rating_count_5 INTEGER DEFAULT '0' NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY (owner_id) REFERENCES users (id)
 );
+CREATE INDEX ix_places_created_at_id ON places (created_at, id);
+CREATE INDEX ix_places_geo_cell ON places (geo_cell);
+CREATE INDEX ix_places_latitude_longitude ON places (latitude, longitude);
+CREATE INDEX ix_places_owner_id ON places (owner_id);
+CREATE INDEX ix_places_price ON places (price);
 
 -- Create Review Table
 CREATE TABLE reviews (
-    id CHAR(36) PRIMARY KEY,
+    id VARCHAR(36) NOT NULL,
     text TEXT NOT NULL,
-    rating INT NOT NULL CHECK (rating BETWEEN 1 AND 5),
-    user_id CHAR(36) NOT NULL,
-    place_id CHAR(36) NOT NULL,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
-    CONSTRAINT unique_user_place UNIQUE (user_id, place_id)
+    rating INTEGER NOT NULL,
+    user_id VARCHAR(36) NOT NULL,
+    place_id VARCHAR(36) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT unique_user_place UNIQUE (user_id, place_id),
+    CONSTRAINT check_review_rating CHECK (rating BETWEEN 1 AND 5),
+    FOREIGN KEY (place_id) REFERENCES places (id),
+    FOREIGN KEY (user_id) REFERENCES users (id)
 );
+CREATE INDEX ix_reviews_created_at_id ON reviews (created_at, id);
+CREATE INDEX ix_reviews_place_id ON reviews (place_id);
 
 -- Create Amenity Table
 CREATE TABLE amenities (
-    id CHAR(36) PRIMARY KEY,
-    name VARCHAR(255) NOT NULL UNIQUE
+    id VARCHAR(36) NOT NULL,
+    name VARCHAR(50) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
 );
+CREATE INDEX ix_amenities_created_at_id ON amenities (created_at, id);
 
 -- Create Place_Amenity Table (Many-to-Many)
 CREATE TABLE place_amenity (
-    place_id CHAR(36) NOT NULL,
-    amenity_id CHAR(36) NOT NULL,
+    place_id VARCHAR(36) NOT NULL,
+    amenity_id VARCHAR(36) NOT NULL,
     PRIMARY KEY (place_id, amenity_id),
-    FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
-    FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
+    FOREIGN KEY (place_id) REFERENCES places (id),
+    FOREIGN KEY (amenity_id) REFERENCES amenities (id)
+);
+CREATE INDEX ix_place_amenity_amenity_id ON place_amenity (amenity_id);
+
+-- Create Search Postings Table (full-text inverted index over places)
+CREATE TABLE search_postings (
+    term VARCHAR(64) NOT NULL,
+    place_id VARCHAR(36) NOT NULL,
+    term_frequency INTEGER NOT NULL,
+    doc_length INTEGER NOT NULL,
+    PRIMARY KEY (term, place_id),
+    FOREIGN KEY (place_id) REFERENCES places (id)
+);
+CREATE INDEX ix_search_postings_place_id ON search_postings (place_id);
+
+-- Create Search Stats Table (corpus size for BM25, single row)
+CREATE TABLE search_stats (
+    id INTEGER NOT NULL,
+    document_count INTEGER NOT NULL,
+    total_length BIGINT NOT NULL,
+    PRIMARY KEY (id)
+);
+INSERT INTO search_stats (id, document_count, total_length) VALUES (1, 0, 0);
+
+-- Create Collection Versions Table (counters behind the ETags of read endpoints)
+CREATE TABLE collection_versions (
+    name VARCHAR(32) NOT NULL,
+    version BIGINT NOT NULL,
+    PRIMARY KEY (name)
+);
+INSERT INTO collection_versions (name, version) VALUES ('users', 0), ('places', 0), ('amenities', 0), ('reviews', 0);
+
+-- Create Refresh Tokens Table (one row per login session: the refresh token still accepted)
+CREATE TABLE refresh_tokens (
+    family VARCHAR(36) NOT NULL,
+    jti VARCHAR(36) NOT NULL,
+    user_id VARCHAR(36) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    PRIMARY KEY (family)
 );
+CREATE INDEX ix_refresh_tokens_user_id ON refresh_tokens (user_id);
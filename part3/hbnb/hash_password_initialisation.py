@@ -1,5 +1,4 @@
-from flask_bcrypt import Bcrypt
-bcrypt = Bcrypt()
+import bcrypt
 password = "admin1234"
-hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(12)).decode('utf-8')
 print(hashed_password)
@@ -1,17 +1,22 @@
 -- Insert Administrator User
-INSERT INTO users (id, first_name, last_name, email, password, is_admin)
+INSERT INTO users (id, first_name, last_name, email, password, is_admin, created_at, updated_at)
 VALUES (
     '36c9050e-ddd3-4c3b-9731-9f487208bbc1',
     'Admin',
     'HBnB',
     'admin@hbnb.io',
     '$2b$12$wegd.CgSrv5JHcswj62Gmu9fdjxK/gYYxzFJTbBm9cmOkOHH36Ole',
-    TRUE
+    TRUE,
+    NOW(),
+    NOW()
 );
 
 -- Insert Initial Amenities
-INSERT INTO amenities (id, name)
+INSERT INTO amenities (id, name, created_at, updated_at)
 VALUES
-    ('a1b2c3d4-e5f6-7890-abcd-1234567890ef', 'WiFi'),
-    ('b2c3d4e5-f6a7-8901-bcde-2345678901fa', 'Swimming Pool'),
-    ('c3d4e5f6-a7b8-9012-cdef-3456789012ab', 'Air Conditioning');
+    ('a1b2c3d4-e5f6-7890-abcd-1234567890ef', 'WiFi', NOW(), NOW()),
+    ('b2c3d4e5-f6a7-8901-bcde-2345678901fa', 'Swimming Pool', NOW(), NOW()),
+    ('c3d4e5f6-a7b8-9012-cdef-3456789012ab', 'Air Conditioning', NOW(), NOW());
+
+-- Places inserted by hand are not in the full-text search index (search_postings, search_stats):
+-- run `flask rebuild-search-index` afterwards, and `flask reconcile-ratings` after inserting reviews
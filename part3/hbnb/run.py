@@ -4,6 +4,7 @@ from app.models.user import User
 from app.models.place import Place
 from app.models.amenity import Amenity
 from app.models.review import Review
+from app.services import facade
 
 # Populate the database with initial data
 def initialize_database():
@@ -40,6 +41,11 @@ def initialize_database():
     
     # Final commit to persist all changes
     db.session.commit()
+    
+    # Reviews and places added straight to the session bypass the facade: fill the places' rating
+    # aggregates and the full-text search index
+    facade.reconcile_rating_aggregates()
+    facade.rebuild_search_index()
     print("Database initialized with sample data.")
 
 # Create the Flask app instance
@@ -0,0 +1,64 @@
+# tests/conftest.py
+
+""" Shared fixtures: an app on a fresh in-memory database, with per-test configuration overrides """
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.services import facade
+from config import TestingConfig
+
+
+# Testing configuration overridden with the given settings (e.g. ENTITY_CACHE to turn the cache on)
+def config_with(**settings):
+    return type('TestConfig', (TestingConfig,), dict({'JWT_VERIFY_SUB': False}, **settings))
+
+
+# make_app(**settings) creates the app, its tables and an application context for the rest of the test
+@pytest.fixture
+def make_app():
+    contexts = []
+
+    def make(**settings):
+        app = create_app(config_with(**settings))
+        context = app.app_context()
+        context.push()
+        contexts.append(context)
+        db.create_all()
+        return app
+
+    yield make
+    for context in reversed(contexts):
+        db.session.remove()
+        db.drop_all()
+        context.pop()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+# A user created through the facade (so caches, indexes and versions see it)
+def create_user(email, password='password123', is_admin=False, first_name='Test'):
+    return facade.create_user({
+        'first_name': first_name, 'last_name': 'User', 'email': email, 'password': password, 'is_admin': is_admin
+    })
+
+
+# A place created through the facade
+def create_place(owner, title='Cabin', description='A cabin in the woods', price=100, amenities=()):
+    return facade.create_place({
+        'title': title, 'description': description, 'price': price, 'latitude': 45.0, 'longitude': 5.0,
+        'owner_id': owner.id, 'amenities': list(amenities)
+    })
+
+
+# Authorization header of an access token for user
+def auth_header(user):
+    token = create_access_token(identity={'id': user.id, 'is_admin': user.is_admin})
+    return {'Authorization': f'Bearer {token}'}
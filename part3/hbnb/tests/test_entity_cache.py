@@ -0,0 +1,89 @@
+# tests/test_entity_cache.py
+
+""" Entity cache: readonly lookups see committed writes, never rolled back or uncommitted ones """
+import pytest
+from app import db
+from app.models.user import User
+from app.persistence.unit_of_work import transactional
+from app.services import facade
+from conftest import create_user
+
+CACHED = {'ENTITY_CACHE': {'users': (100, 600)}}
+
+
+@pytest.fixture
+def user(make_app):
+    make_app(**CACHED)
+    return create_user('cached@hbnb.io', first_name='Before')
+
+
+# Each request gets a fresh session, and with it a fresh identity memo that would otherwise answer first
+def next_request():
+    db.session.remove()
+
+
+def cached_name(user_id):
+    snapshot = facade.user_repo.cache.get(('id', user_id))
+    return snapshot.first_name if snapshot else None
+
+
+def test_read_after_write_is_fresh(user):
+    assert facade.get_user(user.id, readonly=True).first_name == 'Before'
+    assert cached_name(user.id) == 'Before'
+    facade.update_user(user.id, {'first_name': 'After'})
+    assert cached_name(user.id) is None
+    next_request()
+    assert facade.get_user(user.id, readonly=True).first_name == 'After'
+    assert cached_name(user.id) == 'After'
+
+
+def test_password_change_reaches_cached_login_lookup(user):
+    assert facade.authenticate('cached@hbnb.io', 'password123')
+    facade.update_user(user.id, {'password': 'changed123'})
+    assert facade.authenticate('cached@hbnb.io', 'password123') is None
+    assert facade.authenticate('cached@hbnb.io', 'changed123')
+
+
+def test_fill_read_before_a_write_is_not_cached(user):
+    cache = facade.user_repo.cache
+    generation = cache.generation()
+    stale = db.session.get(User, user.id)  # a concurrent request read the row before the write committed
+    db.session.expunge(stale)
+    facade.update_user(user.id, {'first_name': 'After'})
+    assert cache.put(('id', user.id), stale, generation).first_name == 'Before'
+    assert cached_name(user.id) is None
+    next_request()
+    assert facade.get_user(user.id, readonly=True).first_name == 'After'
+
+
+def test_rolled_back_write_leaves_the_cache_alone(user, monkeypatch):
+    facade.get_user(user.id, readonly=True)
+    invalidations = facade.user_repo.cache.stats()['invalidations']
+
+    def fail(*tags):
+        raise RuntimeError("write failed after the UPDATE")
+    monkeypatch.setattr(facade, '_invalidate_responses', fail)
+    with pytest.raises(RuntimeError):
+        facade.update_user(user.id, {'first_name': 'After'})
+    assert facade.user_repo.cache.stats()['invalidations'] == invalidations
+    assert cached_name(user.id) == 'Before'
+    next_request()
+    assert db.session.get(User, user.id).first_name == 'Before'
+
+
+def test_uncommitted_write_is_never_cached(user):
+    user_id = user.id
+
+    @transactional
+    def rename_then_fail():
+        facade.user_repo.update(user_id, {'first_name': 'Uncommitted'})
+        # Readonly lookups in the writing transaction read around the cache
+        assert facade.get_user(user_id, readonly=True).first_name == 'Uncommitted'
+        assert facade.get_user_by_email('cached@hbnb.io', readonly=True).first_name == 'Uncommitted'
+        raise ValueError("validation failed")
+
+    with pytest.raises(ValueError):
+        rename_then_fail()
+    assert facade.user_repo.cache.stats()['size'] == 0
+    next_request()
+    assert facade.get_user(user_id, readonly=True).first_name == 'Before'
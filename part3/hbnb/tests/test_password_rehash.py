@@ -0,0 +1,47 @@
+# tests/test_password_rehash.py
+
+""" Login upgrades hashes made with another bcrypt cost, hashing before the transaction that stores the result """
+import pytest
+from app import db
+from app.passwords import PasswordHasherBusy, hash_rounds, hasher
+from app.services import facade
+from conftest import create_user
+
+
+@pytest.fixture
+def user(app, monkeypatch):
+    user = create_user('guest@hbnb.io')  # hashed with the testing cost, 4
+    monkeypatch.setattr(hasher, 'rounds', 5)
+    return user
+
+
+def stored_rounds(user_id):
+    db.session.remove()
+    return hash_rounds(facade.get_user(user_id).password)
+
+
+def test_login_upgrades_the_hash_outside_the_transaction(user, monkeypatch):
+    depths, real_hash = [], hasher.hash
+
+    def hash(password):
+        depths.append(db.session.info.get('uow_depth', 0))
+        return real_hash(password)
+    monkeypatch.setattr(hasher, 'hash', hash)
+    assert facade.authenticate('guest@hbnb.io', 'password123')
+    assert depths == [0]  # no unit of work open while bcrypt runs
+    assert stored_rounds(user.id) == 5
+    assert facade.authenticate('guest@hbnb.io', 'password123')
+    assert depths == [0]  # up to date: no second rehash
+
+
+def test_busy_hasher_still_logs_in(user, monkeypatch):
+    def busy(password):
+        raise PasswordHasherBusy(retry_after=1)
+    monkeypatch.setattr(hasher, 'hash', busy)
+    assert facade.authenticate('guest@hbnb.io', 'password123')
+    assert stored_rounds(user.id) == 4
+
+
+def test_wrong_password_keeps_the_hash(user):
+    assert facade.authenticate('guest@hbnb.io', 'wrong-password') is None
+    assert stored_rounds(user.id) == 4
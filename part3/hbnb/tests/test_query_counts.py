@@ -0,0 +1,70 @@
+# tests/test_query_counts.py
+
+""" The place endpoints load owners, amenities and review authors with a constant number of queries
+
+Run from the project root: python -m pytest tests
+"""
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from config import TestingConfig
+
+SIZES = (1, 5, 25)
+ENDPOINTS = {
+    'list': '/api/v1/places?limit=100',
+    'detail': '/api/v1/places/{place_id}',
+    'page': '/api/v1/places/{place_id}/page?limit=100'
+}
+
+
+# n places with their own owner and three amenities each; the first place has n reviews by n other users
+def seed(n):
+    amenities = [Amenity(f'Amenity {i}') for i in range(n + 2)]
+    owners = [User('Owner', str(i), f'owner{i}@hbnb.io', 'password123') for i in range(n)]
+    authors = [User('Author', str(i), f'author{i}@hbnb.io', 'password123') for i in range(n)]
+    db.session.add_all(amenities + owners + authors)
+    db.session.flush()
+    places = []
+    for i, owner in enumerate(owners):
+        place = Place(f'Place {i}', 'A flat', 50.0 + i, 48.85, 2.35, owner.id)
+        place.amenities = amenities[i:i + 3]
+        places.append(place)
+    db.session.add_all(places)
+    db.session.flush()
+    db.session.add_all([Review(places[0].id, author.id, 'Nice stay', 4) for author in authors])
+    db.session.commit()
+    return places[0].id
+
+
+# SQL statements run by each endpoint, per number of seeded places
+@pytest.fixture(scope='module')
+def query_counts():
+    counts = {}
+    for n in SIZES:
+        app = create_app(TestingConfig)
+        with app.app_context():
+            db.create_all()
+            place_id = seed(n)
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            client = app.test_client()
+            for name, url in ENDPOINTS.items():
+                statements.clear()
+                response = client.get(url.format(place_id=place_id))
+                assert response.status_code == 200, response.get_json()
+                counts[n, name] = len(statements)
+            event.remove(db.engine, 'before_cursor_execute', listener)
+            db.session.remove()
+            db.drop_all()
+    return counts
+
+
+@pytest.mark.parametrize('endpoint', ENDPOINTS)
+def test_query_count_is_flat(query_counts, endpoint):
+    counts = [query_counts[n, endpoint] for n in SIZES]
+    assert counts == [counts[0]] * len(SIZES), f"{endpoint}: {dict(zip(SIZES, counts))} queries"
@@ -0,0 +1,88 @@
+# tests/test_refresh_tokens.py
+
+""" Refresh token rotation, reuse detection and revocation on password change, with both token stores """
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.persistence.unit_of_work import unit_of_work
+from app.services import facade
+from conftest import create_user
+
+
+@pytest.fixture(params=['memory', 'sql'])
+def client(request, make_app):
+    client = make_app(REFRESH_TOKENS={'backend': request.param}).test_client()
+    create_user('guest@hbnb.io')
+    return client
+
+
+def login(client, password='password123'):
+    response = client.post('/api/v1/login', json={'email': 'guest@hbnb.io', 'password': password})
+    assert response.status_code == 200
+    return response.get_json()['refresh_token']
+
+
+def refresh(client, token):
+    return client.post('/api/v1/refresh', headers={'Authorization': f'Bearer {token}'})
+
+
+def sessions():
+    return facade.token_store.stats()['sessions']
+
+
+def test_refresh_rotates_the_token(client):
+    old = login(client)
+    response = refresh(client, old)
+    assert response.status_code == 200
+    new = response.get_json()['refresh_token']
+    assert new != old and response.get_json()['access_token']
+    assert refresh(client, new).status_code == 200
+    assert sessions() == 1
+
+
+def test_replayed_token_revokes_the_session(client):
+    old = login(client)
+    new = refresh(client, old).get_json()['refresh_token']
+    assert refresh(client, old).status_code == 401
+    assert refresh(client, new).status_code == 401  # the thief or the user: neither keeps the session
+    assert sessions() == 0
+    assert facade.token_store.stats()['reuses'] == 1
+
+
+def test_logout_ends_only_its_session(client):
+    first, second = login(client), login(client)
+    assert client.post('/api/v1/logout', headers={'Authorization': f'Bearer {first}'}).status_code == 200
+    assert refresh(client, first).status_code == 401
+    assert refresh(client, second).status_code == 200
+
+
+def test_password_change_revokes_the_sessions(client):
+    token = login(client)
+    user = facade.get_user_by_email('guest@hbnb.io')
+    facade.update_user(user.id, {'password': 'changed123'})
+    assert refresh(client, token).status_code == 401
+    assert refresh(client, login(client, 'changed123')).status_code == 200
+
+
+def test_rolled_back_password_change_keeps_the_sessions(client, monkeypatch):
+    token = login(client)
+    user_id = facade.get_user_by_email('guest@hbnb.io').id
+
+    def fail(*tags):
+        raise RuntimeError("write failed after the UPDATE")
+    monkeypatch.setattr(facade, '_invalidate_responses', fail)
+    with pytest.raises(RuntimeError):
+        facade.update_user(user_id, {'password': 'changed123'})
+    assert sessions() == 1
+    assert refresh(client, token).status_code == 200
+    assert login(client)  # the old password still holds
+
+
+def test_revocation_waits_for_the_commit(make_app):
+    make_app()  # memory store: the SQL store's DELETE is part of the transaction by construction
+    user = create_user('owner@hbnb.io')
+    facade.start_session('family', 'jti', user.id, datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1))
+    with unit_of_work():
+        facade.update_user(user.id, {'password': 'changed123'})
+        assert sessions() == 1
+    assert sessions() == 0
+
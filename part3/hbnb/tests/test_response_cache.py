@@ -0,0 +1,82 @@
+# tests/test_response_cache.py
+
+""" Response cache: hits replay the stored response, writes drop the responses showing what they changed """
+import pytest
+from app.services import facade
+from conftest import create_place, create_user
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app(RESPONSE_CACHE={'maxsize': 100, 'ttl': 600}).test_client()
+
+
+@pytest.fixture
+def place():
+    owner = create_user('owner@hbnb.io', first_name='Olivia')
+    wifi = facade.create_amenity({'name': 'Wifi'})
+    return create_place(owner, amenities=[wifi.id])
+
+
+def get(client, path, **headers):
+    return client.get(path, headers=dict({'Accept': 'application/json'}, **headers))
+
+
+def test_miss_then_hit(client, place):
+    first = get(client, f'/api/v1/places/{place.id}')
+    second = get(client, f'/api/v1/places/{place.id}')
+    assert first.status_code == second.status_code == 200
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert second.get_json() == first.get_json()
+    assert second.headers['ETag'] == first.headers['ETag']
+
+
+def test_query_string_order_does_not_split_entries(client, place):
+    assert get(client, '/api/v1/places?limit=5&sort=-price').headers['X-Cache'] == 'MISS'
+    assert get(client, '/api/v1/places?sort=-price&limit=5').headers['X-Cache'] == 'HIT'
+
+
+def test_owner_rename_drops_the_places_embedding_the_owner(client, place):
+    for name, path in (('Olga', f'/api/v1/places/{place.id}'), ('Ondine', '/api/v1/places')):
+        get(client, path)
+        facade.update_user(place.owner_id, {'first_name': name})
+        response = get(client, path)
+        body = response.get_json()
+        owner = (body if isinstance(body, dict) else body[0])['owner']
+        assert (response.headers['X-Cache'], owner['first_name']) == ('MISS', name)
+
+
+def test_new_review_drops_the_reviewed_place(client, place):
+    get(client, f'/api/v1/places/{place.id}')
+    guest = create_user('guest@hbnb.io')
+    facade.create_review({'user_id': guest.id, 'place_id': place.id, 'text': 'Lovely', 'rating': 4})
+    response = get(client, f'/api/v1/places/{place.id}')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['review_count'] == 1
+
+
+def test_changed_amenity_drops_the_places_and_amenity_list_showing_it(client, place):
+    amenity_id = place.amenities[0].id
+    for path in (f'/api/v1/places/{place.id}', '/api/v1/amenities'):
+        assert get(client, path).headers['X-Cache'] == 'MISS'
+        assert get(client, path).headers['X-Cache'] == 'HIT'
+    facade.update_amenity(amenity_id, {'name': 'Fibre'})
+    detail = get(client, f'/api/v1/places/{place.id}')
+    assert detail.headers['X-Cache'] == 'MISS'
+    assert [amenity['name'] for amenity in detail.get_json()['amenities']] == ['Fibre']
+    assert get(client, '/api/v1/amenities').headers['X-Cache'] == 'MISS'
+
+
+def test_unrelated_write_keeps_the_entry(client, place):
+    get(client, f'/api/v1/places/{place.id}')
+    facade.update_user(create_user('other@hbnb.io').id, {'first_name': 'Other'})
+    assert get(client, f'/api/v1/places/{place.id}').headers['X-Cache'] == 'HIT'
+
+
+def test_not_modified_from_a_cached_entry(client, place):
+    etag = get(client, f'/api/v1/places/{place.id}').headers['ETag']
+    response = get(client, f'/api/v1/places/{place.id}', **{'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['X-Cache'] == 'HIT'
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
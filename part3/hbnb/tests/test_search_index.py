@@ -0,0 +1,51 @@
+# tests/test_search_index.py
+
+""" Full-text index statistics: a place counts as a document only while it has postings """
+from sqlalchemy import select
+from app import db
+from app.models.search_index import search_postings, search_stats
+from app.services import facade
+from conftest import create_place, create_user
+
+
+# (document count, total length); no row yet reads as an empty corpus, like SearchRepository does
+def stats():
+    row = db.session.execute(select(search_stats.c.document_count, search_stats.c.total_length)).first()
+    return tuple(row) if row else (0, 0)
+
+
+def postings(place_id):
+    return db.session.execute(select(search_postings).where(search_postings.c.place_id == place_id)).all()
+
+
+def test_place_without_terms_is_not_counted(app):
+    owner = create_user('owner@hbnb.io')
+    place = create_place(owner, title='A', description='The #1')
+    assert postings(place.id) == []
+    for title in ('The', '#1', 'A'):
+        facade.update_place(place.id, {'title': title})
+    assert stats() == (0, 0)
+    facade.delete_place(place.id)
+    assert stats() == (0, 0)
+
+
+def test_stats_follow_terms_appearing_and_disappearing(app):
+    owner = create_user('owner@hbnb.io')
+    cabin = create_place(owner, title='Cabin', description='woods')
+    assert stats() == (1, 3)  # title words weigh 2
+    empty = create_place(owner, title='A', description='')
+    facade.update_place(empty.id, {'title': 'Lake house'})
+    assert stats() == (2, 7)
+    facade.update_place(empty.id, {'title': 'A', 'description': 'the'})
+    assert stats() == (1, 3)
+    facade.delete_place(cabin.id)
+    assert stats() == (0, 0)
+
+
+def test_rebuild_counts_documents_like_incremental_updates(app):
+    owner = create_user('owner@hbnb.io')
+    create_place(owner, title='Cabin', description='woods')
+    create_place(owner, title='A', description='#1')
+    incremental = stats()
+    assert facade.rebuild_search_index() == 1
+    assert stats() == incremental == (1, 3)
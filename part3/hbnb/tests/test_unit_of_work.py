@@ -0,0 +1,86 @@
+# tests/test_unit_of_work.py
+
+""" Unit of work: a write failing partway persists nothing and runs none of its on_commit callbacks """
+import pytest
+from sqlalchemy import func, select
+from app import db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.search_index import search_postings
+from app.persistence import versions
+from app.persistence.unit_of_work import on_commit, transactional, unit_of_work
+from app.services import facade
+from conftest import create_place, create_user
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app(RESPONSE_CACHE={'maxsize': 100, 'ttl': 600}).test_client()
+
+
+# Make facade writes fail at their last step (@bumps schedules the version bump after the method), once every
+# row is flushed and every other on_commit callback registered
+def fail_bumps(monkeypatch):
+    def fail(callback, first=False):
+        raise RuntimeError("write failed")
+    monkeypatch.setattr(versions, 'on_commit', fail)
+
+
+def count(table):
+    return db.session.scalar(select(func.count()).select_from(table))
+
+
+def test_failed_place_creation_persists_nothing(client, monkeypatch):
+    owner = create_user('owner@hbnb.io')
+    wifi = facade.create_amenity({'name': 'Wifi'})
+    assert client.get(f'/api/v1/places?amenities={wifi.id}').get_json() == []  # builds the amenity index
+    assert client.get('/api/v1/places').headers['X-Cache'] == 'MISS'
+    before = facade.get_versions(versions.COLLECTIONS)
+    fail_bumps(monkeypatch)
+    with pytest.raises(RuntimeError):
+        create_place(owner, title='Lake house', amenities=[wifi.id])
+    assert (count(Place), count(search_postings)) == (0, 0)
+    assert facade.get_versions(versions.COLLECTIONS) == before
+    monkeypatch.undo()
+    facade.create_amenity({'name': 'Pool'})  # commits, running its own callbacks only
+    # The callbacks updating the response cache and the amenity index did not run, then or now
+    assert client.get('/api/v1/places').headers['X-Cache'] == 'HIT'
+    assert facade.amenity_index.stats()['places'] == 0
+
+
+def test_failed_review_leaves_the_place_ratings(client, monkeypatch):
+    place = create_place(create_user('owner@hbnb.io'))
+    guest = create_user('guest@hbnb.io')
+    client.get(f'/api/v1/places/{place.id}')
+    fail_bumps(monkeypatch)
+    with pytest.raises(RuntimeError):
+        facade.create_review({'user_id': guest.id, 'place_id': place.id, 'text': 'Lovely', 'rating': 5})
+    assert count(Review) == 0
+    assert (place.review_count, place.rating_sum) == (0, 0)
+    response = client.get(f'/api/v1/places/{place.id}')
+    assert response.headers['X-Cache'] == 'HIT'
+    assert response.get_json()['review_count'] == 0
+
+
+def test_nested_writes_roll_back_with_the_outermost(app):
+    ran = []
+
+    @transactional
+    def create_then_fail():
+        create_user('inner@hbnb.io')  # its own unit of work joins this one and commits nothing
+        on_commit(lambda: ran.append('inner'))
+        raise ValueError("validation failed")
+
+    with pytest.raises(ValueError):
+        create_then_fail()
+    assert facade.get_user_by_email('inner@hbnb.io') is None
+    create_user('later@hbnb.io')  # the next commit does not run the dropped callbacks either
+    assert ran == []
+
+
+def test_versions_are_bumped_once_the_write_commits(app):
+    with unit_of_work():
+        create_user('first@hbnb.io')
+        create_user('second@hbnb.io')
+        assert facade.get_versions(['users']) == {'users': 0}
+    assert facade.get_versions(['users']) == {'users': 2}
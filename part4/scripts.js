@@ -1,13 +1,59 @@
 document.addEventListener('DOMContentLoaded', () => {
     // === Utility Functions ===
-    // Extract JWT token from browser cookies
-    function getToken() {
+    // Read a cookie by name
+    function getCookie(name) {
         const cookies = document.cookie.split(';').reduce((acc, cookie) => {
             const [key, value] = cookie.trim().split('=');
             acc[key] = value;
             return acc;
         }, {});
-        return cookies.token || null;
+        return cookies[name] || null;
+    }
+
+    // Extract JWT token from browser cookies
+    function getToken() {
+        return getCookie('token');
+    }
+
+    // Save the access token and the refresh token returned by /login or /refresh
+    function saveTokens(data) {
+        document.cookie = `token=${data.access_token}; path=/; Secure; SameSite=Strict`;
+        document.cookie = `refresh_token=${data.refresh_token}; path=/; Secure; SameSite=Strict`;
+    }
+
+    // Clear both tokens
+    function clearTokens() {
+        document.cookie = "token=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;";
+        document.cookie = "refresh_token=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;";
+    }
+
+    // Renew the short-lived access token with the refresh token (no password, no bcrypt on the server)
+    async function refreshTokens() {
+        const refreshToken = getCookie('refresh_token');
+        if (!refreshToken) return null;
+        const res = await fetch('http://127.0.0.1:5000/api/v1/refresh', {
+            method: 'POST',
+            headers: { 'Authorization': `Bearer ${refreshToken}` }
+        });
+        if (!res.ok) {
+            clearTokens();
+            return null;
+        }
+        const data = await res.json();
+        saveTokens(data);
+        return data.access_token;
+    }
+
+    // fetch() with the access token, renewed once and retried when it has expired
+    async function authFetch(url, options = {}) {
+        const send = (accessToken) => fetch(url, {
+            ...options,
+            headers: { ...(options.headers || {}), 'Authorization': `Bearer ${accessToken}` }
+        });
+        const response = await send(getToken());
+        if (response.status !== 401) return response;
+        const renewed = await refreshTokens();
+        return renewed ? send(renewed) : response;
     }
 
     // Decode JWT payload to extract user ID
@@ -43,11 +89,18 @@ document.addEventListener('DOMContentLoaded', () => {
     if (loginLink)  loginLink.style.display  = isLoggedIn ? 'none' : 'inline-block';
     if (logoutLink) logoutLink.style.display = isLoggedIn ? 'inline-block' : 'none';
 
-    // Logout click handler: clear token and redirect to home
+    // Logout click handler: end the server session, clear tokens and redirect to home
     if (logoutLink) {
-        logoutLink.addEventListener('click', (e) => {
+        logoutLink.addEventListener('click', async (e) => {
             e.preventDefault();
-            document.cookie = "token=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;";
+            const refreshToken = getCookie('refresh_token');
+            if (refreshToken) {
+                await fetch('http://127.0.0.1:5000/api/v1/logout', {
+                    method: 'POST',
+                    headers: { 'Authorization': `Bearer ${refreshToken}` }
+                }).catch(err => console.error(err));
+            }
+            clearTokens();
             window.location.href = 'index.html';
         });
     }
@@ -70,8 +123,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
                 const data = await response.json();
                 if (response.ok) {
-                    // Save token in secure cookie and redirect
-                    document.cookie = `token=${data.access_token}; path=/; Secure; SameSite=Strict`;
+                    // Save tokens in secure cookies and redirect
+                    saveTokens(data);
                     window.location.href = 'index.html';
                 } else {
                     // Show error message
@@ -85,12 +138,28 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // === API Fetch Helpers ===
-    // Fetch list of places
-    async function fetchPlaces() {
+    // URL of the next page advertised in a list response's Link header, or null on the last page
+    function nextPageUrl(response) {
+        const link = response.headers.get('Link') || '';
+        const match = link.match(/<([^>]+)>;\s*rel="next"/);
+        return match ? match[1] : null;
+    }
+
+    // Fetch list of places, optionally only those up to maxPrice (filtered by the server),
+    // following the rel="next" links until the last page
+    async function fetchPlaces(maxPrice = Infinity) {
         try {
-            const res = await fetch('http://127.0.0.1:5000/api/v1/places');
-            if (!res.ok) throw new Error('Failed to fetch places');
-            return await res.json();
+            const params = new URLSearchParams({ limit: 500 });  // PAGE_SIZE_MAX: fewest round trips
+            if (Number.isFinite(maxPrice)) params.set('price[lte]', maxPrice);
+            let url = `http://127.0.0.1:5000/api/v1/places?${params}`;
+            const places = [];
+            while (url) {
+                const res = await fetch(url);
+                if (!res.ok) throw new Error('Failed to fetch places');
+                places.push(...await res.json());
+                url = nextPageUrl(res);
+            }
+            return places;
         } catch (err) {
             console.error(err);
             alert('Could not load places.');
@@ -98,11 +167,11 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    // Fetch details for a single place by ID
-    async function fetchPlaceDetails(id) {
+    // Fetch everything the place page shows (place, rating aggregates, first reviews with author names)
+    async function fetchPlacePage(id) {
         try {
-            const res = await fetch(`http://127.0.0.1:5000/api/v1/places/${id}`);
-            if (!res.ok) throw new Error('Failed to fetch place details');
+            const res = await fetch(`http://127.0.0.1:5000/api/v1/places/${id}/page`);
+            if (!res.ok) throw new Error('Failed to fetch place page');
             return await res.json();
         } catch (err) {
             console.error(err);
@@ -110,27 +179,14 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    // Fetch reviews for a place
-    async function fetchPlaceReviews(id) {
-        try {
-            const res = await fetch(`http://127.0.0.1:5000/api/v1/places/${id}/reviews`);
-            if (!res.ok) throw new Error('Failed to fetch reviews');
-            return await res.json();
-        } catch (err) {
-            console.error(err);
-            return [];
-        }
-    }
-
     // === Rendering Helpers ===
-    // Render a list of place cards, with optional price filter
-    function renderPlaces(places, maxPrice = Infinity) {
+    // Render a list of place cards
+    function renderPlaces(places) {
         const container = document.getElementById('places-list');
         if (!container) return;
 
         container.innerHTML = '';
         places
-            .filter(place => place.price <= maxPrice)
             .forEach(place => {
                 const card = document.createElement('div');
                 card.className = 'place-card';
@@ -144,7 +200,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Populate details section on place page
-    function renderPlaceDetails(place) {
+    function renderPlaceDetails(place, ratings) {
         const info = document.querySelector('#place-details .place-info');
         if (!info) return;
 
@@ -157,25 +213,13 @@ document.addEventListener('DOMContentLoaded', () => {
                 <p>Price: $${place.price}/night</p>
                 <p>Description: ${place.description || 'No description available'}</p>
                 <p>Amenities: ${place.amenities.map(a => a.name).join(', ') || 'None'}</p>
+                <p>Rating: ${ratings && ratings.average !== null ? `${ratings.average} / 5 (${ratings.count} reviews)` : 'No ratings yet'}</p>
             `;
         }
     }
 
-    // Fetch a user's name by user ID
-    async function fetchUserName(userId) {
-        try {
-            const res = await fetch(`http://127.0.0.1:5000/api/v1/users/${userId}`);
-            if (!res.ok) throw new Error('Failed to fetch user name');
-            const data = await res.json();
-            return `${data.first_name} ${data.last_name}`;
-        } catch (err) {
-            console.error(`Error fetching name for user ${userId}:`, err);
-            return 'Unknown';
-        }
-    }
-
     // Render reviews with user names and ratings
-    async function renderReviews(reviews) {
+    function renderReviews(reviews) {
         const reviewsContainer = document.getElementById('reviews');
         if (!reviewsContainer) return;
 
@@ -186,7 +230,7 @@ document.addEventListener('DOMContentLoaded', () => {
         }
 
         for (const review of reviews) {
-            const userName = await fetchUserName(review.user_id);
+            const userName = review.author ? `${review.author.first_name} ${review.author.last_name}` : 'Unknown';
 
             const reviewCard = document.createElement('div');
             reviewCard.className = 'review-card';
@@ -199,6 +243,12 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Render the place page from a single /places/<id>/page response
+    function renderPlacePage(page) {
+        renderPlaceDetails(page ? page.place : null, page ? page.ratings : null);
+        renderReviews(page ? page.reviews : []);
+    }
+
     // === Initialize Index Page ===
     const placesList           = document.getElementById('places-list');
     const priceFilter          = document.getElementById('price-filter');
@@ -212,8 +262,8 @@ document.addEventListener('DOMContentLoaded', () => {
     if (priceFilter) {
         priceFilter.addEventListener('change', async (e) => {
             const maxPrice = parseInt(e.target.value) || Infinity;
-            const places   = await fetchPlaces();
-            renderPlaces(places, maxPrice);
+            const places   = await fetchPlaces(maxPrice);
+            renderPlaces(places);
         });
     }
 
@@ -231,8 +281,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Load details and reviews for this place, toggle review form
     if (placeDetails && reviewsContainer && placeIdFromUrl) {
-        fetchPlaceDetails(placeIdFromUrl).then(renderPlaceDetails);
-        fetchPlaceReviews (placeIdFromUrl).then(renderReviews);
+        fetchPlacePage(placeIdFromUrl).then(renderPlacePage);
         if (addReviewSection) {
             addReviewSection.style.display = isLoggedIn ? 'block' : 'none';
         }
@@ -271,13 +320,10 @@ document.addEventListener('DOMContentLoaded', () => {
             }
 
             try {
-                // Send review to API
-                const response = await fetch('http://127.0.0.1:5000/api/v1/reviews', {
+                // Send review to API (the access token is renewed if it has expired)
+                const response = await authFetch('http://127.0.0.1:5000/api/v1/reviews', {
                     method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'Authorization': `Bearer ${token}`
-                    },
+                    headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ text, rating, place_id: placeId, user_id: userId })
                 });
 
@@ -295,7 +341,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     alert('Review submitted successfully!');
                     reviewForm.reset();
                     // Refresh reviews list
-                    if (placeId) fetchPlaceReviews(placeId).then(renderReviews);
+                    if (placeId) fetchPlacePage(placeId).then(renderPlacePage);
                 } else {
                     console.error('Review error:', data);
                     alert(data.error || 'Failed to submit review.');